@@ -18,6 +18,7 @@ generates ACE-format cross sections.
 
 from __future__ import division, unicode_literals
 import io
+import mmap
 import struct
 from warnings import warn
 from pyne.utils import QAWarning
@@ -136,6 +137,7 @@ class Library(object):
     def __init__(self, filename):
         # Determine whether file is ASCII or binary
         self.f = None
+        self._mmap = None
         try:
             self.f = io.open(filename, 'rb')
             # Grab 10 lines of the library
@@ -158,8 +160,8 @@ class Library(object):
         self.verbose = False
         self.tables = {}
 
-    def read(self, table_names=None):
-        """read(table_names=None)
+    def read(self, table_names=None, lazy=False):
+        """read(table_names=None, lazy=False)
 
         Read through and parse the ACE-format library.
 
@@ -168,6 +170,14 @@ class Library(object):
         table_names : None, str, or iterable, optional
             Tables from the file to read in.  If None, reads in all of the
             tables. If str, reads in only the single table of a matching name.
+        lazy : bool, optional
+            If True, only the cross section blocks of each table are parsed
+            up front; the remaining blocks (nu, angular and energy
+            distributions, photon production, fission, and unresolved
+            resonance data) are parsed the first time one of their attributes
+            is accessed.  For binary libraries, the XSS array of each table is
+            then a read-only view into a memory map of the file rather than a
+            copy.
         """
         if isinstance(table_names, basestring):
             table_names = [table_names]
@@ -176,11 +186,14 @@ class Library(object):
             table_names = set(table_names)
 
         if self.binary:
-            self._read_binary(table_names)
+            self._read_binary(table_names, lazy=lazy)
         else:
-            self._read_ascii(table_names)
+            self._read_ascii(table_names, lazy=lazy)
 
-    def _read_binary(self, table_names, recl_length=4096, entries=512):
+    def _read_binary(self, table_names, recl_length=4096, entries=512,
+                     lazy=False):
+        if lazy and self._mmap is None:
+            self._mmap = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
         while True:
             start_position = self.f.tell()
 
@@ -230,11 +243,6 @@ class Library(object):
             # Read JXS
             table.jxs = list(struct.unpack(str('=32i'), self.f.read(128)))
 
-            # Read XSS
-            self.f.seek(start_position + recl_length)
-            table.xss = list(struct.unpack(str('={0}d'.format(length)),
-                                           self.f.read(length*8)))
-
             # Insert empty object at beginning of NXS, JXS, and XSS
             # arrays so that the indexing will be the same as
             # Fortran. This makes it easier to follow the ACE format
@@ -246,16 +254,36 @@ class Library(object):
             table.jxs.insert(0, 0)
             table.jxs = np.array(table.jxs, dtype=int)
 
-            table.xss.insert(0, 0.0)
-            table.xss = np.array(table.xss, dtype=float)
+            # Read XSS
+            if lazy:
+                # view the file starting one double before the XSS record,
+                # i.e. in the padding of the header record, so that XSS is
+                # 1-indexed without copying.
+                table.xss = np.frombuffer(self._mmap, dtype=np.float64,
+                                          count=length + 1,
+                                          offset=start_position + recl_length - 8)
+                if table.xss[0] != 0.0:
+                    # the padding is not zeroed, fall back to a copy so that
+                    # xss[0] is well-defined
+                    table.xss = table.xss.copy()
+                    table.xss[0] = 0.0
+            else:
+                self.f.seek(start_position + recl_length)
+                table.xss = np.empty(length + 1, dtype=np.float64)
+                table.xss[0] = 0.0
+                table.xss[1:] = np.frombuffer(self.f.read(length*8),
+                                              dtype=np.float64)
 
             # Read all data blocks
-            table._read_all()
+            if lazy:
+                table._read_lazy()
+            else:
+                table._read_all()
 
             # Advance to next record
             self.f.seek(start_position + recl_length*(n_records + 1))
 
-    def _read_ascii(self, table_names):
+    def _read_ascii(self, table_names, lazy=False):
         cdef list lines, rawdata
 
         f = self.f
@@ -353,7 +381,10 @@ class Library(object):
                 table.xss = fromstring_token(datastr, inplace=True, maxsize=4*n_lines+1)
 
             # Read all data blocks
-            table._read_all()
+            if lazy:
+                table._read_lazy()
+            else:
+                table._read_all()
             lines = [f.readline() for i in range(13)]
 
         f.seek(0)
@@ -372,6 +403,9 @@ class Library(object):
         return self.tables.get(name, None)
 
     def __del__(self):
+        # The memory map is left to be garbage collected along with any
+        # XSS views into it.
+        self._mmap = None
         if self.f is not None:
             self.f.close()
 
@@ -387,6 +421,12 @@ class AceTable(object):
     def _read_all(self):
         raise NotImplementedError
 
+    def _read_lazy(self):
+        """Reads the data blocks needed up front and defers the rest until
+        they are first accessed.  By default all blocks are read.
+        """
+        self._read_all()
+
 
 class NeutronTable(AceTable):
     """A NeutronTable object contains continuous-energy neutron interaction data
@@ -487,6 +527,54 @@ class NeutronTable(AceTable):
         self._read_fis()
         self._read_unr()
 
+    def _read_lazy(self):
+        # The cross sections are always needed since they create the
+        # reactions, everything else waits until it is accessed.
+        self._read_cross_sections()
+        del self.photon_reactions
+        self._pending_blocks = [block for block, _, _, _ in _LAZY_BLOCKS]
+
+    def _read_pending(self, name, reaction=False):
+        """Reads deferred data blocks which may provide the attribute name,
+        either on this table or on one of its reactions.  Returns whether any
+        block was read.
+        """
+        pending = self.__dict__.get('_pending_blocks')
+        if not pending:
+            return False
+        read = False
+        for block, readers, table_attrs, rxn_attrs in _LAZY_BLOCKS:
+            attrs = rxn_attrs if reaction else table_attrs
+            if block not in pending or name not in attrs:
+                continue
+            pending.remove(block)
+            # readers may also set attributes of other blocks, which keep
+            # the values, or lack thereof, that their own block gives them
+            foreign = set()
+            for other, _, other_attrs, _ in _LAZY_BLOCKS:
+                if other != block:
+                    foreign.update(other_attrs)
+            kept = dict((k, v) for k, v in self.__dict__.items()
+                        if k in foreign)
+            if block == 'photon':
+                self.photon_reactions = OrderedDict()
+            for reader in readers:
+                getattr(self, reader)()
+            for k in foreign:
+                if k in kept:
+                    self.__dict__[k] = kept[k]
+                else:
+                    self.__dict__.pop(k, None)
+            read = True
+        return read
+
+    def __getattr__(self, name):
+        # only called when normal lookup fails, i.e. for deferred blocks
+        if self._read_pending(name):
+            return getattr(self, name)
+        raise AttributeError("{0!r} object has no attribute "
+                             "{1!r}".format(type(self).__name__, name))
+
     def _read_cross_sections(self):
         """Reads and parses the ESZ, MTR, LQR, TRY, LSIG, and SIG blocks. These
         blocks contain the energy grid, all reaction cross sections, the total
@@ -1365,6 +1453,37 @@ class NeutronTable(AceTable):
         #    yield r
         return iter(self.reactions.values())
 
+# Deferred NeutronTable data blocks for lazy reading as (block name, readers,
+# table attributes, reaction attributes), in reading order.  Only accessing one
+# of the listed attributes triggers reading a block, and each attribute is
+# listed under exactly one block.  The e_dist_* attributes are also written by
+# the delayed neutron spectra of the nu block, but their eagerly read values
+# are those of the energy block, which is read last.
+_LAZY_BLOCKS = (
+    ('nu', ('_read_nu',),
+     frozenset(['nu_p_type', 'nu_p_energy', 'nu_p_value', 'nu_t_type',
+                'nu_t_energy', 'nu_t_value', 'nu_d_energy', 'nu_d_value',
+                'nu_d_precursor_const', 'nu_d_precursor_energy',
+                'nu_d_precursor_prob', 'nu_d_energy_dist']),
+     frozenset()),
+    ('angular', ('_read_angular_distributions',), frozenset(),
+     frozenset(['ang_energy_in', 'ang_cos', 'ang_pdf', 'ang_cdf'])),
+    ('energy', ('_read_energy_distributions',),
+     frozenset(['e_dist_energy_out1', 'e_dist_energy_out2',
+                'e_dist_energy_outNE', 'e_dist_LP', 'e_dist_EG']),
+     frozenset(['energy_dist'])),
+    ('photon', ('_read_gpd', '_read_mtrp', '_read_lsigp', '_read_sigp',
+                '_read_landp', '_read_andp', '_read_yp'),
+     frozenset(['photon_reactions', 'sigma_photon', 'a_dist_energy_in',
+                'a_dist_mu_out', 'MT_for_photon_yield']),
+     frozenset(['LOCA', 'LOCB', 'e_yield', 'photon_yield'])),
+    ('fission', ('_read_fis',), frozenset(['IE_fission', 'sigma_f']),
+     frozenset()),
+    ('unresolved', ('_read_unr',), frozenset(['urr_energy', 'urr_table']),
+     frozenset()),
+    )
+
+
 class EnergyDistribution(object):
     def __init__(self):
         pass
@@ -1556,6 +1675,15 @@ class Reaction(object):
         self.IE = 0        # Energy grid index
         self.sigma = []    # Cross section values
 
+    def __getattr__(self, name):
+        # read deferred blocks of a lazily read table on first access
+        table = self.__dict__.get('table')
+        if table is not None and isinstance(table, NeutronTable) and \
+           table._read_pending(name, reaction=True):
+            return getattr(self, name)
+        raise AttributeError("{0!r} object has no attribute "
+                             "{1!r}".format(type(self).__name__, name))
+
     def broaden(self, T_high):
         pass
 
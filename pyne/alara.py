@@ -8,6 +8,8 @@ from pyne.utils import QAWarning, to_sec
 
 import numpy as np
 import tables as tb
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
 
 warn(__name__ + " is not yet QA compliant.", QAWarning)
 
@@ -27,7 +29,7 @@ from pyne.mesh import Mesh, MeshError
 from pyne.material import Material, from_atom_frac
 from pyne import nucname
 from pyne.nucname import serpent, alara, znum, anum
-from pyne.data import N_A, decay_const, decay_children, branch_ratio
+from pyne.data import N_A, decay_graph, metastable_id
 from pyne.xs.data_source import SimpleDataSource
 
 
@@ -110,7 +112,7 @@ def mesh_to_fluxin(flux_mesh, flux_tag, fluxin="fluxin.out",
         f.write(output)
 
 
-def photon_source_to_hdf5(filename, chunkshape=(10000,)):
+def photon_source_to_hdf5(filename, chunkshape=(10000,), create_indexes=True):
     """Converts a plaintext photon source file to an HDF5 version for
     quick later use.
 
@@ -134,6 +136,10 @@ def photon_source_to_hdf5(filename, chunkshape=(10000,)):
         The path to the file
     chunkshape : tuple of int
         A 1D tuple of the HDF5 chunkshape.
+    create_indexes : bool, optional
+        If True, column indexes are built on the nuc and time columns so that
+        photon_source_hdf5_to_mesh() can look up each nuclide/decay time
+        combination without scanning the whole table.
 
     """
     f = open(filename, 'r')
@@ -177,6 +183,10 @@ def photon_source_to_hdf5(filename, chunkshape=(10000,)):
     if i % chunksize != 0:
         tab.append(rows[:j+1])
 
+    if create_indexes:
+        tab.cols.nuc.create_index()
+        tab.cols.time.create_index()
+
     h5f.close()
     f.close()
 
@@ -219,8 +229,8 @@ def photon_source_hdf5_to_mesh(mesh, filename, tags, sub_voxel=False,
         num_e_groups = len(h5f.root.data[0][3])
     max_num_cells = 1
     ve0 = next(mesh.iter_ve())
+    num_vol_elements = len(mesh)
     if sub_voxel:
-        num_vol_elements = len(mesh)
         subvoxel_array = _get_subvoxel_array(mesh, cell_mats)
         # get max_num_cells
         max_num_cells = len(np.atleast_1d(mesh.mesh.getTagHandle(
@@ -232,16 +242,15 @@ def photon_source_hdf5_to_mesh(mesh, filename, tags, sub_voxel=False,
         tag_handles[tag_name] = \
                 mesh.mesh.createTag(tag_name, num_e_groups * max_num_cells,
                                     float)
-    # creat a list of decay times (strings) in the source file
-    phtn_src_dc = []
+    ves = list(mesh.iter_ve())
+
     with tb.open_file(filename) as h5f:
-        for row in h5f.root.data:
-            phtn_src_dc.append(row[2])
-    phtn_src_dc = list(set(phtn_src_dc))
+        tab = h5f.root.data
+        # creat a list of decay times (strings) in the source file
+        phtn_src_dc = np.unique(tab.col('time')).tolist()
 
-    # iterate through each requested nuclide/dectay time
-    for cond in tags.keys():
-        with tb.open_file(filename) as h5f:
+        # iterate through each requested nuclide/dectay time
+        for cond in tags.keys():
             # Convert nuclide to the form found in the ALARA phtn_src
             # file, which is similar to the Serpent form. Note this form is
             # different from the ALARA input nuclide form found in nucname.
@@ -252,29 +261,28 @@ def photon_source_hdf5_to_mesh(mesh, filename, tags, sub_voxel=False,
 
             # time match, convert string mathch to float mathch
             dc = _find_phsrc_dc(cond[1], phtn_src_dc)
-            # create of array of rows that match the nuclide/decay criteria
-            matched_data = h5f.root.data.read_where(
+            # create of array of rows that match the nuclide/decay criteria,
+            # this uses the nuc/time column indexes when they are present.
+            matched_data = tab.read_where(
                 "(nuc == '{0}') & (time == '{1}')".format(nuc, dc))
 
-        if not sub_voxel:
-            idx = 0
-            for i, _, ve in mesh:
-                if matched_data[idx][0] == i:
-                    tag_handles[tags[cond]][ve] = matched_data[idx][3]
-                    idx += 1
-                else:
-                    tag_handles[tags[cond]][ve] = [0] * num_e_groups
-        else:
-            temp_mesh_data = np.empty(
+            # scatter the matched rows into a (voxel, cell, group) array and
+            # set the tag for all volume elements at once.
+            temp_mesh_data = np.zeros(
                 shape=(num_vol_elements, max_num_cells, num_e_groups),
                 dtype=float)
-            temp_mesh_data.fill(0.0)
-            for sve, subvoxel in enumerate(subvoxel_array):
-                temp_mesh_data[subvoxel['idx'],subvoxel['scid'],:] = \
-                    matched_data[sve][3][:]
-            for i, _, ve in mesh:
-                tag_handles[tags[cond]][ve] = \
-                    temp_mesh_data[i,:].reshape(max_num_cells * num_e_groups)
+            if not sub_voxel:
+                temp_mesh_data[matched_data['idx'], 0, :] = \
+                    matched_data['phtn_src']
+            else:
+                temp_mesh_data[subvoxel_array['idx'],
+                               subvoxel_array['scid'], :] = \
+                    matched_data['phtn_src'][:len(subvoxel_array)]
+            temp_mesh_data = temp_mesh_data.reshape(
+                num_vol_elements, max_num_cells * num_e_groups)
+            if max_num_cells * num_e_groups == 1:
+                temp_mesh_data = temp_mesh_data[:, 0]
+            tag_handles[tags[cond]][ves] = temp_mesh_data
 
 def record_to_geom(mesh, cell_fracs, cell_mats, geom_file, matlib_file,
                    sig_figs=6, sub_voxel=False):
@@ -327,10 +335,10 @@ def record_to_geom(mesh, cell_fracs, cell_mats, geom_file, matlib_file,
     mixture = '' # mixture blocks
 
     unique_mixtures = []
+    vols = mesh.elem_volumes()
     if not sub_voxel:
         for i, mat, ve in mesh:
-            volume += '    {0: 1.6E}    zone_{1}\n'.format(
-                mesh.elem_volume(ve), i)
+            volume += '    {0: 1.6E}    zone_{1}\n'.format(vols[i], i)
 
             ve_mixture = {}
             for row in cell_fracs[cell_fracs['idx'] == i]:
@@ -355,12 +363,11 @@ def record_to_geom(mesh, cell_fracs, cell_mats, geom_file, matlib_file,
             mat_loading += '    zone_{0}    mix_{1}\n'.format(i,
                             unique_mixtures.index(ve_mixture))
     else:
-        ves = list(mesh.iter_ve())
         sve_count = 0
         for row in cell_fracs:
             if len(cell_mats[row['cell']].comp) != 0:
                 volume += '    {0: 1.6E}    zone_{1}\n'.format(
-                mesh.elem_volume(ves[row['idx']]) * row['vol_frac'], sve_count)
+                vols[row['idx']] * row['vol_frac'], sve_count)
                 cell_mat = cell_mats[row['cell']]
                 name = cell_mat.metadata['name']
                 if name not in unique_mixtures:
@@ -436,8 +443,9 @@ def mesh_to_geom(mesh, geom_file, matlib_file):
     mixture = "" # mixture blocks
     matlib = "" # ALARA material library string
 
+    vols = mesh.elem_volumes()
     for i, mat, ve in mesh:
-        volume += "    {0: 1.6E}    zone_{1}\n".format(mesh.elem_volume(ve), i)
+        volume += "    {0: 1.6E}    zone_{1}\n".format(vols[i], i)
         mat_loading += "    zone_{0}    mix_{0}\n".format(i)
         matlib += "mat_{0}    {1: 1.6E}    {2}\n".format(i, mesh.density[i],
                                                          len(mesh.comp[i]))
@@ -644,33 +652,116 @@ def phtn_src_energy_bounds(input_file):
     return e_bounds
 
 
-def _build_matrix(N):
-    """ This function  builds burnup matrix, A. Decay only.
+# CRAM poles (theta), residues (alpha) and limit at infinity (alpha_0) keyed
+# by the order of the approximation.
+_CRAM_COEFFS = {
+    14: (np.array([-8.8977731864688888199 + 16.630982619902085304j,
+                   -3.7032750494234480603 + 13.656371871483268171j,
+                   -.2087586382501301251 + 10.991260561901260913j,
+                   3.9933697105785685194 + 6.0048316422350373178j,
+                   5.0893450605806245066 + 3.5888240290270065102j,
+                   5.6231425727459771248 + 1.1940690463439669766j,
+                   2.2697838292311127097 + 8.4617379730402214019j]),
+         np.array([-.000071542880635890672853 + .00014361043349541300111j,
+                   .0094390253107361688779 - .01784791958483017511j,
+                   -.37636003878226968717 + .33518347029450104214j,
+                   -23.498232091082701191 - 5.8083591297142074004j,
+                   46.933274488831293047 + 45.643649768827760791j,
+                   -27.875161940145646468 - 102.14733999056451434j,
+                   4.8071120988325088907 - 1.3209793837428723881j]),
+         np.array([1.8321743782540412751e-14])),
+    16: (np.array([-10.843917078696988026 + 19.277446167181652284j,
+                   -5.2649713434426468895 + 16.220221473167927305j,
+                   5.9481522689511774808 + 3.5874573620183222829j,
+                   3.5091036084149180974 + 8.4361989858843750826j,
+                   6.4161776990994341923 + 1.1941223933701386874j,
+                   1.4193758971856659786 + 10.925363484496722585j,
+                   4.9931747377179963991 + 5.9968817136039422260j,
+                   -1.4139284624888862114 + 13.497725698892745389j]),
+         np.array([-.0000005090152186522491565 - .00002422001765285228797j,
+                   .00021151742182466030907 + .0043892969647380673918j,
+                   113.39775178483930527 + 101.9472170421585645j,
+                   15.059585270023467528 - 5.7514052776421819979j,
+                   -64.500878025539646595 - 224.59440762652096056j,
+                   -1.4793007113557999718 + 1.7686588323782937906j,
+                   -62.518392463207918892 - 11.19039109428322848j,
+                   .041023136835410021273 - .15743466173455468191j]),
+         np.array([2.1248537104952237488e-16])),
+    }
+
+
+def _decay_entries(N):
+    """ This function returns the (rows, cols, vals) entries of the decay-only
+    burnup matrix for the nuclides N. The entries are gathered from the
+    precomputed decay graph, so there are no per-pair data lookups.
     """
-
-    A = np.zeros((len(N), len(N)))
-
     # convert N to id form
     N_id = []
     for i in range(len(N)):
-        if isinstance(N[i], str):
+        if isinstance(N[i], basestring):
             ID = nucname.id(N[i])
         else:
             ID = N[i]
         N_id.append(ID)
+    N_id = np.asarray(N_id, dtype=np.int64)
+    n = len(N_id)
+
+    # locate each nuclide, with its metastable state, in the decay graph
+    nucs, decay_consts, indptr, children, branch_ratios = decay_graph()
+    states = np.empty(n, dtype=np.int64)
+    for k, nuc in enumerate(N_id):
+        state = metastable_id(int(nuc), int(nuc % 10000))
+        states[k] = -1 if state is None else state
+    pos = np.minimum(np.searchsorted(nucs, states), len(nucs) - 1)
+    found = nucs[pos] == states
+    lam = np.where(found, decay_consts[pos], 0.0)
+    starts = np.where(found, indptr[pos], 0)
+    counts = np.where(found, indptr[pos + 1] - indptr[pos], 0)
+
+    # expand every nuclide's range of children
+    cols = np.repeat(np.arange(n), counts)
+    entries = np.arange(counts.sum()) + np.repeat(starts - np.cumsum(counts)
+                                                  + counts, counts)
+    child = children[entries]
+
+    # decay children that are in the nuclide set
+    order = np.argsort(N_id, kind='mergesort')
+    sorted_ids = N_id[order]
+    loc = np.minimum(np.searchsorted(sorted_ids, child), n - 1)
+    in_set = sorted_ids[loc] == child
+    rows = order[loc[in_set]]
+    cols = cols[in_set]
+    vals = branch_ratios[entries[in_set]] * lam[cols]
+
+    diag = np.arange(n)
+    return (np.concatenate([diag, rows]), np.concatenate([diag, cols]),
+            np.concatenate([-lam, vals]))
 
-    sds = SimpleDataSource()
 
-    # Decay
-    for i in range(len(N)):
-        A[i, i] -= decay_const(N_id[i])
-
-        # Find decay parents
-        for k in range(len(N)):
-            if N_id[i] in decay_children(N_id[k]):
-                A[i, k] += branch_ratio(N_id[k], N_id[i])*decay_const(N_id[k])
+def _build_matrix(N):
+    """ This function  builds burnup matrix, A. Decay only.
+    """
+    A = np.zeros((len(N), len(N)))
+    rows, cols, vals = _decay_entries(N)
+    np.add.at(A, (rows, cols), vals)
     return A
 
+
+def _rat_apprx(A, t, n_0, order):
+    """ CRAM of the given order for a dense burnup matrix.
+    """
+    theta, alpha, alpha_0 = _CRAM_COEFFS[order]
+    A = A*t
+    n = 0*n_0
+
+    for j in range(len(theta)):
+        n = n + np.linalg.solve(A - theta[j] * np.identity(np.shape(A)[0]), alpha[j]*n_0)
+
+    n = 2*n.real
+    n = n + alpha_0*n_0
+    return n
+
+
 def _rat_apprx_14(A, t, n_0):
     """ CRAM of order 14
 
@@ -683,36 +774,8 @@ def _rat_apprx_14(A, t, n_0):
     n_0: numpy array
         Inital composition vector
     """
+    return _rat_apprx(A, t, n_0, 14)
 
-    theta = np.array([ -8.8977731864688888199 + 16.630982619902085304j,
-                   -3.7032750494234480603 + 13.656371871483268171j,
-                   -.2087586382501301251 + 10.991260561901260913j,
-                   3.9933697105785685194 + 6.0048316422350373178j,
-                   5.0893450605806245066 + 3.5888240290270065102j,
-                   5.6231425727459771248 + 1.1940690463439669766j,
-                   2.2697838292311127097 + 8.4617379730402214019j])
-
-    alpha = np.array([-.000071542880635890672853 + .00014361043349541300111j,
-                   .0094390253107361688779 - .01784791958483017511j,
-                   -.37636003878226968717 + .33518347029450104214j,
-                   -23.498232091082701191 - 5.8083591297142074004j,
-                   46.933274488831293047 + 45.643649768827760791j,
-                   -27.875161940145646468 - 102.14733999056451434j,
-                   4.8071120988325088907 - 1.3209793837428723881j])
-
-    alpha_0 = np.array([1.8321743782540412751e-14])
-
-    s = 7
-    A = A*t
-    n = 0*n_0
-
-    for j in range(7):
-        n = n + np.linalg.solve(A - theta[j] * np.identity(np.shape(A)[0]), alpha[j]*n_0)
-
-    n = 2*n.real
-    n = n + alpha_0*n_0
-
-    return n
 
 def _rat_apprx_16(A, t, n_0):
     """ CRAM of order 16
@@ -726,37 +789,8 @@ def _rat_apprx_16(A, t, n_0):
     n_0: numpy array
         Inital composition vector
     """
-    theta = np.array([ -10.843917078696988026 + 19.277446167181652284j,
-                   -5.2649713434426468895 + 16.220221473167927305j,
-                   5.9481522689511774808 + 3.5874573620183222829j,
-                   3.5091036084149180974 + 8.4361989858843750826j,
-                   6.4161776990994341923 + 1.1941223933701386874j,
-                   1.4193758971856659786 + 10.925363484496722585j,
-                   4.9931747377179963991 + 5.9968817136039422260j,
-                   -1.4139284624888862114 + 13.497725698892745389j])
-
-    alpha = np.array([ -.0000005090152186522491565 - .00002422001765285228797j,
-                      .00021151742182466030907 + .0043892969647380673918j,
-                      113.39775178483930527 + 101.9472170421585645j,
-                      15.059585270023467528 - 5.7514052776421819979j,
-                      -64.500878025539646595 - 224.59440762652096056j,
-                      -1.4793007113557999718 + 1.7686588323782937906j,
-                      -62.518392463207918892 - 11.19039109428322848j,
-                      .041023136835410021273 - .15743466173455468191j])
-
-    alpha_0 = np.array([2.1248537104952237488e-16])
-
-
-    s = 8
-    A = A*t
-    n = 0*n_0
-
-    for j in range(8):
-        n = n + np.linalg.solve(A - theta[j] * np.identity(np.shape(A)[0]), alpha[j]*n_0)
+    return _rat_apprx(A, t, n_0, 16)
 
-    n = 2*n.real
-    n = n + alpha_0*n_0
-    return n
 
 def cram(N, t, n_0, order):
     """ This function returns matrix exponential solution n using CRAM14 or CRAM16
@@ -786,6 +820,93 @@ def cram(N, t, n_0, order):
         msg = 'Rational approximation of degree {0} is not supported.'.format(order)
         raise ValueError(msg)
 
+
+class CramSolver(object):
+    """Batched CRAM depletion over a fixed set of nuclides. The sparse decay
+    matrix is built once and each pole, (A*t - theta_j I), is LU factorized
+    once per time step. Any number of compositions (e.g. one per mesh volume
+    element) may then be pushed through all of the poles at the same time.
+
+    Attributes
+    ----------
+    nucs : list
+        The nuclides under consideration, in matrix order.
+    order : int
+        Order of the rational approximation, 14 or 16.
+    A : scipy.sparse.csc_matrix
+        The decay-only burnup matrix.
+    max_steps : int
+        Number of distinct time steps whose factorizations are kept.
+    """
+
+    def __init__(self, N, order=14, max_steps=1):
+        """Parameters
+        ----------
+        N : list or array
+            Array of nuclides under consideration
+        order : int, optional
+            Order of method. Only 14 and 16 are supported.
+        max_steps : int, optional
+            Number of distinct time steps whose pole factorizations are
+            cached, the least recently used ones are discarded. Defaults to
+            only the last time step.
+        """
+        if order not in _CRAM_COEFFS:
+            msg = 'Rational approximation of degree {0} is not supported.'.format(order)
+            raise ValueError(msg)
+        self.nucs = list(N)
+        self.order = order
+        rows, cols, vals = _decay_entries(self.nucs)
+        n = len(self.nucs)
+        self.A = sp.csc_matrix((vals, (rows, cols)), shape=(n, n))
+        self.max_steps = max_steps
+        self._lus = collections.OrderedDict()
+
+    def _factorize(self, t):
+        """Returns the LU factorizations of every pole for time step t."""
+        lus = self._lus.pop(t, None)
+        if lus is None:
+            theta = _CRAM_COEFFS[self.order][0]
+            At = (self.A*t).astype(complex)
+            I = sp.identity(At.shape[0], dtype=complex, format='csc')
+            lus = [splu((At - th*I).tocsc()) for th in theta]
+        self._lus[t] = lus
+        while len(self._lus) > max(self.max_steps, 1):
+            self._lus.popitem(last=False)
+        return lus
+
+    def __call__(self, n_0, t):
+        """Depletes the initial compositions n_0 over the time step t.
+
+        Parameters
+        ----------
+        n_0 : array
+            Either a single nuclide concentration vector of shape (N_nuc,) or
+            a matrix of shape (N_nuc, N_voxel) with one composition per column.
+        t : float
+            Time step
+
+        Returns
+        -------
+        n : array
+            The concentrations after time t, with the same shape as n_0.
+        """
+        n_0 = np.asarray(n_0, dtype=float)
+        if n_0.shape[0] != len(self.nucs):
+            raise ValueError("n_0 must have {0} rows, one per nuclide, got "
+                             "{1}".format(len(self.nucs), n_0.shape[0]))
+        _, alpha, alpha_0 = _CRAM_COEFFS[self.order]
+        n = np.zeros(n_0.shape, dtype=complex)
+        n_0_c = n_0.astype(complex)
+        for alpha_j, lu in zip(alpha, self._factorize(t)):
+            n += lu.solve(alpha_j*n_0_c)
+        return 2*n.real + alpha_0*n_0
+
+    def clear(self):
+        """Discards the cached pole factorizations."""
+        self._lus.clear()
+
+
 def _output_flux(ve, tag_flux,output,start,stop,direction):
     """
     This function is used to get neutron flux for fluxin
@@ -130,6 +130,15 @@ cdef extern from "data.h" namespace "pyne":
     set[int] decay_children(char *) except +
     set[int] decay_children(std_string) except +
 
+    ctypedef struct decay_graph:
+        vector[int] nucs
+        vector[double] decay_consts
+        vector[int] indptr
+        vector[int] children
+        vector[double] branch_ratios
+
+    const decay_graph & get_decay_graph() except +
+
     int metastable_id(int, int) except +
     int metastable_id(int) except +
 
@@ -159,10 +168,20 @@ cdef extern from "data.h" namespace "pyne":
     vector[pair[int, int]] gamma_from_to(double energy, double error) except +
     vector[pair[int, int]] gamma_parent_child(double energy, double error) except +
     vector[int] gamma_parent(double energy, double error) except +
+    vector[vector[int]] gamma_parent(vector[double] energy,
+                                     vector[double] error) except +
     vector[int] gamma_child(double energy, double error) except +
+    vector[vector[int]] gamma_child(vector[double] energy,
+                                    vector[double] error) except +
     vector[int] gamma_child(int parent) except +
     vector[pair[double, double]] gamma_xrays(int parent) except +
 
+    ctypedef struct line_spectrum:
+        vector[double] energies
+        vector[double] intensities
+
+    const line_spectrum & merged_photons(int) except +
+
     vector[double] alpha_energy(int parent) except +
     vector[double] alpha_intensity(int parent) except +
     vector[int] alpha_parent(double energy, double error) except +
@@ -173,6 +192,8 @@ cdef extern from "data.h" namespace "pyne":
     vector[double] beta_average_energy(int parent) except +
     vector[double] beta_intensity(int parent) except +
     vector[int] beta_parent(double energy, double error) except +
+    vector[vector[int]] beta_parent(vector[double] energy,
+                                    vector[double] error) except +
     vector[int] beta_child(double energy, double error) except +
     vector[int] beta_child(int parent) except +
 
@@ -106,6 +106,8 @@ cdef extern from "material.h" namespace "pyne":
         vector[pair[double, double]] gammas() except +
         vector[pair[double, double]] xrays() except +
         vector[pair[double, double]] photons(bool) except +
+        vector[pair[double, double]] photon_lines(bool) except +
+        vector[double] photon_spectrum(vector[double], bool) except +
 
         Material decay(double) except +
         Material cram(vector[double]) except +
@@ -116,3 +118,6 @@ cdef extern from "material.h" namespace "pyne":
         Material operator+(Material) except +
         Material operator*(double) except +
         Material operator/(double) except +
+
+cdef extern from "material.h" namespace "pyne::decayers":
+    map[int, double] decay(map[int, double], double) except +
@@ -67,4 +67,9 @@ cdef extern from "source_sampling.h" namespace "pyne":
         # methods
         SourceParticle particle_birth() except +
         SourceParticle particle_birth(cpp_vector[double]) except +
+        void particle_birth_many(int, double *, double *, double *, double *,
+                                 double *, double *, int *, int) nogil except +
+        void particle_birth_many(int, unsigned long, double *, double *,
+                                 double *, double *, double *, int *,
+                                 int) nogil except +
 
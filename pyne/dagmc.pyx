@@ -289,6 +289,9 @@ surf_id_to_handle = {}
 surf_handle_to_id = {}
 vol_id_to_handle = {}
 vol_handle_to_id = {}
+# cached (vol_ids, handles, lows, highs, neighbors) used to locate points,
+# see _volume_bounds()
+_vol_bounds = None
 
 def versions():
     """Return a (str, int) tuple: the version and SVN revision of the 
@@ -300,7 +303,9 @@ def versions():
 def load(filename):
     """Load a given filename into DagMC"""
     global surf_id_to_handle, surf_handle_to_id, vol_id_to_handle, vol_handle_to_id
+    global _vol_bounds
     dag_load(filename)
+    _vol_bounds = None
 
     def get_geom_list(dim):
         cdef int count
@@ -386,16 +391,88 @@ def find_volume(xyz, uvw=[1,0,0]):
     Return a volume id.  If no volume contains the point, a DagmcError may be raised,
     or the point may be reported to be part of the implicit complement.
 
-    This function may be slow if many volumes exist.
+    Only volumes whose bounding boxes contain the point are queried. See
+    find_volumes() to locate many points at once.
 
     """
-    xyz = np.array(xyz, dtype=np.float64)
+    return int(find_volumes([xyz], uvw)[0])
+
+
+def find_volumes(points, uvw=[1,0,0], chunk_size=4096):
+    """Determine which volumes many points are in.
+
+    Volumes whose bounding boxes do not contain a point are never queried for
+    it. The volume found for the previous point, followed by the volumes whose
+    bounding boxes touch its bounding box, are tried first, so runs of nearby
+    points (such as consecutive mesh volume elements) usually need a single
+    point in volume query each.
+
+    Parameters
+    ----------
+    points : array-like of floats, shape (N, 3)
+        The (x, y, z) points to locate.
+    uvw : array-like of floats, optional
+        The ray fire direction used by the point in volume queries.
+    chunk_size : int, optional
+        The number of points whose bounding box tests are held in memory at
+        once.
+
+    Returns
+    -------
+    vol_ids : ndarray of ints, length N
+        The volume id containing each point.
+
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
     uvw = np.array(uvw, dtype=np.float64)
-    for eh, vol_id in vol_handle_to_id.iteritems():
-        result = dag_pt_in_vol(eh, xyz, uvw)
-        if result == 1:
-            return vol_id    
-    raise DagmcError("The point {0} does not appear to be in any volume".format(xyz))
+    vol_ids, handles, lows, highs, neighbors = _volume_bounds()
+    result = np.empty(len(points), dtype=np.int64)
+    last = -1
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+        in_box = np.all((lows <= chunk[:, np.newaxis]) &
+                        (chunk[:, np.newaxis] <= highs), axis=2)
+        for i, xyz in enumerate(chunk):
+            candidates = in_box[i]
+            order = np.flatnonzero(candidates)
+            if last >= 0 and candidates[last]:
+                first = neighbors[last][candidates[neighbors[last]]]
+                rest = np.setdiff1d(order, first, assume_unique=True)
+                order = np.concatenate(([last], first[first != last], rest))
+            for v in order:
+                if dag_pt_in_vol(handles[v], xyz, uvw) == 1:
+                    result[start + i] = vol_ids[v]
+                    last = v
+                    break
+            else:
+                raise DagmcError("The point {0} does not appear to be in any "
+                                 "volume".format(xyz))
+    return result
+
+
+def _volume_bounds():
+    """Private function that returns the volume ids, the entity handles, the
+    lower and upper bounding box corners and, for each volume, the indices of
+    the volumes whose bounding boxes overlap its own. These are computed once
+    per loaded geometry.
+    """
+    global _vol_bounds
+    if _vol_bounds is not None:
+        return _vol_bounds
+    vol_ids = sorted(vol_id_to_handle.keys())
+    handles = [vol_id_to_handle[vol_id] for vol_id in vol_ids]
+    lows = np.empty((len(vol_ids), 3), dtype=np.float64)
+    highs = np.empty((len(vol_ids), 3), dtype=np.float64)
+    for i, eh in enumerate(handles):
+        lows[i], highs[i] = get_volume_boundary(eh)
+    # pad the boxes so that points on a volume's surface are still tested
+    lows -= 1e-7 * np.maximum(1.0, np.abs(lows))
+    highs += 1e-7 * np.maximum(1.0, np.abs(highs))
+    overlap = np.all((lows[:, np.newaxis] <= highs) &
+                     (lows <= highs[:, np.newaxis]), axis=2)
+    neighbors = [np.flatnonzero(row) for row in overlap]
+    _vol_bounds = (vol_ids, handles, lows, highs, neighbors)
+    return _vol_bounds
 
 
 def fire_one_ray(vol_id, xyz, uvw):
@@ -753,6 +830,14 @@ def discretize_geom(mesh, **kwargs):
         (on the boundary) for each mesh row. If true, a linearly spaced grid of
         starting points is used, with dimension sqrt(num_rays) x sqrt(num_rays). 
         In this case, "num_rays" must be a perfect square.
+    num_procs : int, optional, default = 1
+        Structured mesh only. The number of worker processes to fire rays
+        with, see ray_discretize().
+    seed : int, optional
+        Structured mesh only. The seed of the random ray starting points.
+    geom_file : str, optional
+        Structured mesh only. A DAGMC geometry file for worker processes to
+        load.
 
     Returns
     -------
@@ -771,9 +856,13 @@ def discretize_geom(mesh, **kwargs):
         cell changing fastest.
     """
     if mesh.structured:
-       num_rays = kwargs['num_rays'] if 'num_rays' in kwargs else 10
-       grid = kwargs['grid'] if 'grid' in kwargs else False
-       results = ray_discretize(mesh, num_rays, grid)
+       num_rays = kwargs.get('num_rays', 10)
+       grid = kwargs.get('grid', False)
+       num_procs = kwargs.get('num_procs', 1)
+       seed = kwargs.get('seed', None)
+       geom_file = kwargs.get('geom_file', None)
+       results = ray_discretize(mesh, num_rays, grid, num_procs, seed,
+                                geom_file)
     else:
        if kwargs:
            raise ValueError("No valid key word arguments for unstructed mesh.")
@@ -782,8 +871,10 @@ def discretize_geom(mesh, **kwargs):
                                             (b'cell', np.int64),
                                             (b'vol_frac', np.float64), 
                                             (b'rel_error', np.float64)])
-       for i, cell in enumerate(cells):
-           results[i] = (i, cells[i], 1.0, 1.0)
+       results[b'idx'] = np.arange(len(mesh))
+       results[b'cell'] = cells
+       results[b'vol_frac'] = 1.0
+       results[b'rel_error'] = 1.0
 
     return results
 
@@ -800,20 +891,16 @@ def cells_at_ve_centers(mesh):
 
     Returns
     -------
-    cells : list
+    cells : ndarray of ints
         The cell numbers of the geometry cells that occupy the center of the
         mesh volume element, in the order of the mesh idx.
     """
-    cells = []
-    for i, mat, ve in mesh:
-        center = mesh.ve_center(ve)
-        cell = find_volume(center)
-        cells.append(cell)
-
-    return cells
+    return find_volumes(mesh.ve_centers())
 
-def ray_discretize(mesh, num_rays=10, grid=False):
-    """ray_discretize(mesh, num_rays=10, grid=False)
+def ray_discretize(mesh, num_rays=10, grid=False, num_procs=1, seed=None,
+                   geom_file=None):
+    """ray_discretize(mesh, num_rays=10, grid=False, num_procs=1, seed=None,
+                      geom_file=None)
     This function discretizes a geometry (by geometry cell) onto a 
     superimposed, structured, axis-aligned mesh using the method described in
     [1]. Ray tracing is used to sample track lengths in geometry cells in mesh
@@ -838,6 +925,17 @@ def ray_discretize(mesh, num_rays=10, grid=False):
         for each mesh row. If true, a linearly spaced grid of starting points is
         used, with dimension sqrt(num_rays) x sqrt(num_rays). In this case,
         "num_rays" must be a perfect square.
+    num_procs : int, optional, default = 1
+        The number of worker processes that mesh rows are distributed over.
+        Each worker uses its own copy of the DAGMC geometry.
+    seed : int, optional
+        The seed of the random starting points. Every mesh row draws its
+        starting points from its own stream seeded with (seed, row number),
+        so the results do not depend on num_procs. If None, a seed is drawn
+        from numpy.random.
+    geom_file : str, optional
+        A DAGMC geometry file for each worker process to load. If None, the
+        workers use the geometry loaded in the calling process.
 
     Returns
     -------
@@ -857,94 +955,130 @@ def ray_discretize(mesh, num_rays=10, grid=False):
     """
     mesh._structured_check()
     divs = [mesh.structured_get_divisions(x) for x in b'xyz']
-    num_ves = (len(divs[0])-1)*(len(divs[1])-1)*(len(divs[2])-1)
-    #  Stores a running tally of sums of x and sums of x^2 for each ve
-    mesh_sums = [{} for x in range(0, num_ves)]
-    #  The length of the output array (will vary because different ve contain
-    #  different numbers of geometry cells.
-    len_count = 0
-
-    #  Direction indicies: x = 0, y = 1, z = 2
-    dis = [0, 1, 2]
-    #  Iterate over all directions indicies
-    for di in dis:
-        #  For each direction, the remaining two directions define the sampling 
-        #  surface. These two directions are the values in s_dis (surface
-        #  direction indices)
-        s_dis = [0, 1, 2]
-        s_dis.remove(di)
-        #  Iterate through all all the sampling planes perpendicular to di,
-        #  creating a _MeshRow in each, and subsequently evaluating that row.
-        for a in range(0, len(divs[s_dis[0]]) - 1):
-            for b in range(0, len(divs[s_dis[1]]) - 1):
-                mesh_row = _MeshRow()
-                mesh_row.di = di
-                mesh_row.divs = divs[di]
-                mesh_row.num_rays = num_rays
-                mesh_row.s_dis_0 = s_dis[0]
-                mesh_row.s_min_0 = divs[s_dis[0]][a]
-                mesh_row.s_max_0 = divs[s_dis[0]][a + 1]
-                mesh_row.s_dis_1 = s_dis[1]
-                mesh_row.s_min_1 = divs[s_dis[1]][b]
-                mesh_row.s_max_1 = divs[s_dis[1]][b + 1]
-
-                #  Create a lines of starting points to fire rays for this
-                #  particular mesh row.
-                if not grid:
-                    mesh_row._rand_start()
-                else:
-                    mesh_row._grid_start()
-
-                #  Create a list of mesh idx corresponding to this mesh row.
+    shape = tuple(len(d) - 1 for d in divs)
+    if seed is None:
+        seed = np.random.randint(0, 2**31 - 1)
+
+    #  Look up the mesh idx of every volume element once, indexed by (i, j, k).
+    idx_grid = np.fromiter(mesh.iter_structured_idx('xyz'), dtype=np.int64,
+                           count=shape[0]*shape[1]*shape[2]).reshape(shape)
+
+    #  A mesh row is identified by its firing direction index (x = 0, y = 1,
+    #  z = 2) and its position (a, b) on the sampling plane spanned by the two
+    #  remaining directions.
+    rows = []
+    row_idx = []
+    for di in range(3):
+        s_dis = [x for x in range(3) if x != di]
+        for a in range(shape[s_dis[0]]):
+            for b in range(shape[s_dis[1]]):
+                rows.append((divs, num_rays, grid, seed, len(rows), di, a, b))
                 if di == 0:
-                    ves = mesh.structured_iterate_hex('x', y=a, z=b)
+                    row_idx.append(idx_grid[:, a, b])
                 elif di == 1:
-                    ves = mesh.structured_iterate_hex('y', x=a, z=b)
-                elif di == 2:
-                    ves = mesh.structured_iterate_hex('z', x=a, y=b)
-
-                idx_tag = mesh.mesh.getTagHandle('idx')
-                idx = []
-                for ve in ves:
-                    idx.append(idx_tag[ve])
-
-                #  Fire rays.
-                row_sums = mesh_row._evaluate_row()
-
-                #  Add row results to the full mesh sum matrix.
-                for j, ve_sums in enumerate(row_sums):
-                   for cell in ve_sums.keys():
-                       if ve_sums[cell][0] < VOL_FRAC_TOLERANCE:
-                           continue
-                       if cell not in mesh_sums[idx[j]].keys():
-                           mesh_sums[idx[j]][cell] = [0, 0]
-                           len_count += 1
-
-                       mesh_sums[idx[j]][cell][0] += ve_sums[cell][0]
-                       mesh_sums[idx[j]][cell][1] += ve_sums[cell][1]
-
+                    row_idx.append(idx_grid[a, :, b])
+                else:
+                    row_idx.append(idx_grid[a, b, :])
+
+    #  Fire rays, keeping the row results in row order.
+    if num_procs > 1:
+        import multiprocessing
+        initializer = None if geom_file is None else load
+        initargs = () if geom_file is None else (geom_file,)
+        pool = multiprocessing.Pool(num_procs, initializer, initargs)
+        try:
+            chunksize = max(1, len(rows) // (4*num_procs))
+            row_results = pool.map(_discretize_row, rows, chunksize)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        row_results = [_discretize_row(row) for row in rows]
+
+    #  Gather the row tallies into preallocated arrays and sum them per
+    #  (idx, cell). The stable sort keeps the row order within each group so
+    #  the sums are reproducible.
+    num_entries = sum(len(r[0]) for r in row_results)
+    idx = np.empty(num_entries, dtype=np.int64)
+    cells = np.empty(num_entries, dtype=np.int64)
+    sums = np.empty(num_entries, dtype=np.float64)
+    sq_sums = np.empty(num_entries, dtype=np.float64)
+    pos = 0
+    for (ve_pos, row_cells, row_sums, row_sq_sums), ridx in zip(row_results,
+                                                                  row_idx):
+        n = len(ve_pos)
+        idx[pos:pos + n] = ridx[ve_pos]
+        cells[pos:pos + n] = row_cells
+        sums[pos:pos + n] = row_sums
+        sq_sums[pos:pos + n] = row_sq_sums
+        pos += n
+
+    order = np.lexsort((cells, idx))
+    idx = idx[order]
+    cells = cells[order]
+    starts = np.flatnonzero(np.concatenate(([True], (idx[1:] != idx[:-1]) |
+                                                    (cells[1:] != cells[:-1]))))
+    starts = starts[starts < num_entries]
+    sums = np.add.reduceat(sums[order], starts) if num_entries else sums
+    sq_sums = np.add.reduceat(sq_sums[order], starts) if num_entries \
+              else sq_sums
 
     #  Create structured array
     total_rays = num_rays*3 # three directions
-    results = np.zeros(len_count, dtype=[(b'idx', np.int64),
-                                         (b'cell', np.int64),
-                                         (b'vol_frac', np.float64), 
-                                         (b'rel_error', np.float64)])
-
-    row_count = 0
-    total_rays = num_rays*3
-    for i, ve_sums in enumerate(mesh_sums):
-       for vol in ve_sums.keys():
-           vol_frac = ve_sums[vol][0]/total_rays
-           rel_error = np.sqrt((ve_sums[vol][1])/(ve_sums[vol][0])**2 
-                                - 1.0/total_rays)
-           results[row_count] = (i, vol, vol_frac, rel_error)
-           row_count += 1
-
-    results.sort()
+    results = np.zeros(len(starts), dtype=[(b'idx', np.int64),
+                                           (b'cell', np.int64),
+                                           (b'vol_frac', np.float64), 
+                                           (b'rel_error', np.float64)])
+    results[b'idx'] = idx[starts]
+    results[b'cell'] = cells[starts]
+    results[b'vol_frac'] = sums/total_rays
+    results[b'rel_error'] = np.sqrt(sq_sums/sums**2 - 1.0/total_rays)
 
     return results
 
+def _discretize_row(args):
+    """Private function that fires rays down a single mesh row. The argument
+    is a tuple of (divs, num_rays, grid, seed, row number, direction index,
+    a, b), see ray_discretize(). Returns the mesh row positions, cells, sums
+    and sums of squares of the row tallies that are above VOL_FRAC_TOLERANCE.
+    """
+    divs, num_rays, grid, seed, row_num, di, a, b = args
+    s_dis = [x for x in range(3) if x != di]
+    mesh_row = _MeshRow()
+    mesh_row.di = di
+    mesh_row.divs = divs[di]
+    mesh_row.num_rays = num_rays
+    mesh_row.s_dis_0 = s_dis[0]
+    mesh_row.s_min_0 = divs[s_dis[0]][a]
+    mesh_row.s_max_0 = divs[s_dis[0]][a + 1]
+    mesh_row.s_dis_1 = s_dis[1]
+    mesh_row.s_min_1 = divs[s_dis[1]][b]
+    mesh_row.s_max_1 = divs[s_dis[1]][b + 1]
+    mesh_row.rng = np.random.RandomState([seed, row_num])
+
+    #  Create a lines of starting points to fire rays for this particular
+    #  mesh row.
+    if not grid:
+        mesh_row._rand_start()
+    else:
+        mesh_row._grid_start()
+
+    ve_pos = []
+    cells = []
+    sums = []
+    sq_sums = []
+    for j, ve_sums in enumerate(mesh_row._evaluate_row()):
+        for cell in sorted(ve_sums.keys()):
+            if ve_sums[cell][0] < VOL_FRAC_TOLERANCE:
+                continue
+            ve_pos.append(j)
+            cells.append(cell)
+            sums.append(ve_sums[cell][0])
+            sq_sums.append(ve_sums[cell][1])
+    return (np.array(ve_pos, dtype=np.int64), np.array(cells, dtype=np.int64),
+            np.array(sums, dtype=np.float64),
+            np.array(sq_sums, dtype=np.float64))
+
 class _MeshRow():
     """A class to store data and fire rays down a single mesh row.
 
@@ -976,6 +1110,9 @@ class _MeshRow():
     s_max_1 : float
         The location of the plane the bounds the firing surface from the right
         in direction s_dis_1.
+    rng : numpy.random.RandomState, optional
+        The random number stream for random starting points, defaults to
+        numpy.random.
        """
     def __init__(self):
         pass
@@ -984,15 +1121,16 @@ class _MeshRow():
         """Private function for randomly generating ray starting points to
         populate self.starting_points
         """
+        rng = getattr(self, 'rng', np.random)
         self.start_points = []
         ray_count = 0
         while ray_count < self.num_rays:
             start_point = [0]*3
             start_point[self.di] = self.divs[0]
-            start_point[self.s_dis_0] = np.random.uniform(self.s_min_0,
-                                                          self.s_max_0)
-            start_point[self.s_dis_1] = np.random.uniform(self.s_min_1,
-                                                          self.s_max_1)
+            start_point[self.s_dis_0] = rng.uniform(self.s_min_0,
+                                                    self.s_max_0)
+            start_point[self.s_dis_1] = rng.uniform(self.s_min_1,
+                                                    self.s_max_1)
             self.start_points.append(start_point)
             ray_count += 1
     
@@ -10,6 +10,7 @@ from libcpp.map cimport map as cpp_map
 from libcpp.set cimport set as cpp_set
 from libcpp.string cimport string as std_string
 from libcpp.utility cimport pair as cpp_pair
+from libcpp.vector cimport vector as cpp_vector
 #from cython cimport pointer
 
 #Standard lib import
@@ -1050,6 +1051,43 @@ def decay_children(nuc, use_metastable=True):
 
     return dc
 
+_decay_graph = None
+
+def decay_graph():
+    """Returns the decay data of all nuclides as a graph in compressed sparse
+    row form. The children of nucs[i] and the branch ratios to them are
+    children[indptr[i]:indptr[i+1]] and branch_ratios[indptr[i]:indptr[i+1]].
+    The graph is built once, from decay_const(), decay_children() and
+    branch_ratio(), and the same arrays are returned on every call, so they
+    must not be modified.
+
+    Returns
+    -------
+    nucs : ndarray of ints
+        Sorted nuclides in state id form.
+    decay_consts : ndarray of floats
+        Decay constants of nucs [1/seconds].
+    indptr : ndarray of ints
+        Offsets of each nuclide's children, length len(nucs) + 1.
+    children : ndarray of ints
+        Decay children in state id form.
+    branch_ratios : ndarray of floats
+        Branch ratios of each parent/child pair [fraction].
+    """
+    global _decay_graph
+    cdef cpp_data.decay_graph g
+    if _decay_graph is None:
+        g = cpp_data.get_decay_graph()
+        arrays = (np.array(g.nucs, dtype=np.int64),
+                  np.array(g.decay_consts, dtype=np.float64),
+                  np.array(g.indptr, dtype=np.int64),
+                  np.array(g.children, dtype=np.int64),
+                  np.array(g.branch_ratios, dtype=np.float64))
+        for arr in arrays:
+            arr.flags.writeable = False
+        _decay_graph = arrays
+    return _decay_graph
+
 def all_children(nuc):
     """
     returns child nuclides from both level and decay data
@@ -1518,6 +1556,44 @@ def gamma_parent(en, enerror=None):
         enerror = en * 0.01
     return cpp_data.gamma_parent(<double> en, <double> enerror)
 
+def _energy_windows(en, enerror):
+    """Flattens energies and their errors into lists of equal length, with
+    errors defaulting to 1% of the energies."""
+    en = np.asarray(en, dtype=np.float64).ravel()
+    if enerror is None:
+        enerror = en * 0.01
+    else:
+        enerror = np.asarray(enerror, dtype=np.float64).ravel()
+        if enerror.size == 1:
+            enerror = np.repeat(enerror, en.size)
+    return list(en), list(enerror)
+
+def gamma_parent_many(en, enerror=None):
+    """
+    Returns the gamma ray parents from ENSDF decay dataset for each of many
+    gamma-ray energies. The windows are looked up in an energy sorted index
+    of the decay data, so this is much faster than calling gamma_parent()
+    in a loop.
+
+    Parameters
+    ----------
+    en : array-like of doubles
+        gamma ray energies in keV
+    enerror : double or array-like of doubles
+        gamma ray energy errors (range which you want to search) this defaults
+        to 1% of the energies if it is not provided
+
+    Returns
+    -------
+    parents : list of lists of ints
+        The gamma ray parents in state_id form for each energy
+    """
+    cdef cpp_vector[double] cen, cerr
+    en, enerror = _energy_windows(en, enerror)
+    cen = en
+    cerr = enerror
+    return cpp_data.gamma_parent(cen, cerr)
+
 def gamma_child_byen(en, enerror=None):
     """
     Returns a list of gamma ray children from ENSDF decay dataset
@@ -1540,6 +1616,30 @@ def gamma_child_byen(en, enerror=None):
         enerror = en * 0.01
     return cpp_data.gamma_child(<double> en, <double> enerror)
 
+def gamma_child_byen_many(en, enerror=None):
+    """
+    Returns the gamma ray children from ENSDF decay dataset for each of many
+    gamma-ray energies.
+
+    Parameters
+    ----------
+    en : array-like of doubles
+        gamma ray energies in keV
+    enerror : double or array-like of doubles
+        gamma ray energy errors (range which you want to search) this defaults
+        to 1% of the energies if it is not provided
+
+    Returns
+    -------
+    children : list of lists of ints
+        The gamma ray children in state_id form for each energy
+    """
+    cdef cpp_vector[double] cen, cerr
+    en, enerror = _energy_windows(en, enerror)
+    cen = en
+    cerr = enerror
+    return cpp_data.gamma_child(cen, cerr)
+
 def gamma_child_byparent(parent):
     """
     Returns a list of gamma ray children from ENSDF decay dataset
@@ -1578,6 +1678,29 @@ def gamma_xrays(parent):
     """
     return cpp_data.gamma_xrays(<int> parent)
 
+def photon_lines(parent):
+    """photon_lines(parent)
+    Returns the gamma and X-ray lines of a nuclide sorted by energy, with the
+    intensities of lines at equal energies summed and lines with unknown
+    intensities dropped. The lines are computed once per nuclide.
+
+    Parameters
+    ----------
+    parent : int
+        parent nuclide in state_id form
+
+    Returns
+    -------
+    energies : ndarray of floats
+        Photon energies [keV], ascending.
+    intensities : ndarray of floats
+        Photon intensities [decays/s/atom].
+
+    """
+    cdef cpp_data.line_spectrum lines = cpp_data.merged_photons(<int> parent)
+    return (np.array(lines.energies, dtype=np.float64),
+            np.array(lines.intensities, dtype=np.float64))
+
 def alpha_energy(parent):
     """
     Returns a list of alpha energies from ENSDF decay dataset from a given
@@ -1746,6 +1869,30 @@ def beta_parent(en, enerror=None):
         enerror = en * 0.01
     return cpp_data.beta_parent(<double> en, <double> enerror)
 
+def beta_parent_many(en, enerror=None):
+    """
+    Returns the beta minus parents from ENSDF decay dataset for each of many
+    beta energies.
+
+    Parameters
+    ----------
+    en : array-like of doubles
+        beta- energies in keV
+    enerror : double or array-like of doubles
+        beta- energy errors (range which you want to search) this defaults
+        to 1% of the energies if it is not provided
+
+    Returns
+    -------
+    parents : list of lists of ints
+        The beta minus parents in nuc_id form for each energy
+    """
+    cdef cpp_vector[double] cen, cerr
+    en, enerror = _energy_windows(en, enerror)
+    cen = en
+    cerr = enerror
+    return cpp_data.beta_parent(cen, cerr)
+
 def beta_child_byen(en, enerror=None):
     """
     Returns a list of beta minus children from ENSDF decay dataset
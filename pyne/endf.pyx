@@ -15,6 +15,9 @@ from __future__ import print_function, division, unicode_literals
 
 import re
 import os
+import json
+import mmap
+import hashlib
 from collections import OrderedDict, Iterable
 from warnings import warn
 from pyne.utils import QAWarning
@@ -45,6 +48,8 @@ CONTENTS_R = re.compile(' +\d{1,2} +\d{1,3} +\d{1,10} +')
 SPACE66_R = re.compile(' {66}')
 NUMERICAL_DATA_R = re.compile('[\d\-+. ]{80}\n$')
 SPACE66_R = re.compile(' {66}')
+# number of bytes at each end of a tape that are hashed to validate its index
+_INDEX_CHECK_BYTES = 2**20
 
 def _radiation_type(value):
     p = {0: 'gamma', 1: 'beta-', 2: 'ec/beta+', 3: 'IT',
@@ -57,8 +62,23 @@ def _radiation_type(value):
 
 
 class Library(rxdata.RxLib):
-    """A class for a file which contains multiple ENDF evaluations."""
-    def __init__(self, fh):
+    """A class for a file which contains multiple ENDF evaluations. If the
+    tape is given by filename, it is memory mapped when the first reaction is
+    read. The map is released by close() or at the end of a with statement.
+
+    Parameters
+    ----------
+    fh : str or file handle
+        The ENDF tape, or its filename.
+    index : bool or str, optional
+        Only used if fh is a filename. If True, the material headers are
+        stored in a sidecar index file next to the tape, fh + '.index.json'.
+        A string gives the path of the index file instead. If a valid index
+        exists, it is read instead of scanning the headers of the tape. The
+        index is keyed on the size, modification time, and a checksum of the
+        ends of the tape, and rebuilt if any of them change.
+    """
+    def __init__(self, fh, index=False):
         self.mts = {}
         self.structure = {}
         self.mat_dict = {}
@@ -72,12 +92,116 @@ class Library(rxdata.RxLib):
         self.chars_til_now = 0
         self.offset = 0
         self.fh = fh
+        self._mm = None
         self._set_line_length()
+        index_path = None
+        if index and isinstance(fh, basestring):
+            index_path = fh + '.index.json' if index is True else index
+            if self._load_index(index_path):
+                return
         # read first line (Tape ID)
         self._read_tpid()
         # read headers for all materials
         while self.more_files:
             self._read_headers()
+        if index_path is not None:
+            self._save_index(index_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """Closes the memory map of the tape, if any. The tape is mapped
+        again if reactions are read afterwards.
+        """
+        mm = self.__dict__.get('_mm')
+        if mm is not None:
+            mm.close()
+            self._mm = None
+
+    def _map(self):
+        """Returns a read-only memory map of the tape, which is created on
+        first use. Reactions are sliced straight out of it when the tape was
+        given by filename and has plain newlines, otherwise None is returned.
+        """
+        if self._mm is None and isinstance(self.fh, basestring) and \
+           self.line_length == 81:
+            with open(self.fh, 'rb') as f:
+                if os.fstat(f.fileno()).st_size > 0:
+                    self._mm = mmap.mmap(f.fileno(), 0,
+                                         access=mmap.ACCESS_READ)
+        return self._mm
+
+    def _index_key(self):
+        """Returns the size, modification time, and checksum that an index
+        must match to be used for this tape.
+        """
+        st = os.stat(self.fh)
+        h = hashlib.sha1()
+        with open(self.fh, 'rb') as f:
+            h.update(f.read(_INDEX_CHECK_BYTES))
+            if st.st_size > 2*_INDEX_CHECK_BYTES:
+                f.seek(-_INDEX_CHECK_BYTES, os.SEEK_END)
+                h.update(f.read())
+        return {'size': st.st_size, 'mtime': st.st_mtime,
+                'checksum': h.hexdigest()}
+
+    def _load_index(self, index_path):
+        """Restores the material headers from an index file. Returns False if
+        the index does not exist or does not match the tape.
+        """
+        try:
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+        except (IOError, OSError, ValueError):
+            return False
+        if index.get('key') != self._index_key():
+            return False
+        self.line_length = index['line_length']
+        self.chars_til_now = index['chars_til_now']
+        self.offset = index['offset']
+        self.more_files = False
+        for nuc, mat in index['materials']:
+            self.mat_dict[nuc] = {'end_line': mat['end_line'],
+                                  'mfs': dict(((mf, mt), (start, stop))
+                                              for mf, mt, start, stop
+                                              in mat['mfs'])}
+            self.structure[nuc] = {'styles': '', 'docs': mat['docs'],
+                                   'particles': [], 'data': {},
+                                   'matflags': mat['matflags']}
+            if mat['end_line'] != []:
+                setattr(self, 'mat{0}'.format(nuc), self.structure[nuc])
+        return True
+
+    def _save_index(self, index_path):
+        """Writes the material headers to an index file."""
+        materials = []
+        for nuc in sorted(self.mat_dict):
+            mfs = [[mf, mt, start, stop] for (mf, mt), (start, stop)
+                   in sorted(self.mat_dict[nuc]['mfs'].items())]
+            materials.append([nuc, {'end_line': self.mat_dict[nuc]['end_line'],
+                                    'mfs': mfs,
+                                    'docs': self.structure[nuc]['docs'],
+                                    'matflags': self.structure[nuc]['matflags']}])
+        index = {'key': self._index_key(), 'line_length': self.line_length,
+                 'chars_til_now': self.chars_til_now, 'offset': self.offset,
+                 'materials': materials}
+        tmp_path = index_path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f)
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            os.rename(tmp_path, index_path)
+        except (IOError, OSError):
+            warn('could not write ENDF index {0}'.format(index_path),
+                 UserWarning)
 
     def _set_line_length(self):
         opened_here = False
@@ -1054,18 +1178,23 @@ class Library(rxdata.RxLib):
         array, 1d, float64
             1d, float64 NumPy array containing the reaction data.
         """
-        opened_here = False
-        if isinstance(self.fh, basestring):
-            fh = open(self.fh, 'rU')
-            opened_here = True
-        else:
-            fh = self.fh
         try:
             start, stop = self.mat_dict[nuc]['mfs'][mf, mt]
         except KeyError as e:
             msg = 'MT {1} not found in File {0}.'.format(mf, mt)
             e.args = (msg,)
             raise e
+        mm = self._map()
+        if mm is not None:
+            if lines != 0:
+                stop = start + lines*self.line_length
+            return fromendf_tok(mm[start:stop])
+        opened_here = False
+        if isinstance(self.fh, basestring):
+            fh = open(self.fh, 'rU')
+            opened_here = True
+        else:
+            fh = self.fh
         fh.readline()
         fh.seek(start)
         if lines == 0:
@@ -1145,6 +1274,47 @@ def seek_section_end(f):
             break
 
 
+# files (MF) whose sections are stored in Evaluation.reactions
+_REACTION_MFS = frozenset([3, 4, 5, 6, 9, 10, 12, 13, 14, 15, 23, 26, 27])
+
+
+def _section_attr(MF, MT):
+    """Returns the name of the Evaluation attribute that the data of section
+    (MF, MT) is stored in, or None if the section is not parsed.
+    """
+    if MF == 1:
+        return 'fission' if MT in (452, 455, 456, 458, 460) else None
+    elif MF == 2:
+        return 'resonances' if MT == 151 else None
+    elif MF == 7:
+        return {2: 'thermal_elastic', 4: 'thermal_inelastic'}.get(MT)
+    elif MF == 8:
+        return {454: 'fission', 457: 'decay', 459: 'fission'}.get(MT,
+                                                                  'reactions')
+    elif MF == 28:
+        return 'atomic_relaxation'
+    elif MF in _REACTION_MFS:
+        return 'reactions'
+    return None
+
+
+def _lazy_attr(name):
+    """Returns a property for an Evaluation attribute that is parsed from the
+    ENDF file on first access when the evaluation is lazy.
+    """
+    def fget(self):
+        if name in self._unread:
+            # discard first, the section readers access the attribute too
+            self._unread.discard(name)
+            self._read_attr(name)
+        return self._attrs[name]
+
+    def fset(self, value):
+        self._attrs[name] = value
+
+    return property(fget, fset)
+
+
 class Evaluation(object):
     """ENDF material evaluation with multiple files/sections
 
@@ -1227,9 +1397,32 @@ class Evaluation(object):
     thermal_inelastic : dict
         Incoherent thermal inelastic data from MF=7, MT=4.
 
+    Parameters
+    ----------
+    filename_or_handle : str or file-like
+        The ENDF file to read the evaluation from.
+    verbose : bool, optional
+        Whether to print the sections as they are read.
+    lazy : bool, optional
+        If True, the file is only scanned for the positions of its sections.
+        The data attributes above (reactions, resonances, fission, decay,
+        thermal_elastic, thermal_inelastic and atomic_relaxation) are then
+        parsed on first access, so read() need not be called.
+
     """
 
-    def __init__(self, filename_or_handle, verbose=True):
+    reactions = _lazy_attr('reactions')
+    resonances = _lazy_attr('resonances')
+    fission = _lazy_attr('fission')
+    decay = _lazy_attr('decay')
+    thermal_elastic = _lazy_attr('thermal_elastic')
+    thermal_inelastic = _lazy_attr('thermal_inelastic')
+    atomic_relaxation = _lazy_attr('atomic_relaxation')
+
+    def __init__(self, filename_or_handle, verbose=True, lazy=False):
+        self._attrs = {}
+        self._unread = set()
+        self._parsed = set()
         if hasattr(filename_or_handle, 'read'):
             self._fh = filename_or_handle
         else:
@@ -1269,6 +1462,53 @@ class Evaluation(object):
         # Save starting position
         self._start_position = self._fh.tell()
 
+        # Positions of each section, (MF, MT) -> file position
+        self._sections = None
+        if lazy:
+            self._scan_sections()
+            self._unread = set(_section_attr(MF, MT)
+                               for MF, MT in self._sections) - set([None])
+
+    def _scan_sections(self):
+        """Finds the starting position of every section in the evaluation
+        without parsing it.
+        """
+        self._fh.seek(self._start_position)
+        self._sections = OrderedDict()
+        last = None
+        while True:
+            position = self._fh.tell()
+            line = self._fh.readline()
+            if not line:
+                break
+            key = line[66:75]
+            if key == last:
+                continue
+            last = key
+            MAT = int(line[66:70])
+            MF = int(line[70:72])
+            MT = int(line[72:75])
+            if MAT == 0:
+                break
+            if MT > 0 and (MF, MT) not in self._sections:
+                self._sections[MF, MT] = position
+
+    def _read_attr(self, name):
+        """Parses all the sections stored in the attribute name."""
+        self._read_lazy_sections([key for key in self._sections
+                                  if _section_attr(*key) == name])
+
+    def _read_lazy_sections(self, keys):
+        """Parses the sections (MF, MT) in keys that have not been parsed yet,
+        in file order.
+        """
+        for MF, MT in keys:
+            if (MF, MT) in self._parsed:
+                continue
+            self._fh.seek(self._sections[MF, MT])
+            self._read_section(MF, MT)
+            self._parsed.add((MF, MT))
+
     def read(self, reactions=None, skip_mf=[], skip_mt=[]):
         """Reads reactions from the ENDF file of the Evaluation object. If no
         arguments are provided, this method will read all the reactions in the
@@ -1283,14 +1523,39 @@ class Evaluation(object):
         skip_mt : list of int, optional
             Reactions (MT) which should not be read
 
-        """
-
-        # Make sure file is positioned correctly
-        self._fh.seek(self._start_position)
+        Notes
+        -----
+        For a lazy evaluation, sections that were already parsed are not read
+        again, and attributes whose sections have all been read are no longer
+        parsed on access.
 
+        """
         if isinstance(reactions, tuple):
             reactions = [reactions]
 
+        if self._sections is None:
+            # Make sure file is positioned correctly
+            self._fh.seek(self._start_position)
+            self._read_sections(reactions, skip_mf, skip_mt)
+            return
+
+        # Data read here must not trigger lazy parsing
+        keys = [(MF, MT) for MF, MT in self._sections
+                if MF not in skip_mf and MT not in skip_mt and
+                (not reactions or (MF, MT) in reactions) and
+                _section_attr(MF, MT) is not None]
+        unread, self._unread = self._unread, set()
+        try:
+            self._read_lazy_sections(keys)
+        finally:
+            self._unread = unread
+        for name in list(unread):
+            if all(key in self._parsed for key in self._sections
+                   if _section_attr(*key) == name):
+                unread.discard(name)
+
+    def _read_sections(self, reactions, skip_mf, skip_mt):
+        """Reads sections in file order, see read()."""
         while True:
             # Find next section
             while True:
@@ -1320,107 +1585,110 @@ class Evaluation(object):
                 seek_section_end(self._fh)
                 continue
 
+            self._read_section(MF, MT)
 
-            # File 1 data
-            if MF == 1:
-                if MT == 452:
-                    # Number of total neutrons per fission
-                    self._read_total_nu()
-                elif MT == 455:
-                    # Number of delayed neutrons per fission
-                    self._read_delayed_nu()
-                elif MT == 456:
-                    # Number of prompt neutrons per fission
-                    self._read_prompt_nu()
-                elif MT == 458:
-                    # Components of energy release due to fission
-                    self._read_fission_energy()
-                elif MT == 460:
-                    self._read_delayed_photon()
-
-            elif MF == 2:
-                # Resonance parameters
-                if MT == 151:
-                    self._read_resonances()
-                else:
-                    seek_section_end(self._fh)
-
-            elif MF == 3:
-                # Reaction cross sections
-                self._read_reaction_xs(MT)
-
-            elif MF == 4:
-                # Angular distributions
-                self._read_angular_distribution(MT)
-
-            elif MF == 5:
-                # Energy distributions
-                self._read_energy_distribution(MT)
-
-            elif MF == 6:
-                # Product energy-angle distributions
-                self._read_product_energy_angle(MT)
-
-            elif MF == 7:
-                # Thermal scattering data
-                if MT == 2:
-                    self._read_thermal_elastic()
-                if MT == 4:
-                    self._read_thermal_inelastic()
-
-            elif MF == 8:
-                # decay and fission yield data
-                if MT == 454:
-                    self._read_independent_yield()
-                elif MT == 459:
-                    self._read_cumulative_yield()
-                elif MT == 457:
-                    self._read_decay()
-                else:
-                    self._read_radioactive_nuclide(MT)
+    def _read_section(self, MF, MT):
+        """Parses the section (MF, MT) starting at the current file position.
+        """
+        if MF == 1:
+            if MT == 452:
+                # Number of total neutrons per fission
+                self._read_total_nu()
+            elif MT == 455:
+                # Number of delayed neutrons per fission
+                self._read_delayed_nu()
+            elif MT == 456:
+                # Number of prompt neutrons per fission
+                self._read_prompt_nu()
+            elif MT == 458:
+                # Components of energy release due to fission
+                self._read_fission_energy()
+            elif MT == 460:
+                self._read_delayed_photon()
+
+        elif MF == 2:
+            # Resonance parameters
+            if MT == 151:
+                self._read_resonances()
+            else:
+                seek_section_end(self._fh)
+
+        elif MF == 3:
+            # Reaction cross sections
+            self._read_reaction_xs(MT)
+
+        elif MF == 4:
+            # Angular distributions
+            self._read_angular_distribution(MT)
+
+        elif MF == 5:
+            # Energy distributions
+            self._read_energy_distribution(MT)
+
+        elif MF == 6:
+            # Product energy-angle distributions
+            self._read_product_energy_angle(MT)
+
+        elif MF == 7:
+            # Thermal scattering data
+            if MT == 2:
+                self._read_thermal_elastic()
+            if MT == 4:
+                self._read_thermal_inelastic()
+
+        elif MF == 8:
+            # decay and fission yield data
+            if MT == 454:
+                self._read_independent_yield()
+            elif MT == 459:
+                self._read_cumulative_yield()
+            elif MT == 457:
+                self._read_decay()
+            else:
+                self._read_radioactive_nuclide(MT)
 
-            elif MF == 9:
-                # multiplicities
-                self._read_multiplicity(MT)
+        elif MF == 9:
+            # multiplicities
+            self._read_multiplicity(MT)
 
-            elif MF == 10:
-                # cross sections for production of radioactive nuclides
-                self._read_production_xs(MT)
+        elif MF == 10:
+            # cross sections for production of radioactive nuclides
+            self._read_production_xs(MT)
 
-            elif MF == 12:
-                # Photon production yield data
-                self._read_photon_production_yield(MT)
+        elif MF == 12:
+            # Photon production yield data
+            self._read_photon_production_yield(MT)
 
-            elif MF == 13:
-                # Photon production cross sections
-                self._read_photon_production_xs(MT)
+        elif MF == 13:
+            # Photon production cross sections
+            self._read_photon_production_xs(MT)
 
-            elif MF == 14:
-                # Photon angular distributions
-                self._read_photon_angular_distribution(MT)
+        elif MF == 14:
+            # Photon angular distributions
+            self._read_photon_angular_distribution(MT)
 
-            elif MF == 15:
-                # Photon continuum energy distributions
-                self._read_photon_energy_distribution(MT)
+        elif MF == 15:
+            # Photon continuum energy distributions
+            self._read_photon_energy_distribution(MT)
 
-            elif MF == 23:
-                # photon interaction data
-                self._read_photon_interaction(MT)
+        elif MF == 23:
+            # photon interaction data
+            self._read_photon_interaction(MT)
 
-            elif MF == 26:
-                # secondary distributions for photon interactions
-                self._read_electron_products(MT)
+        elif MF == 26:
+            # secondary distributions for photon interactions
+            self._read_electron_products(MT)
 
-            elif MF == 27:
-                # atomic form factors or scattering functions
-                self._read_scattering_functions(MT)
+        elif MF == 27:
+            # atomic form factors or scattering functions
+            self._read_scattering_functions(MT)
 
-            elif MF == 28:
-                # atomic relaxation data
-                self._read_atomic_relaxation()
+        elif MF == 28:
+            # atomic relaxation data
+            self._read_atomic_relaxation()
 
-            else:
-                seek_file_end(self._fh)
+        else:
+            seek_file_end(self._fh)
 
     def _read_header(self):
         self._print_info(1, 451)
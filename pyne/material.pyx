@@ -1245,12 +1245,60 @@ cdef class _Material:
         """
         return self.mat_pointer.photons(<cpp_bool> norm)
 
-    def decay(self, double t):
-        """decay(double t)
+    def photon_lines(self, norm=False):
+        """photon_lines(norm=False)
+        Returns the photon lines of the material, the X-rays and gamma-rays
+        produced in its decay, sorted by energy with the intensities of lines
+        at equal energies summed. Lines with unknown intensities are dropped.
+
+        Parameters
+        ----------
+        norm : boolean
+            If True the intensities are normalized to sum to one.
+
+        Returns
+        -------
+        lines : a vector of pairs of photon energies [keV] and intensities. The
+            intensities are in decays/s/atom material
+        """
+        return self.mat_pointer.photon_lines(<cpp_bool> norm)
+
+    def photon_spectrum(self, e_bounds, norm=False):
+        """photon_spectrum(e_bounds, norm=False)
+        Returns the photon intensities of the material binned into energy
+        groups. A line with energy E falls into group g if
+        e_bounds[g] <= E < e_bounds[g+1], with the last group closed.
+
+        Parameters
+        ----------
+        e_bounds : array-like of floats
+            Ascending energy group bounds [keV].
+        norm : boolean
+            If True the intensities are divided by the total intensity of all
+            lines of the material.
+
+        Returns
+        -------
+        spectrum : ndarray of floats, length len(e_bounds) - 1
+            The intensities of each group in decays/s/atom material.
+        """
+        cdef cpp_vector[double] bounds = np.asarray(e_bounds, dtype=np.float64)
+        return np.array(self.mat_pointer.photon_spectrum(bounds,
+                                                         <cpp_bool> norm))
+
+    def decay(self, t):
+        """decay(t)
         Decays a material for a time t, in seconds. Returns a new material.
+        If t is a sequence of times, a list with the material decayed to
+        each time is returned instead, computed by decay_many().
         """
-        cdef _Material pymat = Material()
-        pymat.mat_pointer[0] = self.mat_pointer.decay(t)
+        cdef _Material pymat
+        if np.ndim(t) > 0:
+            declib = decay_many([self], t, lib=True)
+            return [declib[_decay_key(0, tt)]
+                    for tt in np.asarray(t, dtype=np.float64).tolist()]
+        pymat = Material()
+        pymat.mat_pointer[0] = self.mat_pointer.decay(<double> t)
         return pymat
 
     def cram(self, A, int order=14):
@@ -1898,6 +1946,160 @@ cdef dict map_to_dict_str_matp(cpp_map[std_string, matp] cppmap):
     return pydict
 
 
+def _decay_key(key, t):
+    """MaterialLibrary key of the material key decayed to the time t."""
+    return "{0}_{1!r}".format(key, t)
+
+
+def decay_many(materials, times, lib=False):
+    """decay_many(materials, times, lib=False)
+    Decays many materials to many times at once. Decay is linear in the
+    initial composition, so the decayed composition of every nuclide present
+    in any of the materials is computed once per time and shared by all
+    materials, which are then combined with one matrix product per time.
+
+    Parameters
+    ----------
+    materials : sequence or mapping of Materials
+        The materials to decay. If this is a mapping, such as a
+        MaterialLibrary, its keys label the materials.
+    times : float or array-like of floats
+        Decay times [seconds].
+    lib : bool, optional
+        If True, return a MaterialLibrary instead of the arrays.
+
+    Returns
+    -------
+    nucs : ndarray of ints
+        The nuclides present after decay, in id form.
+    atom_fracs : ndarray of floats, shape (len(materials), len(times), len(nucs))
+        The decayed compositions as multiples of the initial atom fractions
+        of each material.
+    lib : MaterialLibrary
+        Only if lib is True. Maps "<key>_<time>" to the decayed material,
+        where key is the mapping key, or the index into materials for a
+        sequence, and time is the repr of the decay time as a float, e.g.
+        "fuel_3600.0". These are the materials Material.decay() returns.
+        Their metadata holds the original key as "decay_key" and the time as
+        "decay_time".
+
+    """
+    cdef cpp_map[int, double] unit
+    if isinstance(materials, collections.Mapping):
+        keys = list(materials.keys())
+        materials = [materials[key] for key in keys]
+    else:
+        materials = list(materials)
+        keys = list(range(len(materials)))
+    times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+
+    fracs = [dict(mat.to_atom_frac()) for mat in materials]
+    nucs_in = sorted(set().union(*fracs))
+    idx_in = dict((nuc, i) for i, nuc in enumerate(nucs_in))
+    comps = np.zeros((len(materials), len(nucs_in)), dtype=np.float64)
+    for m, frac in enumerate(fracs):
+        for nuc, f in frac.items():
+            comps[m, idx_in[nuc]] = f
+
+    # decay a unit amount of each nuclide to each time
+    responses = []
+    for t in times:
+        resp = []
+        for nuc in nucs_in:
+            unit.clear()
+            unit[nuc] = 1.0
+            resp.append(cpp_material.decay(unit, t))
+        responses.append(resp)
+    nucs = sorted(set(nuc for resp in responses for r in resp for nuc in r))
+    idx_out = dict((nuc, j) for j, nuc in enumerate(nucs))
+
+    atom_fracs = np.empty((len(materials), len(times), len(nucs)),
+                          dtype=np.float64)
+    for k, resp in enumerate(responses):
+        D = np.zeros((len(nucs_in), len(nucs)), dtype=np.float64)
+        for i, r in enumerate(resp):
+            for nuc, val in r.items():
+                D[i, idx_out[nuc]] = val
+        atom_fracs[:, k, :] = comps.dot(D)
+    nucs = np.array(nucs, dtype=np.int64)
+    if not lib:
+        return nucs, atom_fracs
+
+    declib = MaterialLibrary()
+    for m, mat in enumerate(materials):
+        mw = mat.molecular_mass()
+        for k, t in enumerate(times.tolist()):
+            row = atom_fracs[m, k]
+            nz = row.nonzero()[0]
+            decmat = Material()
+            decmat.from_atom_frac(dict(zip(nucs[nz].tolist(),
+                                           row[nz].tolist())))
+            decmat.mass = mat.mass * decmat.molecular_mass() / mw
+            decmat.metadata["decay_key"] = keys[m] \
+                if isinstance(keys[m], (int, basestring)) else str(keys[m])
+            decmat.metadata["decay_time"] = t
+            declib[_decay_key(keys[m], t)] = decmat
+    return declib
+
+
+def photon_spectra(materials, e_bounds, norm=False):
+    """photon_spectra(materials, e_bounds, norm=False)
+    Computes the binned photon spectra of many materials at once, see
+    Material.photon_spectrum(). The merged photon lines of each nuclide are
+    binned once, so the spectra reduce to one sparse (materials x nuclides)
+    by (nuclides x groups) matrix product.
+
+    Parameters
+    ----------
+    materials : sequence or mapping of Materials
+        The materials. If this is a mapping, such as a MaterialLibrary, the
+        spectra are in the order of its keys.
+    e_bounds : array-like of floats
+        Ascending energy group bounds [keV].
+    norm : boolean
+        If True the intensities of each material are divided by the total
+        intensity of all its lines.
+
+    Returns
+    -------
+    spectra : ndarray of floats, shape (len(materials), len(e_bounds) - 1)
+        The intensities of each group in decays/s/atom material.
+
+    """
+    import scipy.sparse as sp
+    if isinstance(materials, collections.Mapping):
+        materials = [materials[key] for key in materials.keys()]
+    e_bounds = np.asarray(e_bounds, dtype=np.float64)
+    fracs = [dict(mat.to_atom_frac()) for mat in materials]
+    nucs = sorted(set().union(*fracs))
+    idx = dict((nuc, i) for i, nuc in enumerate(nucs))
+
+    # atom fractions of each material in compressed sparse row form
+    indptr = np.cumsum([0] + [len(frac) for frac in fracs])
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    values = np.empty(indptr[-1], dtype=np.float64)
+    for m, frac in enumerate(fracs):
+        indices[indptr[m]:indptr[m+1]] = [idx[nuc] for nuc in frac]
+        values[indptr[m]:indptr[m+1]] = list(frac.values())
+    A = sp.csr_matrix((values, indices, indptr),
+                      shape=(len(materials), len(nucs)))
+
+    # binned lines of each nuclide
+    G = np.empty((len(nucs), len(e_bounds) - 1), dtype=np.float64)
+    totals = np.empty(len(nucs), dtype=np.float64)
+    for i, nuc in enumerate(nucs):
+        state_id = nucname.id_to_state_id(nuc) if nuc % 10000 > 0 else nuc
+        energies, intensities = data.photon_lines(state_id)
+        G[i] = np.histogram(energies, bins=e_bounds, weights=intensities)[0]
+        totals[i] = intensities.sum()
+
+    spectra = np.asarray(A.dot(G))
+    if norm:
+        total = A.dot(totals)
+        nonzero = total > 0.0
+        spectra[nonzero] /= total[nonzero, np.newaxis]
+    return spectra
+
 
 # (Str, Material)
 cdef class MapIterStrMaterial(object):
@@ -2274,7 +2476,8 @@ cdef class _MaterialLibrary(object):
         if opened_here:
             file.close()
 
-    def from_hdf5(self, file, datapath="/materials", nucpath="/nucid"):
+    def from_hdf5(self, file, datapath="/materials", nucpath="/nucid",
+                  rows=None):
         """Loads data from an HDF5 file into this material library.
 
         Parameters
@@ -2285,6 +2488,9 @@ cdef class _MaterialLibrary(object):
             The path in the heirarchy to the data table in an HDF5 file.
         nucpath : str, optional
             The path in the heirarchy to the nuclide array in an HDF5 file.
+        rows : sequence of ints or None, optional
+            The row indices of the materials to load.  Only these rows are
+            read from the file.  If None, all materials are loaded.
 
         """
         cdef std_string s
@@ -2295,12 +2501,21 @@ cdef class _MaterialLibrary(object):
         cdef dict _lib = (<_MaterialLibrary> self)._lib
         cdef np.ndarray mattable
         with tb.open_file(file, 'r') as f:
-            matstable = f.get_node(datapath)[:]
+            matsnode = f.get_node(datapath)
             nucs = f.get_node(nucpath)[:]
-            matsmetadata = f.get_node(datapath + '_metadata').read()
+            metanode = f.get_node(datapath + '_metadata')
+            if rows is None:
+                rows = np.arange(len(matsnode))
+                matstable = matsnode[:]
+                matsmetadata = metanode.read()
+            else:
+                rows = np.asarray(rows, dtype=int)
+                matstable = matsnode.read_coordinates(rows)
+                matsmetadata = [metanode[r] for r in rows]
         for i in range(len(matstable)):
             row = matstable[i]
-            comp = dict((<int> k, v) for k, v in zip(nucs, row[3]) if v != 0.0)
+            nz = np.flatnonzero(row[3])
+            comp = dict(zip(nucs[nz].tolist(), row[3][nz].tolist()))
             mat = Material(comp, mass=row[0], density=row[1],
                                     atoms_per_molecule=row[2])
             strmetadata = "".join(map(chr, matsmetadata[i]))
@@ -2312,11 +2527,16 @@ cdef class _MaterialLibrary(object):
             if "name" in mat.metadata:
                 name = mat.metadata["name"]
             else:
-                name = "_" + str(i)
+                name = "_" + str(rows[i])
             _lib[name] = mat
 
-    def write_hdf5(self, filename, datapath="/materials", nucpath="/nucid"):
-        """Writes this material library to an HDF5 file.
+    def write_hdf5(self, filename, datapath="/materials", nucpath="/nucid",
+                   chunksize=100, complevel=1):
+        """Writes this material library to an HDF5 file, using Protocol 1 (see
+        the Material.from_hdf5() method).  The whole library is written in a
+        single pass: the union of the nuclides is written to nucpath once, the
+        material table is written as one block of rows, and the metadata of
+        each material is written as a JSON string to datapath + '_metadata'.
 
         Parameters
         ----------
@@ -2326,21 +2546,55 @@ cdef class _MaterialLibrary(object):
             The path in the heirarchy to the data table in an HDF5 file.
         nucpath : str, optional
             The path in the heirarchy to the nuclide array in an HDF5 file.
+        chunksize : int, optional
+            The number of rows per chunk of the material table.
+        complevel : int, optional
+            The zlib compression level of the material table, from 0 (no
+            compression) to 9.
 
         """
+        cdef int i
         cdef _Material mat
         cdef dict _lib = (<_MaterialLibrary> self)._lib
         cdef set nucids = set()
+        cdef cpp_jsoncpp.FastWriter writer = cpp_jsoncpp.FastWriter()
+        cdef std_string s
         for mat in _lib.values():
             nucids.update(mat.comp.keys())
+        nucs = sorted(nucids)
+        nucidx = dict((nuc, j) for j, nuc in enumerate(nucs))
+        desc = np.dtype([('mass', np.float64), ('density', np.float64),
+                         ('atoms_per_molecule', np.float64),
+                         ('comp', np.float64, (len(nucs),))])
+        matstable = np.zeros(len(_lib), dtype=desc)
+        matsmetadata = []
+        for i, (key, mat) in enumerate(_lib.items()):
+            if "name" not in mat.metadata:
+                mat.metadata["name"] = key
+            matstable['mass'][i] = mat.mass
+            matstable['density'][i] = mat.density
+            matstable['atoms_per_molecule'][i] = mat.atoms_per_molecule
+            comp = matstable['comp'][i]
+            for nuc, frac in mat.comp.items():
+                comp[nucidx[nuc]] = frac
+            s = writer.write((<_Material> mat).mat_pointer.metadata)
+            matsmetadata.append(np.frombuffer(s, dtype=np.int8))
+        filters = tb.Filters(complevel=complevel, complib='zlib')
         with tb.open_file(filename, 'a') as f:
             nucgrp, nucdsname = os.path.split(nucpath)
-            f.create_array(nucgrp, nucdsname, np.array(sorted(nucids)),
+            f.create_array(nucgrp, nucdsname, np.array(nucs, dtype=np.int32),
                           createparents=True)
-        for key, mat in _lib.items():
-            if "name" not in mat.metadata:
-                mat.metadata["name"] = key
-            mat.write_hdf5(filename, datapath=datapath, nucpath=nucpath)
+            datagrp, datadsname = os.path.split(datapath)
+            table = f.create_table(datagrp, datadsname, description=desc,
+                                   filters=filters, chunkshape=(chunksize,),
+                                   createparents=True)
+            table.append(matstable)
+            table.attrs.nucpath = np.bytes_(nucpath.encode('UTF-8'))
+            metadata = f.create_vlarray(datagrp, datadsname + '_metadata',
+                                        atom=tb.Int8Atom(), filters=filters,
+                                        chunkshape=(chunksize,))
+            for m in matsmetadata:
+                metadata.append(m)
 
 class MaterialLibrary(_MaterialLibrary, collections.MutableMapping):
     """The material library is a collection of unique keys mapped to
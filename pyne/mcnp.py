@@ -12,12 +12,15 @@ available to use.
 
 """
 from __future__ import print_function, division
+import re
 import sys
 import struct
 import math
 import os
 import linecache
 import datetime
+import io
+import mmap
 from warnings import warn
 
 import numpy as np
@@ -28,6 +31,7 @@ from pyne.material import Material
 from pyne.material import MultiMaterial
 from pyne import nucname
 from pyne.binaryreader import _BinaryReader, _FortranRecord
+from pyne._utils import fromstring_token
 
 warn(__name__ + " is not yet QA compliant.", QAWarning)
 
@@ -43,6 +47,9 @@ except ImportError:
 
 from pyne.mesh import Mesh, StatMesh, IMeshTag
 
+# characters that may not appear in the numbers of a meshtal results table
+_meshtal_bad_char = re.compile(r"[^0-9eE+\-.\s]")
+
 if sys.version_info[0] > 2:
     def cmp(a, b):
         return (a > b) - (a < b)
@@ -1020,6 +1027,9 @@ class PtracEvent(tables.IsDescription):
     tme = tables.Float32Col()
 
 
+_ptrac_event_dtype = tables.description.dtype_from_descr(PtracEvent)
+
+
 class PtracReader(object):
     """Class to read _binary_ PTRAC files generated by MCNP.
     """
@@ -1269,30 +1279,230 @@ class PtracReader(object):
                     evt_line[i]
         ptrac_event["event_type"] = event_type
 
-    def write_to_hdf5_table(self, hdf5_table, print_progress=0):
+    def _scan_histories(self, buf, history_ends=None):
+        """Walk the records in buf and locate the event records of all
+        complete histories. Returns the position just after the last complete
+        history, the number of complete histories, the payload offsets of
+        their event records and the event type of each of these records.
+        Only the record lengths and the leading next-event entry of each
+        record are unpacked. Raises ValueError if the leading and trailing
+        length of a record differ. If history_ends is a list, the position
+        just after each complete history is appended to it.
+        """
+        n = len(buf)
+        unpack_len = struct.Struct(self.endianness + 'i').unpack_from
+        if self.eightbytes:
+            unpack_int = struct.Struct(self.endianness + 'q').unpack_from
+            unpack_float = struct.Struct(self.endianness + 'd').unpack_from
+            int_size = 8
+        else:
+            unpack_int = struct.Struct(self.endianness + 'i').unpack_from
+            unpack_float = struct.Struct(self.endianness + 'f').unpack_from
+            int_size = 4
+
+        def check_record(pos, length):
+            if unpack_len(buf, pos + 4 + length)[0] != length:
+                raise ValueError("corrupt Ptrac record at byte {0} of the "
+                                 "block: leading and trailing record lengths "
+                                 "differ".format(pos))
+
+        offsets = []
+        types = []
+        pos = 0
+        end = 0
+        num_histories = 0
+        num_events = 0
+        while pos + 4 <= n:
+            # NPS record, its second entry is the type of the first event
+            length = unpack_len(buf, pos)[0]
+            if pos + length + 8 > n:
+                break
+            check_record(pos, length)
+            next_event = unpack_int(buf, pos + 4 + int_size)[0]
+            pos += length + 8
+
+            complete = False
+            while True:
+                if next_event == 9000:
+                    complete = True
+                    break
+                if pos + 4 > n:
+                    break
+                length = unpack_len(buf, pos)[0]
+                if pos + length + 8 > n:
+                    break
+                check_record(pos, length)
+                offsets.append(pos + 4)
+                types.append(next_event)
+                next_event = int(unpack_float(buf, pos + 4)[0])
+                pos += length + 8
+
+            if not complete:
+                break
+            end = pos
+            num_histories += 1
+            if history_ends is not None:
+                history_ends.append(end)
+            num_events = len(offsets)
+
+        return end, num_histories, offsets[:num_events], types[:num_events]
+
+    def read_histories(self, block_size=2**26, stop=None):
+        """Read as many complete histories as fit into block_size bytes,
+        starting at the current file position, and decode all of their
+        events at once.
+
+        Parameters
+        ----------
+        block_size : int, optional
+            Number of bytes to read at a time. The block is enlarged if a
+            single history does not fit into it.
+        stop : int, optional
+            File position at which to stop reading. This must be a history
+            boundary, as returned by history_boundaries().
+
+        Returns
+        -------
+        events : structured ndarray or None
+            One row per event with the dtype of the PtracEvent table. Columns
+            that are not present in the file's records are zero. None is
+            returned once the end of the file (or stop) has been reached.
+        """
+        start = self.f.tell()
+        limit = block_size if stop is None else min(block_size, stop - start)
+        if limit <= 0:
+            return None
+
+        buf = self.f.read(limit)
+        end, num_histories, offsets, types = self._scan_histories(buf)
+        while num_histories == 0 and len(buf) == limit:
+            # a single history larger than the block, read some more
+            limit = 2 * limit if stop is None else min(2 * limit, stop - start)
+            if limit == len(buf):
+                break
+            buf += self.f.read(limit - len(buf))
+            end, num_histories, offsets, types = self._scan_histories(buf)
+        self.f.seek(start + end)
+        if num_histories == 0:
+            return None
+
+        events = np.zeros(len(offsets), dtype=_ptrac_event_dtype)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        types = np.asarray(types, dtype=np.int32)
+        events["event_type"] = types
+
+        raw = np.frombuffer(buf, dtype=np.uint8)
+        itemsize = 8 if self.eightbytes else 4
+        float_dtype = np.dtype(self.endianness + ('f8' if self.eightbytes
+                                                  else 'f4'))
+        categories = {"src": types == 1000, "sur": types == 3000,
+                      "col": types == 4000, "ter": types == 5000}
+        categories["bnk"] = ~(categories["src"] | categories["sur"] |
+                              categories["col"] | categories["ter"])
+
+        byte_range = np.arange(itemsize)
+        for e, mask in categories.items():
+            if not mask.any():
+                continue
+            e_offsets = offsets[mask]
+            for i in range(1, len(self.variable_ids[e])):
+                var_id = self.variable_ids[e][i]
+                if var_id not in self.variable_mappings:
+                    continue
+                # gather the bytes of this column from every record
+                idx = (e_offsets + i * itemsize)[:, np.newaxis] + byte_range
+                events[self.variable_mappings[var_id]][mask] = \
+                    raw[idx].view(float_dtype)[:, 0]
+        return events
+
+    def history_boundaries(self, num_shards, block_size=2**26):
+        """Split the file into num_shards parts at history boundaries so
+        that they can be converted independently.
+
+        Parameters
+        ----------
+        num_shards : int
+            The desired number of parts. Fewer are returned if the file does
+            not contain enough histories.
+        block_size : int, optional
+            Number of bytes to scan at a time.
+
+        Returns
+        -------
+        boundaries : list of ints
+            File positions, starting with the first history and ending with
+            the end of the last one, such that consecutive pairs delimit the
+            parts. The file position of the reader is left unchanged.
+        """
+        data_start = self.f.tell()
+        self.f.seek(0, os.SEEK_END)
+        size = self.f.tell()
+        self.f.seek(data_start)
+
+        targets = [data_start + (size - data_start) * i // num_shards
+                   for i in range(1, num_shards)]
+        boundaries = [data_start]
+        pos = data_start
+        while True:
+            limit = block_size
+            buf = self.f.read(limit)
+            ends = []
+            end, num_histories, _, _ = self._scan_histories(buf, ends)
+            while num_histories == 0 and len(buf) == limit:
+                limit *= 2
+                buf += self.f.read(limit - len(buf))
+                ends = []
+                end, num_histories, _, _ = self._scan_histories(buf, ends)
+            if num_histories == 0:
+                break
+            # split after the first history ending at or past each target
+            for history_end in ends:
+                history_end += pos
+                while len(targets) > 0 and history_end >= targets[0]:
+                    targets.pop(0)
+                    if history_end > boundaries[-1]:
+                        boundaries.append(history_end)
+            pos += end
+            self.f.seek(pos)
+        if pos > boundaries[-1]:
+            boundaries.append(pos)
+        self.f.seek(data_start)
+        return boundaries
+
+    def write_to_hdf5_table(self, hdf5_table, print_progress=0,
+                            block_size=2**26, stop=None, resume=False):
         """Writes the events contained in this Ptrac file to a given HDF5
         table. The table must already exist and have rows that match the
         PtracEvent definition.
         If desired, the number of processed events can be printed to the
         console each N events by passing the print_progress=N parameter.
+
+        Events are decoded and appended in blocks of whole histories (see
+        read_histories()). After each block, the file position reached and
+        the number of rows written are stored in the table attributes
+        ptrac_position and ptrac_nrows. With resume=True, a table carrying
+        these attributes is truncated to ptrac_nrows and reading continues
+        from ptrac_position. Reading ends at the file position stop, if
+        given.
         """
+        if resume and "ptrac_position" in hdf5_table.attrs:
+            hdf5_table.truncate(hdf5_table.attrs.ptrac_nrows)
+            self.f.seek(hdf5_table.attrs.ptrac_position)
 
-        ptrac_event = hdf5_table.row
         counter = 0
-
         while True:
-            try:
-                self.read_nps_line()
-            except EOFError:
-                break  # no more entries
-
-            while self.next_event != 9000:
-                self.read_event_line(ptrac_event)
-                ptrac_event.append()
+            events = self.read_histories(block_size, stop)
+            if events is None:
+                break
+            hdf5_table.append(events)
+            hdf5_table.flush()
+            hdf5_table.attrs.ptrac_position = self.f.tell()
+            hdf5_table.attrs.ptrac_nrows = hdf5_table.nrows
 
-                counter += 1
-                if print_progress > 0 and counter % print_progress == 0:
-                    print("processing event {0}".format(counter))
+            if print_progress > 0 and (counter + len(events)) // \
+                    print_progress > counter // print_progress:
+                print("processing event {0}".format(counter + len(events)))
+            counter += len(events)
 
 def _is_cell_line(line):
     is_cell = False
@@ -1939,7 +2149,8 @@ class Meshtal(object):
 
     """
 
-    def __init__(self, filename, tags=None, meshes_have_mats=False):
+    def __init__(self, filename, tags=None, meshes_have_mats=False,
+                 tally_numbers=None):
         """Parameters
         ----------
         filename : str
@@ -1953,6 +2164,10 @@ class Meshtal(object):
         meshes_have_mats : bool
              If false, Meshtally objects will be created without PyNE material
              material objects.
+        tally_numbers : iterable of ints, optional
+            The tally numbers to read. If given, the file is memory-mapped
+            and only these tallies are parsed; all other tallies are skipped
+            without being read into Python. If None, all tallies are read.
         """
 
         if not HAVE_PYTAPS:
@@ -1963,9 +2178,12 @@ class Meshtal(object):
         self.tags = tags
         self._meshes_have_mats = meshes_have_mats
 
-        with open(filename, 'r') as f:
-            self._read_meshtal_head(f)
-            self._read_tallies(f)
+        if tally_numbers is None:
+            with open(filename, 'r') as f:
+                self._read_meshtal_head(f)
+                self._read_tallies(f)
+        else:
+            self._read_tallies_mmap(filename, set(tally_numbers))
 
     def _read_meshtal_head(self, f):
         """Get the version, ld, title card and number of histories.
@@ -1993,16 +2211,54 @@ class Meshtal(object):
         while line != "":
             if line.split()[0:3] == ['Mesh', 'Tally', 'Number']:
                 tally_num = int(line.split()[3])
-                if self.tags is not None and tally_num in self.tags.keys():
-                    self.tally[tally_num] = MeshTally(f, tally_num,
-                                                      self.tags[tally_num],
-                                          mesh_has_mats=self._meshes_have_mats)
-                else:
-                    self.tally[tally_num] = MeshTally(f, tally_num,
-                                          mesh_has_mats=self._meshes_have_mats)
+                self._add_tally(f, tally_num)
 
             line = f.readline()
 
+    def _read_tallies_mmap(self, filename, tally_numbers):
+        """Memory-map the meshtal file, locate the start of every mesh tally
+        and read in only those whose numbers are in tally_numbers.
+        """
+        marker = b'Mesh Tally Number'
+        with open(filename, 'rb') as fb:
+            if os.fstat(fb.fileno()).st_size == 0:
+                # empty files cannot be mapped and hold no tallies
+                return
+            mm = mmap.mmap(fb.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                starts = []
+                pos = mm.find(marker)
+                while pos != -1:
+                    starts.append(pos)
+                    pos = mm.find(marker, pos + len(marker))
+                ends = starts[1:] + [len(mm)]
+
+                head_end = starts[0] if len(starts) > 0 else len(mm)
+                self._read_meshtal_head(io.StringIO(mm[:head_end].decode()))
+
+                for start, end in zip(starts, ends):
+                    eol = mm.find(b'\n', start, end)
+                    eol = end if eol == -1 else eol + 1
+                    tally_num = int(mm[start:eol].split()[3])
+                    if tally_num not in tally_numbers:
+                        continue
+                    self._add_tally(io.StringIO(mm[eol:end].decode()),
+                                    tally_num)
+            finally:
+                mm.close()
+
+    def _add_tally(self, f, tally_num):
+        """Create the MeshTally for tally_num from a filestream open to the
+        line after the "Mesh Tally Number" line.
+        """
+        if self.tags is not None and tally_num in self.tags.keys():
+            self.tally[tally_num] = MeshTally(f, tally_num,
+                                              self.tags[tally_num],
+                                  mesh_has_mats=self._meshes_have_mats)
+        else:
+            self.tally[tally_num] = MeshTally(f, tally_num,
+                                  mesh_has_mats=self._meshes_have_mats)
+
 
 class MeshTally(StatMesh):
     """This class stores all information from all single MCNP mesh tally that
@@ -2139,19 +2395,10 @@ class MeshTally(StatMesh):
         num_e_groups = len(self.e_bounds)-1
 
         # get result and relative error data from file
-        result = np.empty(shape=(num_e_groups, num_vol_elements))
-        rel_error = np.empty(shape=(num_e_groups, num_vol_elements))
-        for i in range(0, num_e_groups):
-            result_row = []
-            rel_error_row = []
-            for j in range(0, num_vol_elements):
-                line = f.readline().split()
-                result_row.append(float(line[self._column_idx["Result"]]))
-                rel_error_row.append(
-                    float(line[self._column_idx["Rel_Error"]]))
-
-            result[i] = result_row
-            rel_error[i] = rel_error_row
+        result, rel_error = self._read_columns(f, num_e_groups
+                                                  * num_vol_elements)
+        result = result.reshape(num_e_groups, num_vol_elements)
+        rel_error = rel_error.reshape(num_e_groups, num_vol_elements)
 
         # Tag results and error vector to mesh
         res_tag = IMeshTag(num_e_groups, float, mesh=self,
@@ -2168,20 +2415,55 @@ class MeshTally(StatMesh):
         # If "total" data exists (i.e. if there is more than
         # 1 energy group) get it and tag it onto the mesh.
         if num_e_groups > 1:
-            result = []
-            rel_error = []
-            for i in range(0, num_vol_elements):
-                line = f.readline().split()
-                result.append(float(line[self._column_idx["Result"]]))
-                rel_error.append(
-                    float(line[self._column_idx["Rel_Error"]]))
-
+            result, rel_error = self._read_columns(f, num_vol_elements)
             res_tot_tag = IMeshTag(1, float, mesh=self, name=self.tag_names[2])
             rel_err_tot_tag = IMeshTag(1, float, mesh=self,
                                        name=self.tag_names[3])
             res_tot_tag[:] = result
             rel_err_tot_tag[:] = rel_error
 
+    def _read_columns(self, f, num_lines):
+        """Read num_lines rows of the results table as a single block and
+        return the result and relative error columns as float arrays.
+        Non-numeric entries (the "Total" energy label) convert to zero. They
+        are never part of the returned columns, which raise a ValueError if
+        they hold malformed numbers.
+        """
+        num_cols = len(self._column_idx)
+        block = "".join([f.readline() for i in range(num_lines)])
+        data = fromstring_token(block, sep=" \t\r\n", inplace=True,
+                                maxsize=num_lines*num_cols + 1)
+        if data.size != num_lines*num_cols:
+            raise ValueError("Mesh tally {0}: expected {1} values in the "
+                             "results table, found {2}.".format(
+                                 self.tally_number, num_lines*num_cols,
+                                 data.size))
+        data = data.reshape(num_lines, num_cols)
+        cols = [self._column_idx["Result"], self._column_idx["Rel_Error"]]
+        # malformed tokens are silently converted to their numeric prefix, or
+        # to zero, so check for stray characters, and check the text of zeros
+        numbers = block.replace("Total", "")
+        if _meshtal_bad_char.search(numbers) is not None:
+            bad_tokens = [t for t in numbers.split()
+                          if _meshtal_bad_char.search(t) is not None]
+        else:
+            bad_tokens = []
+            rows = np.nonzero((data[:, cols] == 0.0).any(axis=1))[0]
+            if len(rows) > 0:
+                tokens = block.split()
+                for row in rows:
+                    for col in cols:
+                        token = tokens[row*num_cols + col]
+                        try:
+                            float(token)
+                        except ValueError:
+                            bad_tokens.append(token)
+        if len(bad_tokens) > 0:
+            raise ValueError("Mesh tally {0}: malformed value {1!r} in the "
+                             "results table.".format(self.tally_number,
+                                                     bad_tokens[0]))
+        return data[:, cols[0]], data[:, cols[1]]
+
 
 def mesh_to_geom(mesh, frac_type='mass', title_card="Generated from PyNE Mesh"):
     """This function reads a structured Mesh object and returns the geometry
@@ -42,6 +42,31 @@ err__ops = {"+": lambda val_1, val_2, val_1_err, val_2_err:
 _INTEGRAL_TYPES = (int, np.integer, np.bool_)
 _SEQUENCE_TYPES = (Sequence, np.ndarray)
 
+# material properties which are plain floats and may be gathered into arrays
+_SCALAR_MAT_PROPS = frozenset(['density', 'mass', 'atoms_per_molecule'])
+
+# vertex indices of the five tetrahedra that a hexahedron is split into when
+# computing its volume, adapted from MOAB's measure.cpp
+_HEX_TETS = np.array([[0, 1, 3, 4], [7, 3, 6, 4], [4, 5, 1, 6],
+                      [1, 6, 3, 4], [2, 6, 3, 1]])
+
+
+def _key_to_idx(key, size):
+    """Converts a slice, boolean mask, or fancy index into an integer array of
+    volume element indices for a mesh with size volume elements.
+    """
+    if isinstance(key, slice):
+        return np.arange(*key.indices(size))
+    elif isinstance(key, np.ndarray) and key.dtype == np.bool:
+        if len(key) != size:
+            raise KeyError("boolean mask must match the length of the mesh.")
+        return np.flatnonzero(key)
+    elif isinstance(key, Iterable):
+        return np.fromiter(key, dtype=int)
+    else:
+        raise TypeError("{0} is not an int, slice, mask, "
+                        "or fancy index.".format(key))
+
 
 class Tag(object):
     """A mesh tag, which acts as a descriptor on the mesh.  This dispatches
@@ -103,7 +128,8 @@ class MaterialPropertyTag(Tag):
         mesh.name[i] == mesh.mats[i].name
 
     It also adds slicing, fancy indexing, boolean masking, and broadcasting
-    features to this process.
+    features to this process.  Scalar float properties (density, mass, and
+    atoms_per_molecule) are gathered directly into a contiguous float array.
     """
 
     def __getitem__(self, key):
@@ -111,22 +137,13 @@ class MaterialPropertyTag(Tag):
         mats = self.mesh.mats
         if mats is None:
             RuntimeError("Mesh.mats is None, please add a MaterialLibrary.")
-        size = len(self.mesh)
         if isinstance(key, _INTEGRAL_TYPES):
             return getattr(mats[key], name)
-        elif isinstance(key, slice):
-            return np.array([getattr(mats[i], name)
-                            for i in range(*key.indices(size))])
-        elif isinstance(key, np.ndarray) and key.dtype == np.bool:
-            if len(key) != size:
-                raise KeyError("boolean mask must match the length of the mesh.")
-            return np.array([getattr(mats[i], name) for i, b in enumerate(key)
-                            if b])
-        elif isinstance(key, Iterable):
-            return np.array([getattr(mats[i], name) for i in key])
-        else:
-            raise TypeError("{0} is not an int, slice, mask, "
-                            "or fancy index.".format(key))
+        idx = _key_to_idx(key, len(self.mesh))
+        if name in _SCALAR_MAT_PROPS:
+            return np.fromiter((getattr(mats[i], name) for i in idx),
+                               dtype=float, count=len(idx))
+        return np.array([getattr(mats[i], name) for i in idx])
 
     def __setitem__(self, key, value):
         name = self.name
@@ -188,23 +205,10 @@ class MaterialMethodTag(Tag):
         mats = self.mesh.mats
         if mats is None:
             RuntimeError("Mesh.mats is None, please add a MaterialLibrary.")
-        size = len(self.mesh)
         if isinstance(key, _INTEGRAL_TYPES):
             return getattr(mats[key], name)()
-        elif isinstance(key, slice):
-            return np.array([getattr(mats[i], name)() for i in
-                             range(*key.indices(size))])
-        elif isinstance(key, np.ndarray) and key.dtype == np.bool:
-            if len(key) != size:
-                raise KeyError("boolean mask must match the "
-                               "length of the mesh.")
-            return np.array([getattr(mats[i], name)() for i, b in
-                             enumerate(key) if b])
-        elif isinstance(key, Iterable):
-            return np.array([getattr(mats[i], name)() for i in key])
-        else:
-            raise TypeError("{0} is not an int, slice, mask, "
-                            "or fancy index.".format(key))
+        idx = _key_to_idx(key, len(self.mesh))
+        return np.array([getattr(mats[i], name)() for i in idx])
 
     def __setitem__(self, key, value):
         msg = "the material method tag {0!r} may not be set".format(self.name)
@@ -368,101 +372,65 @@ class IMeshTag(Tag):
         self.mesh.mesh.destroyTag(self.name, force=True)
 
     def __getitem__(self, key):
-        m = self.mesh.mesh
         size = len(self.mesh)
         mtag = self.tag
-        miter = self.mesh.iter_ve()
+        ves = self.mesh._ves
         if isinstance(key, _INTEGRAL_TYPES):
             if key >= size:
                 raise IndexError("key index {0} greater than the size of the "
                                  "mesh {1}".format(key, size))
-            for i_ve in zip(range(key+1), miter):
-                pass
-            return mtag[i_ve[1]]
+            return mtag[ves[key]]
         elif isinstance(key, slice):
-            return mtag[list(miter)[key]]
-        elif isinstance(key, np.ndarray) and key.dtype == np.bool:
-            if len(key) != size:
-                raise KeyError("boolean mask must match the length "
-                               "of the mesh.")
-            return mtag[[ve for b, ve in zip(key, miter) if b]]
-        elif isinstance(key, Iterable):
-            ves = list(miter)
-            return mtag[[ves[i] for i in key]]
-        else:
-            raise TypeError("{0} is not an int, slice, mask, "
-                            "or fancy index.".format(key))
+            return mtag[ves[key]]
+        return mtag[[ves[i] for i in _key_to_idx(key, size)]]
 
     def __setitem__(self, key, value):
         # get value into canonical form
         tsize = self.size
         value = np.asarray(value, self.tag.type)
         value = np.atleast_1d(value) if tsize == 1 else np.atleast_2d(value)
-        # set up mesh to be iterated over
-        m = self.mesh.mesh
+        # look up the volume elements to set
         msize = len(self.mesh)
         mtag = self.tag
-        miter = self.mesh.iter_ve()
+        ves = self.mesh._ves
         if isinstance(key, _INTEGRAL_TYPES):
             if key >= msize:
                 raise IndexError("key index {0} greater than the size of the "
                                  "mesh {1}".format(key, msize))
-            for i_ve in zip(range(key+1), miter):
-                pass
-            mtag[i_ve[1]] = value if tsize == 1 else value[0]
-        elif isinstance(key, slice):
-            key = list(miter)[key]
-            v = np.empty((len(key), tsize), self.tag.type)
-            if tsize == 1 and len(value.shape) == 1:
-                v.shape = (len(key), )
-            v[...] = value
-            mtag[key] = v
-        elif isinstance(key, np.ndarray) and key.dtype == np.bool:
-            if len(key) != msize:
-                raise KeyError("boolean mask must match the length "
-                               "of the mesh.")
-            key = [ve for b, ve in zip(key, miter) if b]
+            mtag[ves[key]] = value if tsize == 1 else value[0]
+        elif isinstance(key, slice) or (isinstance(key, np.ndarray) and
+                                        key.dtype == np.bool):
+            key = ves[key] if isinstance(key, slice) else \
+                  [ves[i] for i in _key_to_idx(key, msize)]
             v = np.empty((len(key), tsize), self.tag.type)
             if tsize == 1 and len(value.shape) == 1:
                 v.shape = (len(key), )
             v[...] = value
             mtag[key] = v
         elif isinstance(key, Iterable):
-            ves = list(miter)
+            key = [ves[i] for i in _key_to_idx(key, msize)]
             if tsize != 1 and len(value) != len(key):
                 v = np.empty((len(key), tsize), self.tag.type)
                 v[...] = value
                 value = v
-            mtag[[ves[i] for i in key]] = value
+            mtag[key] = value
         else:
             raise TypeError("{0} is not an int, slice, mask, "
                             "or fancy index.".format(key))
 
     def __delitem__(self, key):
-        m = self.mesh.mesh
         size = len(self.mesh)
         mtag = self.tag
-        miter = self.mesh.iter_ve()
+        ves = self.mesh._ves
         if isinstance(key, _INTEGRAL_TYPES):
             if key >= size:
                 raise IndexError("key index {0} greater than the size of the "
                                  "mesh {1}".format(key, size))
-            for i_ve in zip(range(key+1), miter):
-                pass
-            del mtag[i_ve[1]]
+            del mtag[ves[key]]
         elif isinstance(key, slice):
-            del mtag[list(miter)[key]]
-        elif isinstance(key, np.ndarray) and key.dtype == np.bool:
-            if len(key) != size:
-                raise KeyError("boolean mask must match the "
-                               "length of the mesh.")
-            del mtag[[ve for b, ve in zip(key, miter) if b]]
-        elif isinstance(key, Iterable):
-            ves = list(miter)
-            del mtag[[ves[i] for i in key]]
+            del mtag[ves[key]]
         else:
-            raise TypeError("{0} is not an int, slice, mask, "
-                            "or fancy index.".format(key))
+            del mtag[[ves[i] for i in _key_to_idx(key, size)]]
 
     def expand(self):
         """This function creates a group of scalar tags from a vector tag. For
@@ -478,7 +446,7 @@ class IMeshTag(Tag):
             data = [x[j] for x in self[:]]
             tag = self.mesh.mesh.createTag("{0}_{1:03d}".format(self.name, j),
                                            1, self.dtype)
-            tag[list(self.mesh.iter_ve())] = data
+            tag[self.mesh._ves] = data
 
 
 class ComputedTag(Tag):
@@ -723,8 +691,11 @@ class Mesh(object):
 
         self.mats = mats
 
-        # tag with volume id and ensure mats exist.
+        # tag with volume id and ensure mats exist. The volume element handles
+        # are cached in iteration order so that tags may be indexed directly.
         ves = list(self.iter_ve())
+        self._ves = ves
+        self._geom_cache = None
         tags = self.mesh.getAllTags(ves[0])
         tags = set(tag.name for tag in tags)
         if 'idx' in tags:
@@ -787,10 +758,10 @@ class Mesh(object):
         """
         mats = self.mats
         if mats is None:
-            for i, ve in enumerate(self.iter_ve()):
+            for i, ve in enumerate(self._ves):
                 yield i, None, ve
         else:
-            for i, ve in enumerate(self.iter_ve()):
+            for i, ve in enumerate(self._ves):
                 yield i, mats[i], ve
 
     def iter_ve(self):
@@ -917,15 +888,11 @@ class Mesh(object):
         else:
             mesh_1 = copy.copy(self)
 
+        ves_1, ves_2 = _paired_ves(mesh_1, other)
         for tag in tags:
-            for ve_1, ve_2 in \
-                zip(zip(iter(mesh_1.mesh.iterate(iBase.Type.region,
-                    iMesh.Topology.all))),
-                    zip(iter(other.mesh.iterate(iBase.Type.region,
-                        iMesh.Topology.all)))):
-                self.mesh.getTagHandle(tag)[ve_1] = \
-                    _ops[op](mesh_1.mesh.getTagHandle(tag)[ve_1],
-                             other.mesh.getTagHandle(tag)[ve_2])
+            tag_1 = mesh_1.mesh.getTagHandle(tag)
+            tag_1[ves_1] = _ops[op](tag_1[ves_1],
+                                    other.mesh.getTagHandle(tag)[ves_2])
 
         return mesh_1
 
@@ -974,12 +941,55 @@ class Mesh(object):
         if len(coord) == 4:
             return abs(np.linalg.det(coord[:-1] - coord[1:])) / 6.0
         elif len(coord) == 8:
-            b = coord[np.array([[0, 1, 3, 4], [7, 3, 6, 4], [4, 5, 1, 6],
-                                [1, 6, 3, 4], [2, 6, 3, 1]])]
+            b = coord[_HEX_TETS]
             return np.sum(np.abs(np.linalg.det(b[:, :-1] - b[:, 1:]))) / 6.0
         else:
             return None
 
+    def elem_volumes(self, ves=None):
+        """Get the volumes of many hexahedral or tetrahedral volume elements
+        at once, using the same approach as elem_volume.
+
+        Parameters
+        ----------
+        ves : sequence of iMesh entity handles, optional
+            The volume elements, defaults to all volume elements of the mesh
+            in iteration order. The volumes of all volume elements are cached
+            until the geometry of the mesh changes, see
+            clear_geometry_cache().
+
+        Returns
+        -------
+        vols : ndarray of floats
+            Element volumes. Elements that are not hexes or tets are NaN. The
+            cached array is returned read-only when ves is not given.
+        """
+        if ves is None:
+            return self._geometry()[0]
+        return self._elem_volumes(ves)
+
+    def _elem_volumes(self, ves):
+        vols = np.empty(len(ves), dtype=float)
+        vols.fill(np.nan)
+        if len(ves) == 0:
+            return vols
+        adj = self.mesh.getEntAdj(ves, iBase.Type.vertex)
+        offsets = np.asarray(adj.offsets)
+        coords = self.mesh.getVtxCoords(adj.data)
+        counts = np.diff(offsets)
+        for n in (4, 8):
+            mask = (counts == n)
+            if not mask.any():
+                continue
+            c = coords[offsets[:-1][mask][:, np.newaxis] + np.arange(n)]
+            if n == 4:
+                vols[mask] = np.abs(np.linalg.det(c[:, :-1] - c[:, 1:])) / 6.0
+            else:
+                b = c[:, _HEX_TETS]
+                vols[mask] = np.sum(np.abs(np.linalg.det(
+                                    b[:, :, :-1] - b[:, :, 1:])), axis=1) / 6.0
+        return vols
+
     def ve_center(self, ve):
         """Finds the point at the center of any tetrahedral or hexahedral mesh
         volume element.
@@ -999,6 +1009,65 @@ class Mesh(object):
         center = tuple([np.mean(coords[:, x]) for x in range(3)])
         return center
 
+    def ve_centers(self, ves=None):
+        """Finds the points at the centers of many tetrahedral or hexahedral
+        mesh volume elements at once.
+
+        Parameters
+        ----------
+        ves : sequence of iMesh entity handles, optional
+            The volume elements, defaults to all volume elements of the mesh
+            in iteration order. The centers of all volume elements are cached
+            until the geometry of the mesh changes, see
+            clear_geometry_cache().
+
+        Returns
+        -------
+        centers : ndarray of floats, shape (N, 3)
+           The (x, y, z) coordinates of the centers of the volume elements.
+           The cached array is returned read-only when ves is not given.
+        """
+        if ves is None:
+            return self._geometry()[1]
+        return self._ve_centers(ves)
+
+    def _ve_centers(self, ves):
+        if len(ves) == 0:
+            return np.empty((0, 3), dtype=float)
+        adj = self.mesh.getEntAdj(ves, iBase.Type.vertex)
+        offsets = np.asarray(adj.offsets)
+        coords = self.mesh.getVtxCoords(adj.data)
+        return np.add.reduceat(coords, offsets[:-1], axis=0) / \
+               np.diff(offsets)[:, np.newaxis]
+
+    def clear_geometry_cache(self):
+        """Discards the cached volumes and centers of the volume elements.
+        The cache is rebuilt automatically when elements or vertices are
+        added or removed, this only needs to be called after vertices have
+        been moved in place, e.g. with setVtxCoords().
+        """
+        self._geom_cache = None
+
+    def _geometry(self):
+        """Returns the cached (volumes, centers) arrays of all volume elements
+        in iteration order, computing them in one pass if the number of
+        elements or vertices changed since they were last computed.
+        Structured mesh geometry follows directly from the divisions.
+        """
+        key = (self.mesh.rootSet.getNumOfType(iBase.Type.region),
+               self.mesh.rootSet.getNumOfType(iBase.Type.vertex))
+        if self._geom_cache is not None and self._geom_cache[0] == key:
+            return self._geom_cache[1]
+        if self.structured:
+            vols, centers = self._structured_geometry()
+        else:
+            vols = self._elem_volumes(self._ves)
+            centers = self._ve_centers(self._ves)
+        vols.flags.writeable = False
+        centers.flags.writeable = False
+        self._geom_cache = (key, (vols, centers))
+        return vols, centers
+
     # Structured methods:
     def structured_get_vertex(self, i, j, k):
         """Return the handle for (i,j,k)'th vertex in the mesh"""
@@ -1153,6 +1222,24 @@ class Mesh(object):
         else:
             raise MeshError("Invalid dimension: {0}".format(str(dim)))
 
+    def _structured_geometry(self):
+        """Returns the volumes and centers of all hexes of a structured mesh
+        in iteration order, computed from the divisions along each axis.
+        """
+        order = self.structured_ordering
+        divs = [np.asarray(self.structured_get_divisions(d), dtype=float)
+                for d in "xyz"]
+        widths = [np.diff(divs["xyz".find(d)]) for d in order]
+        mids = [0.5 * (divs["xyz".find(d)][1:] + divs["xyz".find(d)][:-1])
+                for d in order]
+        vols = np.multiply.outer(np.multiply.outer(widths[0], widths[1]),
+                                 widths[2]).ravel()
+        grid = np.meshgrid(*mids, indexing='ij')
+        centers = np.empty((vols.size, 3), dtype=float)
+        for i, d in enumerate(order):
+            centers[:, "xyz".find(d)] = grid[i].ravel()
+        return vols, centers
+
     def _structured_check(self):
         if not self.structured:
             raise MeshError("Structured mesh methods cannot be called from "\
@@ -1191,13 +1278,19 @@ class Mesh(object):
             material each cell is made of.
 
         """
+        cell_fracs, bounds = _cell_fracs_bounds(cell_fracs, len(self))
+        # voxels on a lattice tend to share the same mixtures, so each distinct
+        # set of (cell, vol_frac) rows is only mixed once.
+        mixtures = {}
         for i in range(len(self)):
-            mat_col = {}  # Collection of materials in the ith ve.
-            for row in cell_fracs[cell_fracs['idx'] == i]:
-                mat_col[cell_mats[row['cell']]] = row['vol_frac']
-
-            mixed = MultiMaterial(mat_col)
-            self.mats[i] = mixed.mix_by_volume()
+            rows = cell_fracs[bounds[i]:bounds[i+1]]
+            key = tuple(zip(rows['cell'].tolist(), rows['vol_frac'].tolist()))
+            if key not in mixtures:
+                mat_col = {}  # Collection of materials in the ith ve.
+                for cell, vol_frac in key:
+                    mat_col[cell_mats[cell]] = vol_frac
+                mixtures[key] = MultiMaterial(mat_col).mix_by_volume()
+            self.mats[i] = copy.deepcopy(mixtures[key])
 
     def tag_cell_fracs(self, cell_fracs):
         """This function uses the output from dagmc.discretize_geom() and
@@ -1224,15 +1317,13 @@ class Mesh(object):
         """
 
         num_vol_elements = len(self)
+        cell_fracs, bounds = _cell_fracs_bounds(cell_fracs, num_vol_elements)
+        cell_fracs = cell_fracs[bounds[0]:bounds[-1]]
+        counts = np.diff(bounds)
         # Find the maximum cell number in a voxel
-        max_num_cells = -1
-        for i in range(num_vol_elements):
-            max_num_cells = max(max_num_cells,
-                                len(cell_fracs[cell_fracs['idx'] == i]))
+        max_num_cells = counts.max() if num_vol_elements > 0 else -1
 
         # create tag frame with default value
-        cell_largest_frac_number = [-1] * num_vol_elements
-        cell_largest_frac = [0.0] * num_vol_elements
         voxel_cell_number = np.empty(shape=(num_vol_elements, max_num_cells),
                                      dtype=int)
         voxel_cell_fracs = np.empty(shape=(num_vol_elements, max_num_cells),
@@ -1240,17 +1331,18 @@ class Mesh(object):
         voxel_cell_number.fill(-1)
         voxel_cell_fracs.fill(0.0)
 
-        # set the data
-        for i in range(num_vol_elements):
-            for (cell, row) in enumerate(cell_fracs[cell_fracs['idx'] == i]):
-                voxel_cell_number[i, cell] = row['cell']
-                voxel_cell_fracs[i, cell] = row['vol_frac']
-            # cell_largest_frac_tag
-            cell_largest_frac[i] = max(voxel_cell_fracs[i, :])
-            largest_index = \
-                    list(voxel_cell_fracs[i, :]).index(cell_largest_frac[i])
-            cell_largest_frac_number[i] = \
-                    int(voxel_cell_number[i, largest_index])
+        # set the data, scattering each row to its position within its voxel
+        rows = np.repeat(np.arange(num_vol_elements), counts)
+        cols = np.arange(len(cell_fracs)) - np.repeat(bounds[:-1] - bounds[0],
+                                                      counts)
+        voxel_cell_number[rows, cols] = cell_fracs['cell']
+        voxel_cell_fracs[rows, cols] = cell_fracs['vol_frac']
+        # cell_largest_frac_tag
+        largest_index = np.argmax(voxel_cell_fracs, axis=1)
+        cell_largest_frac = voxel_cell_fracs[np.arange(num_vol_elements),
+                                             largest_index]
+        cell_largest_frac_number = voxel_cell_number[
+            np.arange(num_vol_elements), largest_index]
 
         # create the tags
         self.tag(name='cell_number', value=voxel_cell_number,
@@ -1270,6 +1362,31 @@ class Mesh(object):
                  size=1, dtype=float)
 
 
+def _cell_fracs_bounds(cell_fracs, num_ves):
+    """Helper method for cell_fracs_to_mats and tag_cell_fracs.
+
+    Returns cell_fracs sorted by idx along with an array of num_ves + 1 row
+    offsets such that the rows of the ith volume element are
+    cell_fracs[bounds[i]:bounds[i+1]]. The documented idx ordering of
+    dagmc.discretize_geom() output is used as is, otherwise a stable sort is
+    performed first.
+    """
+    idx = cell_fracs['idx']
+    if np.any(idx[1:] < idx[:-1]):
+        cell_fracs = cell_fracs[np.argsort(idx, kind='mergesort')]
+        idx = cell_fracs['idx']
+    bounds = np.searchsorted(idx, np.arange(num_ves + 1), side='left')
+    return cell_fracs, bounds
+
+
+def _paired_ves(mesh_1, mesh_2):
+    """Returns the cached volume elements of two meshes, truncated to the
+    same length, for element-wise arithmetic.
+    """
+    n = min(len(mesh_1._ves), len(mesh_2._ves))
+    return mesh_1._ves[:n], mesh_2._ves[:n]
+
+
 ######################################################
 # private helper functions for structured mesh methods
 ######################################################
@@ -1385,21 +1502,90 @@ class StatMesh(Mesh):
         else:
             mesh_1 = copy.copy(self)
 
+        ves_1, ves_2 = _paired_ves(mesh_1, other)
         for tag in tags:
-            for ve_1, ve_2 in \
-                zip(zip(iter(mesh_1.mesh.iterate(iBase.Type.region,
-                                                 iMesh.Topology.all))),
-                    zip(iter(other.mesh.iterate(iBase.Type.region,
-                                                iMesh.Topology.all)))):
-
-                mesh_1.mesh.getTagHandle(tag + error_suffix)[ve_1] = err__ops[op](
-                    mesh_1.mesh.getTagHandle(tag)[ve_1],
-                    other.mesh.getTagHandle(tag)[ve_2],
-                    mesh_1.mesh.getTagHandle(tag + error_suffix)[ve_1],
-                    other.mesh.getTagHandle(tag + error_suffix)[ve_2])
-
-                mesh_1.mesh.getTagHandle(tag)[ve_1] = \
-                    _ops[op](mesh_1.mesh.getTagHandle(tag)[ve_1],
-                             other.mesh.getTagHandle(tag)[ve_2])
+            tag_1 = mesh_1.mesh.getTagHandle(tag)
+            err_1 = mesh_1.mesh.getTagHandle(tag + error_suffix)
+            val_1 = tag_1[ves_1]
+            val_2 = other.mesh.getTagHandle(tag)[ves_2]
+            err_1[ves_1] = err__ops[op](
+                val_1, val_2, err_1[ves_1],
+                other.mesh.getTagHandle(tag + error_suffix)[ves_2])
+            tag_1[ves_1] = _ops[op](val_1, val_2)
 
         return mesh_1
+
+
+def combine_stat_meshes(meshes, tags=None, weights=None):
+    """Combines many StatMeshes, such as the meshtallies of independent Monte
+    Carlo batches, into the first one in a single pass. Each tag and its
+    relative error tag are read from each mesh as whole arrays and
+    accumulated, so meshes given as filenames are loaded one at a time and
+    only the running sums and the first mesh are kept in memory.
+
+    Without weights the result tags hold the sum of the meshes, x = sum(x_i),
+    with the relative error sqrt(sum((x_i*e_i)**2)) / x, which is the same
+    as chaining ``+=``. With weights they hold the weighted mean
+    sum(w_i*x_i) / sum(w_i), with the relative error
+    sqrt(sum((w_i*x_i*e_i)**2)) / sum(w_i*x_i).
+
+    Parameters
+    ----------
+    meshes : iterable of StatMesh objects or filenames
+        The meshes to combine. All must have the same volume elements in the
+        same order. The first mesh is overwritten with the result; if it is
+        a filename, it is loaded and the file itself is left unchanged.
+    tags : sequence of str, optional
+        The tags to combine, each with a corresponding tag + '_rel_error'.
+        Defaults to every such tag on the first mesh.
+    weights : sequence of floats, optional
+        The weight of each mesh, for example the number of histories of each
+        batch.
+
+    Returns
+    -------
+    mesh : StatMesh
+        The first mesh, holding the combined tags.
+    """
+    error_suffix = "_rel_error"
+    meshes = iter(meshes)
+    weights = None if weights is None else iter(weights)
+    out = next(meshes)
+    if isinstance(out, basestring):
+        out = StatMesh(mesh=out)
+    ves_out = out._ves
+    if tags is None:
+        names = set(tag.name for tag in out.mesh.getAllTags(ves_out[0]))
+        tags = sorted(tag for tag in names if tag + error_suffix in names)
+
+    sums = {}
+    sq_sums = {}
+    w = 1.0 if weights is None else next(weights)
+    w_tot = w
+    for tag in tags:
+        val = w * np.asarray(out.mesh.getTagHandle(tag)[ves_out])
+        sums[tag] = val
+        sq_sums[tag] = (val * out.mesh.getTagHandle(tag + error_suffix)[ves_out])**2
+
+    for mesh in meshes:
+        if isinstance(mesh, basestring):
+            mesh = StatMesh(mesh=mesh)
+        ves = mesh._ves
+        if len(ves) != len(ves_out):
+            raise MeshError("meshes must have the same number of volume "
+                            "elements to be combined.")
+        w = 1.0 if weights is None else next(weights)
+        w_tot += w
+        for tag in tags:
+            val = w * np.asarray(mesh.mesh.getTagHandle(tag)[ves])
+            sums[tag] += val
+            sq_sums[tag] += (val * mesh.mesh.getTagHandle(tag + error_suffix)[ves])**2
+        del mesh, ves
+
+    for tag in tags:
+        total = sums[tag]
+        out.mesh.getTagHandle(tag + error_suffix)[ves_out] = \
+            np.sqrt(sq_sums[tag]) / total
+        out.mesh.getTagHandle(tag)[ves_out] = \
+            total if weights is None else total / w_tot
+    return out
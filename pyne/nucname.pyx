@@ -11,6 +11,7 @@ from libcpp.string cimport string as std_string
 
 # Python imports
 #from collections import Iterable
+import numpy as np
 
 # local imports
 cimport pyne.cpp_utils
@@ -925,6 +926,177 @@ def ensdf_to_id(nuc):
         return cpp_nucname.ensdf_to_id(<char *> nuc_bytes)
     else:
         raise NucTypeError(nuc)
+#
+# Array Conversion Functions
+#
+
+# Process-wide interning caches, one per converter, mapping each input
+# nuclide that has been seen to its converted form.
+_intern = {}
+
+
+def _scalar_nuc(nuc):
+    """Converts a bytes or NumPy scalar nuclide to a type the scalar
+    converters accept."""
+    if isinstance(nuc, bytes):
+        return nuc.decode()
+    elif isinstance(nuc, np.integer):
+        return int(nuc)
+    return nuc
+
+
+def _convert_seq(converter, dict cache, nucs):
+    vals = []
+    for nuc in nucs:
+        try:
+            val = cache[nuc]
+        except KeyError:
+            val = cache[nuc] = converter(_scalar_nuc(nuc))
+        except TypeError:
+            raise NucTypeError(nuc)
+        vals.append(val)
+    return vals
+
+
+def convert_array(converter, nucs, dtype=None):
+    """Applies a scalar converter, such as id() or serpent(), to every
+    nuclide of a sequence or array. Each distinct input is converted once per
+    process, later occurrences are looked up in an interning cache.
+
+    Parameters
+    ----------
+    converter : function
+        A converter of this module taking a single nuclide.
+    nucs : sequence or ndarray
+        Input nuclides, which may be ints, strs or bytes. For NumPy int, str
+        or bytes arrays the distinct values are found with np.unique() first.
+    dtype : numpy dtype, optional
+        The data type of the output, inferred from the converted values if
+        not given.
+
+    Returns
+    -------
+    newnucs : ndarray
+        Output nuclides, with the shape of nucs for arrays.
+
+    """
+    cache = _intern.setdefault(converter, {})
+    if isinstance(nucs, np.ndarray) and nucs.dtype.kind in 'SUiu':
+        uniq, inv = np.unique(nucs, return_inverse=True)
+        vals = np.asarray(_convert_seq(converter, cache, uniq.tolist()),
+                          dtype=dtype)
+        return vals[inv].reshape(nucs.shape)
+    return np.asarray(_convert_seq(converter, cache, nucs), dtype=dtype)
+
+
+def id_array(nucs):
+    """Converts many nuclides to their identifier form, see id() and
+    convert_array().
+
+    Parameters
+    ----------
+    nucs : sequence or ndarray of ints, strs, or bytes
+        Input nuclides.
+
+    Returns
+    -------
+    newnucs : ndarray of ints
+        Output nuclide ids.
+
+    """
+    return convert_array(id, nucs, dtype=int)
+
+
+def name_array(nucs):
+    """Converts many nuclides to their name form, see name() and
+    convert_array().
+
+    Parameters
+    ----------
+    nucs : sequence or ndarray of ints, strs, or bytes
+        Input nuclides.
+
+    Returns
+    -------
+    newnucs : ndarray of strs
+        Output nuclides in name form.
+
+    """
+    return convert_array(name, nucs, dtype=str)
+
+
+def znum_array(nucs):
+    """Retrieves the charge numbers of many nuclides, see znum() and
+    convert_array().
+
+    Parameters
+    ----------
+    nucs : sequence or ndarray of ints, strs, or bytes
+        Input nuclides.
+
+    Returns
+    -------
+    z : ndarray of ints
+        The number of protons in each nucleus.
+
+    """
+    return convert_array(znum, nucs, dtype=int)
+
+
+def anum_array(nucs):
+    """Retrieves the nucleon numbers of many nuclides, see anum() and
+    convert_array().
+
+    Parameters
+    ----------
+    nucs : sequence or ndarray of ints, strs, or bytes
+        Input nuclides.
+
+    Returns
+    -------
+    a : ndarray of ints
+        The number of protons and neutrons in each nucleus.
+
+    """
+    return convert_array(anum, nucs, dtype=int)
+
+
+def snum_array(nucs):
+    """Retrieves the excitation numbers of many nuclides, see snum() and
+    convert_array().
+
+    Parameters
+    ----------
+    nucs : sequence or ndarray of ints, strs, or bytes
+        Input nuclides.
+
+    Returns
+    -------
+    s : ndarray of ints
+        The excitation level of each nucleus.
+
+    """
+    return convert_array(snum, nucs, dtype=int)
+
+
+def zzaaam_array(nucs):
+    """Converts many nuclides to their zzaaam form, see zzaaam() and
+    convert_array().
+
+    Parameters
+    ----------
+    nucs : sequence or ndarray of ints, strs, or bytes
+        Input nuclides.
+
+    Returns
+    -------
+    newnucs : ndarray of ints
+        Output nuclides in zzaaam form.
+
+    """
+    return convert_array(zzaaam, nucs, dtype=int)
+
+
 #
 # C++ Helper Functions
 #
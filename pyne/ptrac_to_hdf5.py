@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 """Read a MCNP Ptrac file and save it in HDF5 format."""
+import os
+from multiprocessing import Pool
 from warnings import warn
 from pyne.utils import QAWarning
 
@@ -14,6 +16,87 @@ except ImportError:
 
 warn(__name__ + " is not yet QA compliant.", QAWarning)
 
+def _convert_shard(args):
+    """Convert the histories between the file positions start and stop into
+    the table "ptrac" of its own HDF5 file, resuming a previous conversion
+    of the same shard if there is one.
+    """
+    ptrac_filename, shard_filename, start, stop, block_size = args
+    ptrac = mcnp.PtracReader(ptrac_filename)
+    h5file = tables.open_file(shard_filename, mode="a")
+    if "/ptrac" in h5file:
+        table = h5file.get_node("/ptrac")
+    else:
+        table = h5file.create_table("/", "ptrac", mcnp.PtracEvent)
+    ptrac.f.seek(start)
+    ptrac.write_to_hdf5_table(table, block_size=block_size, stop=stop,
+                              resume=True)
+    h5file.close()
+    return shard_filename
+
+
+def convert_parallel(ptrac_filename, table, jobs, block_size=2**26,
+                     print_progress=False, resume=False):
+    """Split a Ptrac file at history boundaries into one shard per job,
+    convert the shards in worker processes and append them to table in
+    order. Shards are written next to the table's file and are removed once
+    they have been appended. With resume=True, an interrupted conversion into
+    table is continued; this requires the same Ptrac file and number of jobs.
+    Otherwise table must be empty.
+    """
+    ptrac = mcnp.PtracReader(ptrac_filename)
+    bounds = [int(b) for b in
+              ptrac.history_boundaries(jobs, block_size=block_size)]
+    del ptrac
+
+    h5_filename = table._v_file.filename
+    shard_filenames = ["{0}.shard{1}".format(h5_filename, i)
+                       for i in range(len(bounds) - 1)]
+    if resume and "ptrac_shards_done" in table.attrs:
+        if list(table.attrs.ptrac_shard_bounds) != bounds:
+            raise ValueError("cannot resume: the table was written with "
+                             "different shards, rerun with the same Ptrac "
+                             "file and number of jobs")
+    elif table.nrows > 0 or "ptrac_position" in table.attrs:
+        raise ValueError("table {0} is not empty, pass resume=True to "
+                         "continue an interrupted conversion".format(
+                             table._v_pathname))
+    else:
+        # start fresh, discarding shards left over by an earlier run
+        for shard_filename in shard_filenames:
+            if os.path.exists(shard_filename):
+                os.unlink(shard_filename)
+        table.attrs.ptrac_shard_bounds = bounds
+        table.attrs.ptrac_shards_done = 0
+    first = int(table.attrs.ptrac_shards_done)
+    work = [(ptrac_filename, shard_filenames[i], bounds[i], bounds[i+1],
+             block_size)
+            for i in range(first, len(bounds) - 1)]
+
+    pool = Pool(jobs)
+    try:
+        shard_filenames = pool.map(_convert_shard, work)
+    finally:
+        pool.close()
+        pool.join()
+
+    for i, shard_filename in enumerate(shard_filenames, first):
+        shard = tables.open_file(shard_filename, mode="r")
+        shard_table = shard.get_node("/ptrac")
+        # drop rows from a partially appended shard before appending again
+        if "ptrac_nrows" in table.attrs:
+            table.truncate(table.attrs.ptrac_nrows)
+        for j in range(0, shard_table.nrows, 1000000):
+            table.append(shard_table.read(j, j + 1000000))
+        shard.close()
+        table.flush()
+        table.attrs.ptrac_nrows = table.nrows
+        table.attrs.ptrac_shards_done = i + 1
+        os.unlink(shard_filename)
+        if print_progress:
+            print("appended shard {0} of {1}".format(i + 1, len(bounds) - 1))
+
+
 def main():
     argparser = argparse.ArgumentParser(description="write the contents of a MCNP PTRAC file to a HDF5 table")
     argparser.add_argument("ptrac_file", help="MCNP PTRAC file to read from")
@@ -24,6 +107,14 @@ def main():
             help="title of the HDF5 table (default is \"Ptrac data\")")
     argparser.add_argument("-s", "--show-progress", action="store_true",
             help="show progress indicator")
+    argparser.add_argument("-j", "--jobs", type=int, default=1,
+            help="number of worker processes converting parts of the file "
+                 "in parallel (default is 1)")
+    argparser.add_argument("-b", "--block-size", type=int, default=64,
+            help="size in MB of the blocks read and decoded at once "
+                 "(default is 64)")
+    argparser.add_argument("-r", "--resume", action="store_true",
+            help="resume an interrupted conversion into an existing table")
     args = argparser.parse_args()
 
     ptrac_filename = args.ptrac_file
@@ -31,6 +122,7 @@ def main():
     table_name = args.table_name
     table_title = args.table_title
     print_progress = 1000000 if args.show_progress else 0
+    block_size = args.block_size * 2**20
 
     ptrac = mcnp.PtracReader(ptrac_filename)
 
@@ -42,7 +134,15 @@ def main():
     else:
         table = h5file.create_table("/", table_name, mcnp.PtracEvent, table_title)
 
-    ptrac.write_to_hdf5_table(table, print_progress=print_progress)
+    if args.jobs > 1:
+        del ptrac
+        convert_parallel(ptrac_filename, table, args.jobs,
+                         block_size=block_size,
+                         print_progress=args.show_progress,
+                         resume=args.resume)
+    else:
+        ptrac.write_to_hdf5_table(table, print_progress=print_progress,
+                                  block_size=block_size, resume=args.resume)
 
     table.flush()
     h5file.close()
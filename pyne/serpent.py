@@ -1,94 +1,223 @@
+from __future__ import division
 import re
 import sys
 from warnings import warn
 from pyne.utils import QAWarning
- 
+
 import numpy as np
+import tables as tb
+
+from pyne.material import Material
 
 if sys.version_info[0] > 2:
     basestring = str
-    
-warn(__name__ + " is not yet QA compliant.", QAWarning)
-
-_if_idx_str_serpent1 = (
-    'if (exist("idx", "var"));\n'
-    '  idx = idx + 1;\n'
-    'else;\n'
-    '  idx = 1;\n'
-    'end;'
-    )
-
-_if_idx_str_serpent2 = (
-    "if (exist('idx', 'var'));\n"
-    '  idx = idx + 1;\n'
-    'else;\n'
-    '  idx = 1;\n'
-    'end;'
-    )
-
-_num_pattern = "([0-9]+[.]?[0-9]*[Ee]?[+-]?[0-9]*)"
-
-_numpy_array_pattern = r"\[[0-9\sEe+-.,%]*\]"
-_matlab_array_pattern = r"\[[0-9\sEe+-.%]*\]"
-
-_comment_array_pattern = r"\[([\d\sEe+-.,]*\s*[%#]+\s*[%#\w\s.,+-]*)\]"
-_comment_line_pattern = r"([\d\s\tEe+-.]*)\s*([%#]*)\s*([#\w\s]*\n)"
-
-_lhs_variable_pattern = r"(\w+)\s*(\(idx.*?\))"
-_rhs_variable_pattern = r"(\w+)\s*\(idx.*?\)\s*=\s*(.*)"
-
-_zeros_pattern = r"(zeros)\((.*)\)"
-
-_detector_pattern = r"(DET\w+)\s*=\s*np.array\("
-
-_detector_pattern_all = r"(DET\w+)\s*=\s*"
-
-_imaterial_line_pattern = r"(i[a-zA-Z]\w+)\s*=\s*\d*;"
-
-def _delete_imaterial(s):
-    """"Remove imaterial information from the top of Serpent2 *_dep.m file started from 'i' with nothing."""
-    s = re.sub(_imaterial_line_pattern,
-               '', s)
-    return s
-
-def _replace_comments(s):
-    """Replaces matlab comments with python arrays in string s."""
-    s = s.replace('%', '#')
-    return s
-
-
-def _replace_semicolons(s):
-    """Replaces matlab semicolons with nothing in string s."""
-    s = s.replace(';', '')
-    return s
-
-
-def _replace_arrays(s):
-    """Replaces matlab arrays with numpy arrays in string s."""
-
-    # Replace matlab arrays with python lists
-    arrays = re.findall(_matlab_array_pattern, s)
-    for a in arrays:
-        new_a = re.sub(_num_pattern, lambda mo: mo.group(0) + ',', a)
-        s = s.replace(a, new_a)
-
-    # Encapsulate python lists in numpy arrays
-    s = re.sub(_numpy_array_pattern,
-               lambda mo: 'np.array(' + mo.group(0) + ')', s)
-
-    return s
 
+warn(__name__ + " is not yet QA compliant.", QAWarning)
 
-def parse_res(resfile, write_py=False):
+# kinds of statements yielded by _statements()
+_COUNTER = 0
+_ARRAY = 1
+_STRING = 2
+_VALUE = 3
+
+_counter_pattern = re.compile(r"\s*if\s*\(\s*exist\s*\(")
+_assign_pattern = re.compile(r"\s*(\w+)\s*(\([^)]*\))?\s*=\s*(.*)$")
+_width_pattern = re.compile(r"\[\s*\d+\s*:\s*(\d+)\s*\]")
+_int_pattern = re.compile(r"[+-]?\d+$")
+_number_pattern = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+_float_chars_pattern = re.compile(r"[.eEnN]")
+_zeros_pattern = re.compile(r"zeros\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)$")
+_expr_token_pattern = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?"
+                                 r"|\.\d+(?:[eE][+-]?\d+)?)|(\w+)"
+                                 r"|(\.\*|\./|[-+*/]))")
+_imaterial_pattern = re.compile(r"i[a-zA-Z]\w+$")
+
+# suffixes of the MAT_<material>_<suffix> variables of depletion files,
+# longest first
+_MAT_SUFFIXES = ('ING_TOX', 'INH_TOX', 'VOLUME', 'BURNUP', 'CAPTXS',
+                 'FISSXS', 'ADENS', 'MDENS', 'N2NXS', 'GSRC', 'SF', 'A', 'H')
+
+
+def _line_passes(mfile):
+    """Returns a function that gives a fresh iterator over the lines of mfile,
+    a path or a file-like object, for each pass over the file.
+    """
+    if isinstance(mfile, basestring):
+        def lines():
+            with open(mfile, 'r') as f:
+                for line in f:
+                    yield line
+        return lines
+    try:
+        start = mfile.tell()
+    except (AttributeError, IOError, ValueError):
+        buf = mfile.readlines()
+        return lambda: iter(buf)
+
+    def lines():
+        mfile.seek(start)
+        for line in mfile:
+            yield line
+    return lines
+
+
+def _split_comment(line):
+    """Splits a line into its text before any matlab comment and whether a
+    comment was present."""
+    start = line.rfind("'") + 1
+    i = line.find('%', start)
+    if i < 0:
+        return line, False
+    return line[:i], True
+
+
+def _statements(lines, want=None):
+    """Tokenizes the statements of a Serpent matlab output file, yielding
+    (kind, name, index, value) tuples. The value of an array is a (rows,
+    has_comment) tuple of its lines of text, or None if want(name) is false,
+    in which case the lines are skipped without being stored. The value of a
+    string is the string and the value of anything else is its text.
+    """
+    lines = iter(lines)
+    for line in lines:
+        if _counter_pattern.match(line) is not None:
+            for line in lines:
+                if line.strip().startswith('end'):
+                    break
+            yield _COUNTER, None, None, None
+            continue
+        m = _assign_pattern.match(line)
+        if m is None:
+            continue
+        name, index, rhs = m.groups()
+        rhs = rhs.strip()
+        if rhs.startswith('['):
+            keep = want is None or want(name)
+            rows = []
+            has_comment = False
+            body = rhs[1:]
+            while True:
+                text, comment = _split_comment(body)
+                closed = ']' in text
+                if closed:
+                    text = text[:text.index(']')]
+                if keep and text.strip():
+                    rows.append(text)
+                    has_comment = has_comment or comment
+                if closed:
+                    break
+                body = next(lines, None)
+                if body is None:
+                    raise ValueError("matlab array {0} is not "
+                                     "terminated".format(name))
+            yield _ARRAY, name, index, (rows, has_comment) if keep else None
+        elif rhs.startswith("'"):
+            yield _STRING, name, index, rhs[1:rhs.rindex("'")]
+        else:
+            text = _split_comment(rhs)[0].strip().rstrip(';').strip()
+            yield _VALUE, name, index, text
+
+
+def _number(text):
+    return int(text) if _int_pattern.match(text) is not None else float(text)
+
+
+def _array(rows, has_comment):
+    """Converts the lines of text of a matlab array to a numpy array. Arrays
+    with comments have one row per line, other arrays are flattened."""
+    if len(rows) > 0 and rows[0].lstrip().startswith("'"):
+        return np.array([row.strip().strip("'").strip() for row in rows])
+    text = ' '.join(rows)
+    vals = np.fromstring(text, sep=' ')
+    if _float_chars_pattern.search(text) is None:
+        vals = vals.astype(int)
+    if has_comment:
+        vals = vals.reshape(len(rows), -1)
+    return vals
+
+
+def _expr_names(text):
+    """Names of the variables in a matlab expression."""
+    return [m.group(2) for m in _expr_token_pattern.finditer(text)
+            if m.group(2) is not None and not m.group(2)[0].isdigit()]
+
+
+def _eval_expr(text, ns):
+    """Evaluates a matlab expression of numbers and variables in ns, joined by
+    +, -, *, /, .* and ./, without exec."""
+    m = _zeros_pattern.match(text)
+    if m is not None:
+        return np.zeros((int(m.group(1)), int(m.group(2))))
+    result = term = None
+    sign = 1
+    mulop = None
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _expr_token_pattern.match(text, pos)
+        if m is None:
+            raise ValueError("could not evaluate matlab expression "
+                             "{0!r}".format(text))
+        pos = m.end()
+        num, name, op = m.groups()
+        if op in ('+', '-'):
+            if term is None:
+                sign = -sign if op == '-' else sign
+                continue
+            term = term if sign > 0 else -term
+            result = term if result is None else result + term
+            term = None
+            sign = 1 if op == '+' else -1
+        elif op is not None:
+            mulop = op
+        else:
+            val = _number(num) if num is not None else ns[name]
+            if term is None:
+                term = val
+            elif mulop in ('*', '.*'):
+                term = term * val
+            else:
+                term = term / val
+    if term is None:
+        raise ValueError("could not evaluate matlab expression "
+                         "{0!r}".format(text))
+    term = term if sign > 0 else -term
+    return term if result is None else result + term
+
+
+def _write_py(mfile, data, footer=''):
+    """Writes parsed data to a python file next to mfile which recreates it."""
+    name = mfile if isinstance(mfile, basestring) else mfile.name
+    with open(name.rpartition('.')[0] + '.py', 'w') as pyfile:
+        pyfile.write("import numpy as np\n")
+        if footer:
+            pyfile.write("from pyne.material import Material\n")
+        pyfile.write("\n")
+        for key in sorted(data):
+            val = data[key]
+            if isinstance(val, np.ndarray):
+                pyfile.write("{0} = np.array({1!r}, dtype={2!r})\n".format(
+                             key, val.tolist(), val.dtype.str))
+            elif not isinstance(val, list):
+                pyfile.write("{0} = {1!r}\n".format(key, val))
+        pyfile.write(footer)
+
+
+def parse_res(resfile, write_py=False, variables=None):
     """Converts a serpent results ``*_res.m`` output file to a dictionary (and
     optionally to a ``*_res.py`` file).
 
+    The file is streamed twice: once to count the result steps and once to
+    parse each value directly into arrays with one row per step.
+
     Parameters
     ----------
     resfile : str or file-like object
         Path to results file or a res file handle.
     write_py : bool, optional
         Flag for whether to write the res file to an analogous python file.
+    variables : sequence of str, optional
+        Names of the variables to parse, defaults to all of them.
 
     Returns
     -------
@@ -97,98 +226,88 @@ def parse_res(resfile, write_py=False):
         a complete description of contents.
 
     """
-    if isinstance(resfile, basestring):
-        with open(resfile, 'r') as mfile:
-            f = mfile.read()
-    else:
-        f = resfile.read()
-
-    # Keep comments around
-    f = _replace_comments(f)
-
-    # Grab the number of 'if' statements
-    if_idx_str = _if_idx_str_serpent1
-    IDX = f.count(if_idx_str)
-    if IDX == 0:
-        if_idx_str = _if_idx_str_serpent2
-        IDX = f.count(if_idx_str)
-
-    # Replace if statements with something more meaningful
-    fpart = f.partition(if_idx_str)
-    f = fpart[0] + "idx = 0" + fpart[2]
-    f = f.replace(if_idx_str, 'idx += 1')
-
-    # Replace matlab Arrays
-    f = _replace_arrays(f)
-
-    # Add imports to header
-    header = "import numpy as np\n\n"
-
-    # Find all variables and shape
-    vars_shape = np.array(list(set(re.findall(_lhs_variable_pattern, f))))
-    vars_dtype = dict(re.findall(_rhs_variable_pattern, f))
-    # Initialize variables to zero
-    header = header + "# Initialize variables\n"
-    for vs in vars_shape:
-        # Determine shape
-        s = re.search(r'\[.*?:(.*?)\]', vs[1])
-        if s is None:
-            vs_shape = ""
-        else:
-            vs_shape = s.group(1)
-            vs_shape = vs_shape.split()
-            vs_shape = ", ".join(vs_shape)
-
-        # Determine Data type
-        rhs = vars_dtype[vs[0]]
-        if ("\'" in rhs) or ("\"" in rhs):
-            dt = "'S{0}'".format(int(s.group(1)))
-            vs_shape = ""
-        elif ('.' in rhs) or ('E' in rhs) or ('e' in rhs):
-            dt = "float"
-        else:
-            dt = "int"
-
-        zero_line = "{0} = np.zeros([{1}, {2}], dtype={3})\n".format(vs[0],
-                     IDX, vs_shape, dt)
-        header = header + zero_line
+    passes = _line_passes(resfile)
+    IDX = sum(1 for line in passes() if _counter_pattern.match(line))
+    nrows = max(IDX, 1)
+    variables = None if variables is None else set(variables)
+    want = None if variables is None else variables.__contains__
 
-    # Add IDx to file
+    res = {}
+    idx = -1
+    for kind, name, index, value in _statements(passes(), want):
+        if kind == _COUNTER:
+            idx += 1
+            continue
+        if want is not None and not want(name):
+            continue
+        i = max(idx, 0)
+        width = None if index is None else _width_pattern.search(index)
+        width = None if width is None else int(width.group(1))
+        if kind == _STRING:
+            n = max(len(value), width or 0, 1)
+            arr = res.get(name)
+            if arr is None or arr.dtype.itemsize < n:
+                arr = np.zeros(nrows, dtype='S{0}'.format(n)) if arr is None \
+                      else arr.astype('S{0}'.format(n))
+                res[name] = arr
+            arr[i] = value if isinstance(value, bytes) else \
+                     value.encode('utf-8', 'replace')
+            continue
+        if kind == _ARRAY:
+            text = ' '.join(value[0])
+            val = np.fromstring(text, sep=' ')
+        else:
+            text = value
+            val = _number(value)
+        dtype = float if _float_chars_pattern.search(text) else int
+        arr = res.get(name)
+        if arr is None:
+            shape = (nrows,) if width is None else (nrows, width)
+            arr = res[name] = np.zeros(shape, dtype=dtype)
+        elif dtype is float and arr.dtype.kind == 'i':
+            arr = res[name] = arr.astype(float)
+        arr[i] = val
+
+    res['idx'] = idx
     if 0 < IDX:
-        header = header + "\n\n# Maximum Index\n\nIDX = {0}\n\n".format(IDX)
+        res['IDX'] = IDX
 
-    # Add header to file
-    f = header + f
+    if write_py:
+        _write_py(resfile, res)
+    return res
 
-    # Replace variable overrides
-    vars = np.array(list(set(re.findall("(" + _lhs_variable_pattern + ")", f))))
-    for v in vars:
-        f = f.replace(v[0], "{0}[idx] ".format(v[1]))
 
-    # Remove semicolons
-    f = _replace_semicolons(f)
+def _mat_split(name):
+    """Splits a MAT_<material>_<suffix> variable name into its material name,
+    which may contain underscores, and its suffix."""
+    for suffix in _MAT_SUFFIXES:
+        if name.endswith('_' + suffix) and len(name) > len(suffix) + 5:
+            return name[4:-len(suffix) - 1], suffix
+    mat, _, suffix = name[4:].rpartition('_')
+    return mat, suffix
 
-    # Write the file out
-    if write_py:
-        if isinstance(resfile, basestring):
-            new_filename = resfile.rpartition('.')[0] + '.py'
-        else:
-            new_filename = resfile.name.rpartition('.')[0] + '.py'
-        with open(new_filename, 'w') as pyfile:
-            pyfile.write(f)
 
-    # Execute the adjusted file
-    res = {}
-    exec(f, res, res)
-    if '__builtins__' in res:
-        del res['__builtins__']
-    return res
+def _dep_keep(name, variables, materials):
+    """Whether a depletion file variable has been selected."""
+    if name.startswith('MAT_'):
+        mat, suffix = _mat_split(name)
+        if materials is not None and mat not in materials:
+            return False
+        return variables is None or name in variables or suffix in variables
+    return variables is None or name in variables
 
 
-def parse_dep(depfile, write_py=False, make_mats=True):
+def parse_dep(depfile, write_py=False, make_mats=True, variables=None,
+              materials=None):
     """Converts a serpent depletion ``*_dep.m`` output file to a dictionary (and
     optionally to a ``*_dep.py`` file).
 
+    The file is streamed and each array is parsed directly into a numpy array.
+    When variables or materials are selected, a first pass finds which other
+    variables the selected ones are computed from, e.g. the MAT_*_MDENS arrays
+    summed into TOT_MASS. Only those are parsed in the second pass and each
+    is discarded once it is no longer needed.
+
     Parameters
     ----------
     depfile : str or file-like object
@@ -198,100 +317,129 @@ def parse_dep(depfile, write_py=False, make_mats=True):
     make_mats : bool, optional
         Flag for whether or not to build Materials out of mass data and add
         these to the return dictionary.  Materials so added have names which
-        end in '_MATERIAL'.
+        end in '_MATERIAL'.  When variables are selected, Materials are only
+        built for the selected MAT_*_MDENS arrays and, as TOT_MATERIAL, for
+        TOT_MASS if it is selected.
+    variables : sequence of str, optional
+        Names of the variables to parse, e.g. 'BU' or 'TOT_MASS'. Material
+        variables may also be given by their suffix, e.g. 'MDENS' selects
+        the MAT_*_MDENS arrays. Defaults to all variables.
+    materials : sequence of str, optional
+        Names of the materials whose MAT_<name>_* variables are parsed,
+        defaults to all materials.
 
     Returns
     -------
     dep : dict
         Dictionary of the parsed depletion information.  Please see the Serpent
-        manual for a complete description of contents.
+        manual for a complete description of contents.  Arrays of strings,
+        such as NAMES, are numpy arrays with one stripped string per entry
+        rather than a list holding the concatenation of all the strings.
 
     """
-    if isinstance(depfile, basestring):
-        with open(depfile, 'r') as mfile:
-            f = mfile.read()
-    else:
-        f = depfile.read()
-
-    # Remove imaterial information from the top of Serpent2 *_dep.m file
-    f = _delete_imaterial(f)
-    
-    # Keep comments around
-    f = _replace_comments(f)
-
-    # Replace matlab Arrays
-    f = _replace_arrays(f)
-    
-    # Now to find and convert arrays that have comments in them
-    comment_arrays = re.findall("(" + _comment_array_pattern + ")", f)
-    for ca in comment_arrays:
-        new_ca = ca[0]
-        comment_lines = re.findall("(" + _comment_line_pattern + ")", ca[1])
-        for cl in comment_lines:
-            new_cl = re.sub(_num_pattern, lambda mo: mo.group(0) + ',', cl[1])
-            if new_cl[0] == '\n':
-                new_cl = "\n    [" + new_cl.strip() + "], "
-            else:
-                new_cl = "    [" + new_cl.strip() + "], "
-
-            new_ca = new_ca.replace(cl[1], new_cl)
-
-        new_ca = 'np.array( ' + new_ca + ' )'
-        f = f.replace(ca[0], new_ca)
+    passes = _line_passes(depfile)
+    variables = None if variables is None else set(variables)
+    materials = None if materials is None else set(materials)
+    keep = lambda name: _dep_keep(name, variables, materials)
+
+    # find the variables needed to compute the selected ones and the
+    # statement after which each of them may be dropped
+    needed = None
+    drop_at = {}
+    if variables is not None or materials is not None:
+        deps = {}
+        last_use = {}
+        needed = set()
+        mat_needed = set()
+        for k, (kind, name, index, value) in enumerate(
+                _statements(passes(), want=lambda name: False)):
+            if kind == _VALUE:
+                for operand in _expr_names(value):
+                    deps.setdefault(name, set()).add(operand)
+                    last_use[operand] = k
+            if kind != _COUNTER and keep(name):
+                needed.add(name)
+            if not make_mats or kind == _COUNTER or not keep(name):
+                continue
+            if name.startswith('MAT_') and name.endswith('_MDENS'):
+                mat_needed.update([name, name[:-5] + 'VOLUME', 'ZAI', 'DAYS'])
+            elif name == 'TOT_MASS':
+                mat_needed.update(['ZAI', 'DAYS'])
+        needed |= mat_needed
+        stack = list(needed)
+        while stack:
+            for operand in deps.get(stack.pop(), ()):
+                if operand not in needed:
+                    needed.add(operand)
+                    stack.append(operand)
+        for name, k in last_use.items():
+            if name in needed and name not in mat_needed and not keep(name):
+                drop_at.setdefault(k, []).append(name)
 
-    # Indent close of array
-    f = f.replace("\n] )", "\n    ] )")
-
-    # Replace MatLab zeros with numpy zeros
-    f = re.sub(_zeros_pattern, lambda mo: "np.zeros((" + mo.group(2) + "))", f)
-
-    # Replace some math operators
-    f = f.replace('.*', "*")
-    f = f.replace('./', "/")
-
-    # Remove semicolons
-    f = _replace_semicolons(f)
-
-    # Add imports to header
-    header = "import numpy as np\n"
-    if make_mats:
-        header += "from pyne.material import Material\n"
-    header += "\n"
+    dep = {}
+    want = None if needed is None else needed.__contains__
+    for k, (kind, name, index, value) in enumerate(_statements(passes(), want)):
+        if kind == _COUNTER or (want is not None and not want(name)):
+            continue
+        if kind == _ARRAY:
+            dep[name] = _array(*value)
+        elif kind == _STRING:
+            dep[name] = value
+        elif _imaterial_pattern.match(name) and value.isdigit():
+            # Serpent 2 imaterial information is not kept
+            continue
+        elif _number_pattern.match(value):
+            dep[name] = _number(value)
+        else:
+            dep[name] = _eval_expr(value, dep)
+        for dropped in drop_at.get(k, ()):
+            dep.pop(dropped, None)
 
-    # Add materials
-    footer = ""
+    # Construct materials
+    base_names = []
+    make_tot = False
     if make_mats:
-        mat_gen_line = "{name}MATERIAL = [{name}VOLUME * Material(dict(zip(zai[:-2], {name}MDENS[:-2, col]))) for col in cols]\n"
-        footer += ('\n\n# Construct materials\n'
-                   'zai = list(map(int, ZAI))\n'
-                   'cols = list(range(len(DAYS)))\n')
-        base_names = re.findall('(MAT_\w*_)MDENS = ', f)
+        base_names = [name[:-5] for name in list(dep.keys())
+                      if name.startswith('MAT_') and name.endswith('_MDENS')
+                      and keep(name)]
+        make_tot = 'TOT_MASS' in dep and keep('TOT_MASS')
+        if base_names or make_tot:
+            zai = list(map(int, dep['ZAI']))
+            cols = list(range(len(dep['DAYS'])))
         for base_name in base_names:
-            footer += mat_gen_line.format(name=base_name)
-        footer += "TOT_MATERIAL = [Material(dict(zip(zai[:-2], TOT_MASS[:-2, col]))) for col in cols]\n"
-        footer += "del zai, cols\n"
-
-    # Add header & footer to file
-    f = header + f + footer
+            volume = dep[base_name + 'VOLUME']
+            mdens = dep[base_name + 'MDENS']
+            dep[base_name + 'MATERIAL'] = [
+                volume * Material(dict(zip(zai[:-2], mdens[:-2, col])))
+                for col in cols]
+        if make_tot:
+            dep['TOT_MATERIAL'] = [
+                Material(dict(zip(zai[:-2], dep['TOT_MASS'][:-2, col])))
+                for col in cols]
+
+    if needed is not None:
+        for name in list(dep.keys()):
+            if not name.endswith('_MATERIAL') and not keep(name):
+                del dep[name]
 
-    # Write the file out
     if write_py:
-        if isinstance(depfile, basestring):
-            new_filename = depfile.rpartition('.')[0] + '.py'
-        else:
-            new_filename = depfile.name.rpartition('.')[0] + '.py'
-        with open(new_filename, 'w') as pyfile:
-            pyfile.write(f)
-
-    # Execute the adjusted file
-    dep = {}
-    exec(f, dep, dep)
-    if '__builtins__' in dep:
-        del dep['__builtins__']
+        footer = ""
+        if base_names or make_tot:
+            mat_gen_line = "{name}MATERIAL = [{name}VOLUME * Material(dict(zip(zai[:-2], {name}MDENS[:-2, col]))) for col in cols]\n"
+            footer += ('\n\n# Construct materials\n'
+                       'zai = list(map(int, ZAI))\n'
+                       'cols = list(range(len(DAYS)))\n')
+            for base_name in base_names:
+                if base_name + 'MDENS' in dep and base_name + 'VOLUME' in dep:
+                    footer += mat_gen_line.format(name=base_name)
+            if make_tot:
+                footer += "TOT_MATERIAL = [Material(dict(zip(zai[:-2], TOT_MASS[:-2, col]))) for col in cols]\n"
+            footer += "del zai, cols\n"
+        _write_py(depfile, dep, footer)
     return dep
 
 
-def parse_det(detfile, write_py=False):
+def parse_det(detfile, write_py=False, variables=None):
     """Converts a serpent detector ``*_det.m`` output file to a dictionary (and
     optionally to a ``*_det.py`` file).
 
@@ -301,6 +449,9 @@ def parse_det(detfile, write_py=False):
         Path to detector file or a det file handle.
     write_py : bool, optional
         Flag for whether to write the det file to an analogous python file.
+    variables : sequence of str, optional
+        Names of the variables to parse, e.g. 'DET1' and 'DET1E', defaults to
+        all of them.
 
     Returns
     -------
@@ -308,65 +459,115 @@ def parse_det(detfile, write_py=False):
         Dictionary of the parsed detector.  Please see the Serpent manual for
         a complete description of contents.
 
-    """
-    if isinstance(detfile, basestring):
-        with open(detfile, 'r') as mfile:
-            f = mfile.read()
-    else:
-        f = detfile.read()
-
-    # Keep comments around
-    f = _replace_comments(f)
-
-    # Replace matlab Arrays
-    f = _replace_arrays(f)
+    Raises
+    ------
+    ValueError
+        If a scalar variable is not a number.
 
-    # Find detector variable names
-    det_names = re.findall(_detector_pattern, f)
-    det_names = np.unique(det_names)
-    all_det_names = re.findall(_detector_pattern_all, f)
-    all_det_names = np.unique(all_det_names)
+    """
+    variables = None if variables is None else set(variables)
+    want = None if variables is None else variables.__contains__
+    det = {}
+    scalars = {}
+    det_names = set()
+    for kind, name, index, value in _statements(_line_passes(detfile)(), want):
+        if kind == _ARRAY:
+            det_names.add(name)
+            if value is not None:
+                det[name] = _array(*value).ravel()
+        elif kind == _STRING:
+            if want is None or want(name):
+                det[name] = value
+        elif kind == _VALUE:
+            try:
+                scalars[name] = _number(value)
+            except ValueError:
+                raise ValueError("detector file variable {0} is not a "
+                                 "number: {1!r}".format(name, value))
+            if want is None or want(name):
+                det[name] = scalars[name]
 
     is_serpent_1 = any([(dn.endswith('_VALS') and dn[:-5] in det_names) or
                         (dn.endswith('_EBINS') and dn[:-6] in det_names)
-                        for dn in all_det_names])
+                        for dn in scalars])
 
-    # Append detector reshaping
-    f += '\n\n# Reshape detectors\n'
+    # Reshape detectors
     for dn in det_names:
+        if dn not in det:
+            continue
         if is_serpent_1:
             if dn + 'E' in det_names:
-                f += '{name}.shape = ({name}_VALS, 13)\n'.format(name=dn)
+                det[dn].shape = (scalars[dn + '_VALS'], 13)
             else:
-                f += '{name}.shape = ({name_min_E}_EBINS, 3)\n'.format(name=dn,
-                                                            name_min_E=dn[:-1])
+                det[dn].shape = (scalars[dn[:-1] + '_EBINS'], 3)
         else:
             if (dn + 'T' in det_names):
-                f += '{name}.shape = (len({name})//13, 13)\n'.format(name=dn)
+                det[dn].shape = (len(det[dn])//13, 13)
             elif (dn + 'E' in det_names):
-                f += '{name}.shape = (len({name})//12, 12)\n'.format(name=dn)
+                det[dn].shape = (len(det[dn])//12, 12)
             else:
-                f += '{name}.shape = (len({name})//3, 3)\n'.format(name=dn)
+                det[dn].shape = (len(det[dn])//3, 3)
 
-    # Add imports to header
-    header = "import numpy as np\n\n"
+    if write_py:
+        _write_py(detfile, det)
+    return det
 
-    # Add header to file
-    f = header + f
 
-    # Remove semicolons
-    f = _replace_semicolons(f)
+def write_hdf5(data, filename):
+    """Writes the dictionary returned by parse_res(), parse_dep() or
+    parse_det() to an HDF5 file, so that it may be reloaded with read_hdf5()
+    without parsing the matlab file again. Arrays are stored as uncompressed
+    contiguous datasets and scalars as attributes of the root group. Lists
+    of Materials are not stored.
 
-    # Write the file out
-    if write_py:
-        if isinstance(detfile, basestring):
-            new_filename = detfile.rpartition('.')[0] + '.py'
-        else:
-            new_filename = detfile.name.rpartition('.')[0] + '.py'
-        with open(new_filename, 'w') as pyfile:
-            pyfile.write(f)
-    # Execute the adjusted file
-    det = {}
-    exec(f, {}, det)
+    Parameters
+    ----------
+    data : dict
+        The parsed Serpent output.
+    filename : str
+        Path to the HDF5 file, which is overwritten.
 
-    return det
+    """
+    with tb.open_file(filename, 'w') as h5f:
+        for key, val in data.items():
+            if isinstance(val, np.ndarray):
+                is_unicode = (val.dtype.kind == 'U')
+                if is_unicode:
+                    val = np.char.encode(val, 'utf-8')
+                node = h5f.create_array('/', key, obj=val)
+                node.attrs.unicode = is_unicode
+            elif isinstance(val, (int, float, np.number, basestring)):
+                h5f.root._v_attrs[key] = val
+
+
+def read_hdf5(filename, variables=None):
+    """Reads Serpent output written by write_hdf5(). Only the selected arrays
+    are read from the file.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the HDF5 file.
+    variables : sequence of str, optional
+        Names of the variables to read, defaults to all of them.
+
+    Returns
+    -------
+    data : dict
+        The parsed Serpent output.
+
+    """
+    data = {}
+    with tb.open_file(filename, 'r') as h5f:
+        attrs = h5f.root._v_attrs
+        for key in attrs._f_list('user'):
+            if variables is None or key in variables:
+                val = attrs[key]
+                data[key] = val.item() if isinstance(val, np.generic) else val
+        for node in h5f.iter_nodes('/', classname='Array'):
+            if variables is None or node.name in variables:
+                val = node.read()
+                if node.attrs.unicode:
+                    val = np.char.decode(val, 'utf-8')
+                data[node.name] = val
+    return data
@@ -250,6 +250,7 @@ cdef class Sampler:
     normalize_pdf
     num_groups
     particle_birth
+    particle_birth_many
     read_bias_pdf
     sample_e
     sample_w
@@ -502,6 +503,68 @@ cdef class Sampler:
         return SourceParticle(c_src.get_x(), c_src.get_y(), c_src.get_z(), \
                 c_src.get_e(), c_src.get_w(), c_src.get_c())
 
+    def particle_birth_many(self, rands=None, n=None, seed=0, num_threads=1):
+        """particle_birth_many(self, rands=None, n=None, seed=0, num_threads=1)
+        Samples the birth parameters of many particles in a single call.
+
+        Parameters
+        ----------
+        rands : array-like of floats, shape (N, 6), optional
+            Six pseudo-random numbers in range [0, 1) for each particle, as
+            passed to particle_birth.
+        n : int, optional
+            The number of particles to sample if rands is not given. The
+            random numbers are then drawn from independent Mersenne Twister
+            streams, one per block of particles, so the result for a given
+            seed does not depend on num_threads.
+        seed : int, optional
+            The seed of the random number streams if rands is not given.
+        num_threads : int, optional
+            The number of threads to split the particles over.
+
+        Returns
+        -------
+        x, y, z, e, w : ndarrays of floats, length N
+            The positions, energies and weights of the particles.
+        c : ndarray of ints, length N
+            The cell numbers of the particles, -1 if not in subvoxel mode.
+
+        """
+        cdef np.ndarray[np.float64_t, ndim=2] rands_arr
+        cdef int num
+        cdef int threads = num_threads
+        cdef unsigned long cseed = seed
+        if rands is None:
+            if n is None:
+                raise ValueError("either rands or n must be given")
+            num = n
+        else:
+            rands_arr = np.ascontiguousarray(rands, dtype=np.float64)
+            if rands_arr.shape[1] != 6:
+                raise ValueError("rands must have shape (N, 6)")
+            num = rands_arr.shape[0]
+        cdef np.ndarray[np.float64_t, ndim=1] x = np.empty(num, dtype=np.float64)
+        cdef np.ndarray[np.float64_t, ndim=1] y = np.empty(num, dtype=np.float64)
+        cdef np.ndarray[np.float64_t, ndim=1] z = np.empty(num, dtype=np.float64)
+        cdef np.ndarray[np.float64_t, ndim=1] e = np.empty(num, dtype=np.float64)
+        cdef np.ndarray[np.float64_t, ndim=1] w = np.empty(num, dtype=np.float64)
+        cdef np.ndarray[np.int32_t, ndim=1] c = np.empty(num, dtype=np.int32)
+        if num == 0:
+            return x, y, z, e, w, c
+        cdef cpp_source_sampling.Sampler * inst = \
+                <cpp_source_sampling.Sampler *> self._inst
+        cdef double * rands_data
+        if rands is None:
+            with nogil:
+                inst.particle_birth_many(num, cseed, &x[0], &y[0], &z[0],
+                                         &e[0], &w[0], &c[0], threads)
+        else:
+            rands_data = &rands_arr[0, 0]
+            with nogil:
+                inst.particle_birth_many(num, rands_data, &x[0], &y[0],
+                                         &z[0], &e[0], &w[0], &c[0], threads)
+        return x, y, z, e, w, c
+
 
 cdef class SourceParticle:
     """Constructor for class SourceParticle
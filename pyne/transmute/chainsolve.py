@@ -23,6 +23,13 @@ from pyne.xs.channels import sigma_a
 
 warn(__name__ + " is not yet QA compliant.", QAWarning)
 
+_SOLVERS = frozenset(['dense', 'bateman'])
+
+# relative spacing of destruction rates below which the analytic Bateman
+# solution is considered ill-conditioned, since its 1/(lam_j - lam_i) terms
+# cancel catastrophically.
+_BATEMAN_RTOL = 1e-3
+
 class Transmuter(object):
     """A class for transmuting materials using an ALARA-like chain solver."""
 
@@ -49,14 +56,31 @@ class Transmuter(object):
         args : tuple, optional
             Other arguments ignored for compatibility with other Transmuters.
         kwargs : dict, optional
-            Other keyword arguments ignored for compatibility with other Transmuters.
+            Other keyword arguments ignored for compatibility with other 
+            Transmuters, except for:
+
+            solver : str, optional
+                How each linear chain is solved. 'dense' grows a dense matrix 
+                and takes its exponential at every step and is the reference 
+                solver. 'bateman' solves the chains analytically, falling back 
+                to the matrix exponential only when destruction rates are 
+                degenerate, and memoizes the partial results for each root 
+                nuclide.
         """
+        solver = kwargs.pop('solver', 'dense')
+        self._dest_cache = {}
+        self._prod_cache = {}
+        self._partial_cache = {}
         eafds = EAFDataSource()
         eafds.load(temp=temp)
         gs = np.array([eafds.src_group_struct[0], eafds.src_group_struct[-1]])
         eafds.dst_group_struct = gs
         self.xscache = XSCache(group_struct=gs, data_sources=(eafds, NullDataSource,))
 
+        if solver not in _SOLVERS:
+            raise ValueError("solver must be one of {0}, got "
+                             "{1!r}".format(sorted(_SOLVERS), solver))
+        self.solver = solver
         self.t = t
         self._phi = None
         self.phi = phi
@@ -71,9 +95,37 @@ class Transmuter(object):
                    'z_2na', 'np', 'np_1', 'np_2', 'n2a', 'nd', 'nd_1', 'nd_2', 
                    'nt', 'nt_1', 'nt_2', 'nHe3', 'nHe3_1', 'nHe3_2','z_4n', 
                    'z_4n_1', 'n', 'n_1', 'n_2', 'z_3np']
+        self.rxs = rxs
+
+    @property
+    def xscache(self):
+        return self._xscache
+
+    @xscache.setter
+    def xscache(self, xscache):
+        self._xscache = xscache
+        self.clear_cache()
+
+    @property
+    def temp(self):
+        return self._temp
+
+    @temp.setter
+    def temp(self, temp):
+        self._temp = temp
+        self.clear_cache()
+
+    @property
+    def rxs(self):
+        """The reaction ids used in transmutation, as a frozenset."""
+        return self._rxs
+
+    @rxs.setter
+    def rxs(self, rxs):
         rxs = set([rxname.id(rx) for rx in rxs])
         rxs.discard(rxname.id('fission'))
-        self.rxs = rxs
+        self._rxs = frozenset(rxs)
+        self.clear_cache()
 
     @property
     def phi(self):
@@ -97,6 +149,16 @@ class Transmuter(object):
             ds.src_phi_g = flux
         self.xscache['phi_g'] = np.array([flux.sum()])
         self._phi = flux
+        self.clear_cache()
+
+    def clear_cache(self):
+        """Clears the memoized destruction rates, production rates, and partial
+        results.  This is called whenever the flux, temperature, reactions, or
+        cross section cache change.
+        """
+        self._dest_cache.clear()
+        self._prod_cache.clear()
+        self._partial_cache.clear()
 
     def transmute(self, x, t=None, phi=None, tol=None, log=None, *args, **kwargs):
         """Transmutes a material into its daughters.
@@ -165,7 +227,9 @@ class Transmuter(object):
             nuclide ids and values are float number densities for the coupled
             # what is the coupled?.
         """
-        dest = self._get_destruction(nuc)
+        if self.solver == 'bateman':
+            return self._bateman_partial(nuc)
+        dest = self._destruction(nuc)
         # DENSE
         A = np.empty((1,1), float)
         A[0, 0] = -dest
@@ -199,6 +263,51 @@ class Transmuter(object):
             d += data.decay_const(nuc) 
         return d
 
+    def _destruction(self, nuc):
+        """Memoized version of _get_destruction(nuc, decay=True)."""
+        d = self._dest_cache.get(nuc)
+        if d is None:
+            d = self._dest_cache[nuc] = self._get_destruction(nuc)
+        return d
+
+    def _production(self, nuc):
+        """Computes the production rates of all children of the nuclide, from
+        both decay and neutron reactions.  Results are memoized.
+
+        Parameters
+        ----------
+        nuc : int
+            Nuclide id of the parent.
+
+        Returns
+        -------
+        prod : dict
+            Keys are child nuclide ids, values are production rates [1/sec].
+
+        """
+        if nuc in self._prod_cache:
+            return self._prod_cache[nuc]
+        phi = self.xscache['phi_g'][0]
+        temp = self.temp
+        xscache = self.xscache
+        prod = {}
+        # decay info
+        lam = data.decay_const(nuc)
+        decay_branches = {} if lam == 0 else self._decay_branches(nuc)
+        for decay_child, branch_ratio in decay_branches.items():
+            prod[decay_child] = lam * branch_ratio
+        # reaction daughters
+        for rx in self.rxs:
+            try:
+                child = rxname.child(nuc, rx)
+            except RuntimeError:
+                continue
+            child_xs = xscache[nuc, rx, temp][0]
+            rr = utils.from_barns(child_xs, 'cm2') * phi  # reaction rate
+            prod[child] = rr + prod.get(child, 0.0)
+        self._prod_cache[nuc] = prod
+        return prod
+
     def _grow_matrix(self, A, prod, dest):
         """Grows the given matrix by one row and one column, adding necessary
         production and destruction rates.
@@ -257,30 +366,13 @@ class Transmuter(object):
         """
         t = self.t
         tol = self.tol
-        phi = self.xscache['phi_g'][0]
-        temp = self.temp
-        xscache = self.xscache
         if self.log is not None:
             self._log_tree(depth, nuc, 1.0)
-        prod = {}
-        # decay info
-        lam = data.decay_const(nuc)
-        decay_branches = {} if lam == 0 else self._decay_branches(nuc)
-        for decay_child, branch_ratio in decay_branches.items():
-            prod[decay_child] = lam * branch_ratio
-        # reaction daughters
-        for rx in self.rxs:
-            try:
-                child = rxname.child(nuc, rx)
-            except RuntimeError:
-                continue
-            child_xs = xscache[nuc, rx, temp][0]
-            rr = utils.from_barns(child_xs, 'cm2') * phi  # reaction rate
-            prod[child] = rr + prod.get(child, 0.0)
+        prod = self._production(nuc)
         # Cycle production dictionary
         for child in prod:
             # Grow matrix
-            d = self._get_destruction(child)
+            d = self._destruction(child)
             B = self._grow_matrix(A, prod[child], d)
             # Create initial density vector
             n = B.shape[0]
@@ -300,6 +392,87 @@ class Transmuter(object):
             if 0.0 < outval:
                 out[child] = outval
 
+    def _bateman_partial(self, nuc):
+        """Analytic counterpart of the dense _transmute_partial().  Partial
+        results are memoized on (nuc, t, tol) when no log is being written.
+        """
+        key = (nuc, self.t, self.tol)
+        if self.log is None and key in self._partial_cache:
+            return dict(self._partial_cache[key])
+        dest = self._destruction(nuc)
+        partial = {nuc: np.exp(-dest * self.t)}
+        self._bateman_traversal(nuc, [dest], [], partial)
+        if self.log is None:
+            self._partial_cache[key] = dict(partial)
+        return partial
+
+    def _bateman_traversal(self, nuc, dests, prods, out, depth=0):
+        """Same traversal as _traversal(), but the chain is carried as lists of
+        destruction and production rates rather than as a matrix.
+
+        Parameters
+        ----------
+        nuc : int
+            ID of the active nuclide for the traversal.
+        dests : list of floats
+            Destruction rates of the nuclides in the chain, root first.
+        prods : list of floats
+            Production rates linking each nuclide in the chain to the next.
+        out : dict
+            The final recorded number densities, modified in place.
+        depth : int
+            Current depth of traversal (root at 0).
+
+        """
+        tol = self.tol
+        if self.log is not None:
+            self._log_tree(depth, nuc, 1.0)
+        prod = self._production(nuc)
+        for child, p in prod.items():
+            child_dests = dests + [self._destruction(child)]
+            child_prods = prods + [p]
+            N_final = self._bateman(child_dests, child_prods)
+            if self.log is not None:
+                self._log_tree(depth+1, child, N_final)
+            if N_final > tol:
+                self._bateman_traversal(child, child_dests, child_prods, out,
+                                        depth=depth+1)
+            outval = N_final + out.get(child, 0.0)
+            if 0.0 < outval:
+                out[child] = outval
+
+    def _bateman(self, dests, prods):
+        """Computes the number density of the last nuclide in a linear chain
+        after the transmutation time, given a unit density of the root.
+
+        Parameters
+        ----------
+        dests : list of floats
+            Destruction rates of the nuclides in the chain, root first.
+        prods : list of floats
+            Production rates linking each nuclide in the chain to the next.
+
+        Returns
+        -------
+        N : float
+            Number density of the last nuclide in the chain.
+
+        """
+        t = self.t
+        lams = np.asarray(dests, dtype=float)
+        # diff[k, j] = lam_k - lam_j, with ones on the diagonal
+        diff = lams[:, np.newaxis] - lams
+        np.fill_diagonal(diff, 1.0)
+        scale = np.abs(lams).max()
+        if np.any(np.abs(diff) <= _BATEMAN_RTOL * scale):
+            # degenerate rates, use the matrix exponential of the chain
+            n = len(lams)
+            B = np.diag(-lams)
+            B[np.arange(1, n), np.arange(n - 1)] = prods
+            return linalg.expm(B * t)[-1, 0]
+        denom = np.prod(diff, axis=0)
+        return np.prod(prods) * np.sum(np.exp(-lams * t) / denom)
+
     def _log_tree(self, depth, nuc, numdens):
         """Logging method to track path of _traversal.
 
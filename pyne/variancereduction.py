@@ -2,7 +2,6 @@
 This module contains functions for mesh-based Monte Carlo variance reduction.
 """
 
-from itertools import izip
 from warnings import warn
 from pyne.utils import QAWarning
 
@@ -24,7 +23,8 @@ from mcnp import Wwinp
 from pyne.particle import mcnp
 
 def cadis(adj_flux_mesh, adj_flux_tag, q_mesh, q_tag,
-          ww_mesh, ww_tag, q_bias_mesh, q_bias_tag, beta=5):
+          ww_mesh, ww_tag, q_bias_mesh, q_bias_tag, beta=5,
+          chunk_size=2**18):
     """This function reads PyNE Mesh objects tagged with adjoint fluxes and
     unbiased source densities and outputs PyNE Meshes of weight window lower
     bounds and biased source densities as computed by the Consistant
@@ -60,74 +60,61 @@ def cadis(adj_flux_mesh, adj_flux_tag, q_mesh, q_tag,
     beta : float
         The ratio of the weight window upper bound to the weight window lower
         bound. The default value is 5: the value used in MCNP.
+    chunk_size : int, optional
+        The number of volume elements whose tags and volumes are held in
+        memory at once. Each chunk is read and written with bulk tag access.
     """
-
-    # find number of energy groups
-    e_groups = adj_flux_mesh.mesh.getTagHandle(adj_flux_tag)[list(
-                adj_flux_mesh.mesh.iterate(iBase.Type.region,
-                                           iMesh.Topology.all))[0]]
-    e_groups = np.atleast_1d(e_groups)
-    num_e_groups = len(e_groups)
-
-    # verify source (q) mesh has the same number of energy groups
-    q_e_groups = q_mesh.mesh.getTagHandle(q_tag)[list(
-                  q_mesh.mesh.iterate(iBase.Type.region,
-                                      iMesh.Topology.all))[0]]
-    q_e_groups = np.atleast_1d(q_e_groups)
-    num_q_e_groups = len(q_e_groups)
-
+    adj_ves = adj_flux_mesh._ves
+    q_ves = q_mesh._ves
+    ww_ves = ww_mesh._ves
+    q_bias_ves = q_bias_mesh._ves
+    num_ves = min(len(adj_ves), len(q_ves), len(ww_ves), len(q_bias_ves))
+    tag_adj = adj_flux_mesh.mesh.getTagHandle(adj_flux_tag)
+    tag_q = q_mesh.mesh.getTagHandle(q_tag)
+
+    # find number of energy groups and verify source (q) mesh has the same
+    # number of energy groups
+    num_e_groups = np.atleast_1d(tag_adj[adj_ves[0]]).size
+    num_q_e_groups = np.atleast_1d(tag_q[q_ves[0]]).size
     if num_q_e_groups != num_e_groups:
         raise TypeError("{0} on {1} and {2} on {3} "
                         "must be of the same dimension".format(adj_flux_mesh,
                                                                adj_flux_tag,
                                                                q_mesh, q_tag))
 
-    # create volume element (ve) iterators
-    adj_ves = adj_flux_mesh.mesh.iterate(iBase.Type.region, iMesh.Topology.all)
-    q_ves = q_mesh.mesh.iterate(iBase.Type.region, iMesh.Topology.all)
-
-    # calculate total source strength
-    q_tot = 0
-    for q_ve in q_ves:
-        q_tot += np.sum(q_mesh.mesh.getTagHandle(q_tag)[q_ve]) \
-                 * q_mesh.elem_volume(q_ve)
-
-    q_ves.reset()
-
-    # calculate the total response per source particle (R)
-    R = 0
-    for adj_ve, q_ve in zip(adj_ves, q_ves):
-        adj_flux = adj_flux_mesh.mesh.getTagHandle(adj_flux_tag)[adj_ve]
-        adj_flux = np.atleast_1d(adj_flux)
-        q = q_mesh.mesh.getTagHandle(q_tag)[q_ve]
-        q = np.atleast_1d(q)
-
-        vol = adj_flux_mesh.elem_volume(adj_ve)
-        for i in range(0, num_e_groups):
-            R += adj_flux[i]*q[i]*vol/q_tot
+    def chunks():
+        for start in range(0, num_ves, chunk_size):
+            stop = min(start + chunk_size, num_ves)
+            adj_flux = np.reshape(tag_adj[adj_ves[start:stop]],
+                                  (stop - start, num_e_groups))
+            q = np.reshape(tag_q[q_ves[start:stop]],
+                           (stop - start, num_e_groups))
+            yield start, stop, adj_flux, q
+
+    # calculate total source strength and the total response per source
+    # particle (R) in a single pass
+    q_vols = q_mesh.elem_volumes()
+    adj_vols = adj_flux_mesh.elem_volumes()
+    q_tot = 0.0
+    R = 0.0
+    for start, stop, adj_flux, q in chunks():
+        q_vol = q * q_vols[start:stop, np.newaxis]
+        adj_vol = adj_vols[start:stop]
+        q_tot += np.sum(q_vol)
+        R += np.sum(adj_flux * q * adj_vol[:, np.newaxis])
+    R /= q_tot
 
     # generate weight windows and biased source densities using R
     tag_ww = ww_mesh.mesh.createTag(ww_tag, num_e_groups, float)
-    ww_ves = ww_mesh.mesh.iterate(iBase.Type.region, iMesh.Topology.all)
     tag_q_bias = q_bias_mesh.mesh.createTag(q_bias_tag, num_e_groups, float)
-    q_bias_ves = q_bias_mesh.mesh.iterate(iBase.Type.region, iMesh.Topology.all)
-    # reset previously created iterators
-    q_ves.reset()
-    adj_ves.reset()
-
-    for adj_ve, q_ve, ww_ve, q_bias_ve in izip(adj_ves, q_ves,
-                                               ww_ves, q_bias_ves):
-        adj_flux = adj_flux_mesh.mesh.getTagHandle(adj_flux_tag)[adj_ve]
-        adj_flux = np.atleast_1d(adj_flux)
-        q = q_mesh.mesh.getTagHandle(q_tag)[q_ve]
-        q = np.atleast_1d(q)
-
-        tag_q_bias[q_bias_ve] = [adj_flux[i]*q[i]/q_tot/R
-                                 for i in range(num_e_groups)]
-
-        tag_ww[ww_ve] = [R/(adj_flux[i]*(beta + 1.)/2.)
-                         if adj_flux[i] != 0.0 else 0.0
-                         for i in range(num_e_groups)]
+    out_shape = (-1,) if num_e_groups == 1 else (-1, num_e_groups)
+    for start, stop, adj_flux, q in chunks():
+        q_bias = adj_flux * q / q_tot / R
+        nonzero = (adj_flux != 0.0)
+        ww = np.zeros_like(adj_flux)
+        ww[nonzero] = R / (adj_flux[nonzero] * (beta + 1.) / 2.)
+        tag_q_bias[q_bias_ves[start:stop]] = q_bias.reshape(out_shape)
+        tag_ww[ww_ves[start:stop]] = ww.reshape(out_shape)
 
 
 def magic(meshtally, tag_name, tag_name_error, **kwargs):
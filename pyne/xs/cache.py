@@ -1,16 +1,19 @@
 """This module provides a cross section cache which automatically extracts 
 cross-sections from provided nuclear data sets."""
+import os
 import sys
 import inspect
+import hashlib
 from warnings import warn
 
 from itertools import product
-from collections import MutableMapping
+from collections import MutableMapping, OrderedDict
 
 import numpy as np
 import tables as tb
 
 from pyne import nucname
+from pyne import nuc_data
 from pyne.pyne_config import pyne_conf
 from pyne.xs.models import partial_energy_matrix, phi_g, same_arr_or_none
 from pyne.xs import data_source
@@ -29,6 +32,43 @@ def _valid_group_struct(E_g):
         E_g = E_g[::-1]
     return E_g
 
+def _spectrum_hash(*arrays):
+    """Hex digest identifying a group structure and flux spectrum pair, or
+    any other sequence of arrays."""
+    h = hashlib.sha1()
+    for arr in arrays:
+        if arr is None:
+            h.update(b'None;')
+        else:
+            h.update(np.ascontiguousarray(arr, dtype='f8').tobytes())
+            h.update(b';')
+    return h.hexdigest()
+
+def _sources_hash(data_sources):
+    """Hex digest identifying the classes of a sequence of data sources and
+    the nuc_data file they read from."""
+    names = ['{0}.{1}'.format(type(ds).__module__, type(ds).__name__)
+             for ds in data_sources]
+    try:
+        st = os.stat(nuc_data)
+        names.append('{0}:{1}:{2!r}'.format(nuc_data, st.st_size, st.st_mtime))
+    except (OSError, TypeError):
+        names.append(repr(nuc_data))
+    return hashlib.sha1(';'.join(names).encode()).hexdigest()
+
+def _source_spectra(data_sources):
+    """The source group structures and flux spectra of the data sources,
+    which the discretized cross sections depend on."""
+    arrays = []
+    for ds in data_sources:
+        arrays.append(getattr(ds, 'src_group_struct', None))
+        arrays.append(getattr(ds, 'src_phi_g', None))
+    return arrays
+
+def _disk_name(key):
+    """HDF5 node name for a (nuc, rx[, temp]) cache key."""
+    return 'x' + hashlib.sha1(repr(tuple(key)).encode()).hexdigest()
+
 
 ###############################################################################
 ### Set up a cross-section cache so the same data isn't loaded repetitively ###
@@ -41,6 +81,19 @@ class XSCache(MutableMapping):
     Normally this requires that some cross section data be built into nuc_data.
     A default instance of this class is provided (pyne.xs.cache.xs_cache).
 
+    Cross sections are stored under their (nuc, rx[, temp]) key together with
+    a hash of the group structure E_g and flux spectrum phi_g they were
+    computed for, and of the src_group_struct and src_phi_g of the data
+    sources. Changing any of these therefore hides, rather than discards,
+    previously computed values, and switching back to an earlier spectrum
+    finds them again. Source spectra must be replaced rather than modified in
+    place to be noticed. If maxsize is given, the in-memory tier holds at most
+    maxsize values and evicts the least recently used one first. If cache_file
+    is given, every computed value is also written to that HDF5 file, which is
+    consulted before the data sources and persists between sessions. Values in
+    the file are stored per list of data source classes, so caches with
+    different data_sources may share a file.
+
     Parameters
     ----------
     group_struct : array-like of floats, optional
@@ -52,6 +105,20 @@ class XSCache(MutableMapping):
         section data. Data from a source earlier in the sequence (eg, index 1)
         will take precednce over data later in the sequence (eg, index 5).
         If a class is given rather than an object, the class is instantiated.
+    maxsize : int or None, optional
+        Maximum number of cross sections held in memory, over all spectra.
+        None means unbounded.
+    cache_file : str, optional
+        Path to an HDF5 file used as a persistent second tier.
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups served from memory.
+    disk_hits : int
+        Number of lookups served from cache_file.
+    misses : int
+        Number of lookups computed from the data sources.
 
     """
 
@@ -60,16 +127,25 @@ class XSCache(MutableMapping):
                                data_source.OpenMCDataSource,
                                data_source.SimpleDataSource,
                                data_source.EAFDataSource,
-                               data_source.NullDataSource)):
+                               data_source.NullDataSource),
+                 maxsize=None, cache_file=None):
         self._cache = {}
+        self._lru = OrderedDict()
+        self.maxsize = maxsize
+        self.cache_file = cache_file
+        self._h5 = None
+        self.hits = self.disk_hits = self.misses = 0
         self.data_sources = []
         for ds in data_sources:
             if inspect.isclass(ds):
                 ds = ds(dst_group_struct=group_struct)
             if ds.exists:
                 self.data_sources.append(ds)
+        self._sources = _sources_hash(self.data_sources)
         self._cache['E_g'] = _valid_group_struct(group_struct)
         self._cache['phi_g'] = None
+        self._spectrum = _spectrum_hash(self._cache['E_g'], None)
+        self._state_memo = None
         self._scalars = {} if scalars is None else scalars
 
     #
@@ -77,16 +153,28 @@ class XSCache(MutableMapping):
     #
 
     def __len__(self):
-        return len(self._cache)
+        state = self._state()
+        return len(self._cache) + sum(1 for k in self._lru
+                                      if k[0] == state)
 
     def __iter__(self):
-        return iter(self._cache)
+        state = self._state()
+        for key in self._cache:
+            yield key
+        for k in list(self._lru):
+            if k[0] == state:
+                yield k[1:]
 
     def __contains__(self, key):
-        return (key in self._cache)
+        if isinstance(key, basestring):
+            return (key in self._cache)
+        return ((self._state(),) + tuple(key)) in self._lru
 
     def __delitem__(self, key):
-        del self._cache[key]
+        if isinstance(key, basestring):
+            del self._cache[key]
+        else:
+            del self._lru[(self._state(),) + tuple(key)]
 
     #
     # Explicit overrides
@@ -94,39 +182,107 @@ class XSCache(MutableMapping):
 
     def __getitem__(self, key):
         """Key lookup by via custom loading from the nuc_data database file."""
+        if isinstance(key, basestring):
+            return self._cache[key]
         kw = dict(zip(['nuc', 'rx', 'temp'], key))
         scalar = self._scalars.get(kw['nuc'], None)
-        if (key not in self._cache) and not isinstance(key, basestring):
-            E_g = self._cache['E_g']
-            if E_g is None:
-                for ds in self.data_sources:
-                    xsdata = ds.reaction(*key)
-                    if xsdata is not None:
-                        self._cache[key] = xsdata
-                        break
+        lru_key = (self._state(),) + tuple(key)
+        if lru_key in self._lru:
+            self.hits += 1
+            xsdata = self._lru.pop(lru_key)
+        else:
+            xsdata = self._disk_get(lru_key)
+            if xsdata is not None:
+                self.disk_hits += 1
             else:
-                kw['dst_phi_g'] = self._cache['phi_g']
-                for ds in self.data_sources:
-                    xsdata = ds.discretize(**kw)
-                    if xsdata is not None:
-                        self._cache[key] = xsdata
-                        break        
-                else:
-                    raise KeyError
+                xsdata = self._compute(key, kw)
+                self.misses += 1
+                self._disk_set(lru_key, xsdata)
+        self._insert(lru_key, xsdata)
         # Return the value requested
         if scalar is None:
-            return self._cache[key]
+            return xsdata
+        else:
+            return xsdata * scalar
+
+    def _compute(self, key, kw):
+        """Pulls the cross section for key from the first data source that
+        has it, discretized to the current E_g and phi_g if E_g is set.
+        """
+        E_g = self._cache['E_g']
+        if E_g is None:
+            for ds in self.data_sources:
+                xsdata = ds.reaction(*key)
+                if xsdata is not None:
+                    return xsdata
         else:
-            return self._cache[key] * scalar
+            kw['dst_phi_g'] = self._cache['phi_g']
+            for ds in self.data_sources:
+                xsdata = ds.discretize(**kw)
+                if xsdata is not None:
+                    return xsdata
+        raise KeyError(key)
+
+    def _insert(self, lru_key, value):
+        """Stores a value as the most recently used one, evicting the least
+        recently used values beyond maxsize."""
+        self._lru.pop(lru_key, None)
+        self._lru[lru_key] = value
+        if self.maxsize is not None:
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
 
+    def _state(self):
+        """Hex digest of the current spectrum and the source spectra of the
+        data sources, which together determine the cached values. This is
+        recomputed only when one of them has been replaced."""
+        arrays = _source_spectra(self.data_sources)
+        memo = self._state_memo
+        if memo is not None and memo[0] == self._spectrum and \
+           len(memo[1]) == len(arrays) and \
+           all(a is b for a, b in zip(memo[1], arrays)):
+            return memo[2]
+        state = hashlib.sha1((self._spectrum +
+                              _spectrum_hash(*arrays)).encode()).hexdigest()
+        # the arrays stay referenced so that their ids are not reused
+        self._state_memo = (self._spectrum, arrays, state)
+        return state
+
+    def _disk(self):
+        if self._h5 is None and self.cache_file is not None:
+            self._h5 = tb.open_file(self.cache_file, 'a')
+        return self._h5
+
+    def _disk_group(self, lru_key):
+        """HDF5 group holding the values for the data sources and spectrum
+        of lru_key."""
+        return '/s{0}_{1}'.format(self._sources, lru_key[0])
+
+    def _disk_get(self, lru_key):
+        h5 = self._disk()
+        if h5 is None:
+            return None
+        path = '{0}/{1}'.format(self._disk_group(lru_key),
+                                _disk_name(lru_key[1:]))
+        if path not in h5:
+            return None
+        return h5.get_node(path).read()
+
+    def _disk_set(self, lru_key, value):
+        h5 = self._disk()
+        if h5 is None:
+            return
+        group = self._disk_group(lru_key)
+        if group not in h5:
+            h5.create_group('/', group[1:])
+        h5.create_array(group, _disk_name(lru_key[1:]), obj=np.asarray(value))
+        h5.flush()
 
     def __setitem__(self, key, value):
         """Key setting via custom cache functionality."""
         # Set the E_g
         if (key == 'E_g'):
             value = _valid_group_struct(value)
-            cache_value = self._cache['E_g']
-            self.clear()
             self._cache['phi_g'] = None
             for ds in self.data_sources:
                 ds.dst_group_struct = value
@@ -136,19 +292,30 @@ class XSCache(MutableMapping):
             if same_arr_or_none(value, cache_value):
                 return
             E_g = self._cache['E_g']
-            if len(value) + 1 == len(E_g):
-                self.clear()
-            else:
+            if len(value) + 1 != len(E_g):
                 raise ValueError("phi_g does not match existing group structure E_g!")
+        elif not isinstance(key, basestring):
+            self._insert((self._state(),) + tuple(key), value)
+            return
         # Set the value normally
         self._cache[key] = value
+        if key in ('E_g', 'phi_g'):
+            self._spectrum = _spectrum_hash(self._cache['E_g'],
+                                            self._cache['phi_g'])
 
     def clear(self):
-        """Clears the cache, retaining E_g and phi_g."""
+        """Clears the in-memory cross sections for all spectra, retaining E_g
+        and phi_g. The cache_file, if any, is left untouched."""
         E_g, phi_g = self._cache['E_g'], self._cache['phi_g'] 
         self._cache.clear()
+        self._lru.clear()
         self._cache['E_g'], self._cache['phi_g'] = E_g, phi_g
 
+    def close(self):
+        """Closes the cache_file, if it is open."""
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
 
     def load(self, temp=300.0):
         """Loads the cross sections from all data sources."""
@@ -505,3 +505,167 @@ def sigma_t(nuc, temp=300.0, group_struct=None, phi_g=None, xs_cache=None):
     return sig_t_g
 
 
+def _material_list(materials):
+    """Returns the materials of a sequence, a mapping such as a
+    MaterialLibrary (in the order of its keys), or a Mesh (in volume element
+    order) as a list.
+    """
+    if isinstance(materials, Material):
+        return [materials]
+    if hasattr(materials, 'mats') and hasattr(materials, 'iter_ve'):
+        return [materials.mats[i] for i in range(len(materials))]
+    if isinstance(materials, collections.Mapping):
+        return [materials[key] for key in materials.keys()]
+    return list(materials)
+
+
+class XSEngine(object):
+    """Computes cross sections for many materials at once. The cross sections
+    of a fixed set of nuclides are pulled from the cross section cache once per
+    channel into dense (nuclides x groups) matrices, so that the cross sections
+    of any number of materials reduce to a single sparse (materials x nuclides)
+    by (nuclides x groups) matrix product per channel.
+
+    Parameters
+    ----------
+    nucs : sequence of ints or strs, or materials
+        The nuclides the engine can handle. If materials are given (any type
+        accepted by macro_xs()), the union of their nuclides is used.
+    channels : sequence of str or functions, or mapping, optional
+        The channel functions of this module to tabulate, e.g. sigma_t or
+        'sigma_a'. Channels needing extra arguments, such as
+        sigma_a_reaction, may be given as a mapping from names to functions
+        of a single nuclide, e.g. functools.partial objects.
+    temp : float, optional
+        Temperature [K] of the materials, defaults to 300.0.
+    group_struct : array-like of floats, optional
+        Energy group structure E_g [MeV] from highest-to-lowest energy, length G+1,
+        defaults to xs_cache['E_g'].
+    phi_g : array-like of floats, optional
+        Group fluxes [n/cm^2/s] matching group_struct, length G, defaults to
+        xs_cache['phi_g'].
+    xs_cache : XSCache, optional
+        Cross section cache to use, defaults to pyne.xs.cache.xs_cache.
+
+    Attributes
+    ----------
+    nucs : list of ints
+        The nuclide ids, in the order of the rows of the matrices.
+    micro : dict of ndarrays
+        Maps channel names to the microscopic cross sections [barns] of each
+        nuclide, with shape (len(nucs),) + the shape of the channel.
+
+    Examples
+    --------
+    Tagging the macroscopic total cross section of every mesh volume element::
+
+        engine = XSEngine(mesh, channels=['sigma_t'], group_struct=E_g)
+        sig_t = engine.macro_xs(mesh)['sigma_t']
+        mesh.tag('sigma_t', value=sig_t, tagtype='imesh', size=sig_t.shape[1])
+
+    """
+
+    def __init__(self, nucs, channels=('sigma_t',), temp=300.0,
+                 group_struct=None, phi_g=None, xs_cache=None):
+        xs_cache = cache.xs_cache if xs_cache is None else xs_cache
+        _prep_cache(xs_cache, group_struct, phi_g)
+        if not isinstance(nucs, (Material, collections.Mapping)) and \
+           not hasattr(nucs, 'iter_ve'):
+            nucs = list(nucs)
+        if isinstance(nucs, (Material, collections.Mapping)) or \
+           hasattr(nucs, 'iter_ve') or \
+           (len(nucs) > 0 and isinstance(next(iter(nucs)), Material)):
+            nucs = set().union(*[mat.comp.keys() for mat in
+                                 _material_list(nucs)])
+        self.nucs = sorted(set(nucname.id(nuc) for nuc in nucs))
+        self._idx = dict((nuc, i) for i, nuc in enumerate(self.nucs))
+
+        if isinstance(channels, collections.Mapping):
+            channels = list(channels.items())
+        else:
+            mod = sys.modules[__name__]
+            channels = [(chan, getattr(mod, chan)) if isinstance(chan, basestring)
+                        else (chan.__name__, chan) for chan in channels]
+        self.micro = {}
+        for name, chanfunc in channels:
+            self.micro[name] = np.array([chanfunc(nuc, temp=temp,
+                                                  xs_cache=xs_cache)
+                                         for nuc in self.nucs], dtype='f8')
+
+    def _matrix(self, comps):
+        """Sparse (materials x nuclides) matrix of the values of a sequence of
+        nuclide mappings.
+        """
+        import scipy.sparse as sp
+        indptr = np.cumsum([0] + [len(comp) for comp in comps])
+        indices = np.empty(indptr[-1], dtype=np.int64)
+        values = np.empty(indptr[-1], dtype='f8')
+        for m, comp in enumerate(comps):
+            try:
+                indices[indptr[m]:indptr[m+1]] = [self._idx[nuc] for nuc in comp]
+            except KeyError as e:
+                raise KeyError("nuclide {0} is not in the XSEngine nuclide "
+                               "set".format(e.args[0]))
+            values[indptr[m]:indptr[m+1]] = list(comp.values())
+        return sp.csr_matrix((values, indices, indptr),
+                             shape=(len(comps), len(self.nucs)))
+
+    def _apply(self, A, channels):
+        channels = sorted(self.micro) if channels is None else channels
+        xs = {}
+        for name in channels:
+            micro = self.micro[name]
+            res = A.dot(micro.reshape(len(self.nucs), -1))
+            xs[name] = np.asarray(res).reshape((A.shape[0],) + micro.shape[1:])
+        return xs
+
+    def macro_xs(self, materials, channels=None):
+        """Computes the macroscopic cross sections of many materials.
+
+        Parameters
+        ----------
+        materials : Material, sequence or mapping of Materials, or Mesh
+            The materials. For a mapping, such as a MaterialLibrary, the
+            results are in the order of its keys, for a Mesh they are in
+            volume element order. The densities of the materials must be set.
+        channels : sequence of str, optional
+            Names of the channels to compute, defaults to all of them.
+
+        Returns
+        -------
+        xs : dict of ndarrays
+            Maps channel names to the macroscopic cross sections [1/cm] of each
+            material, with shape (len(materials),) + the shape of the channel.
+
+        """
+        comps = [dict(mat.to_atom_dens()) for mat in _material_list(materials)]
+        # atom densities are in [1/cm^3], cross sections in [barn]
+        A = self._matrix(comps) * 1e-24
+        return self._apply(A, channels)
+
+    def micro_xs(self, materials, channels=None):
+        """Computes the atom fraction weighted microscopic cross sections of
+        many materials, as the channel functions do for a single material.
+
+        Parameters
+        ----------
+        materials : Material, sequence or mapping of Materials, or Mesh
+            The materials, see macro_xs().
+        channels : sequence of str, optional
+            Names of the channels to compute, defaults to all of them.
+
+        Returns
+        -------
+        xs : dict of ndarrays
+            Maps channel names to the cross sections [barn] of each material,
+            with shape (len(materials),) + the shape of the channel.
+
+        """
+        import scipy.sparse as sp
+        comps = [dict(mat.to_atom_frac()) for mat in _material_list(materials)]
+        A = self._matrix(comps)
+        # re-normalize each row, as _atom_mass_channel does
+        totals = np.asarray(A.sum(axis=1)).ravel()
+        totals[totals == 0.0] = 1.0
+        A = sp.diags(1.0 / totals, 0).dot(A)
+        return self._apply(A, channels)
@@ -1076,34 +1076,82 @@ const std::pair<int, double>& rhs) const {
       lhs.first<rhs.first);
 }
 
+template<typename U> pyne::energy_index<U>& pyne::get_energy_index(
+std::map<std::pair<int, double>, U> &data) {
+  static std::map<const void*, energy_index<U> > indices;
+  energy_index<U>& index = indices[&data];
+  if (index.values.size() != data.size()) {
+    typename std::map<std::pair<int, double>, U>::iterator it;
+    std::map<std::pair<int, double>, const U*, swapmapcompare> sorted;
+    for (it = data.begin(); it != data.end(); ++it)
+      sorted[it->first] = &(it->second);
+    typename std::map<std::pair<int, double>, const U*,
+      swapmapcompare>::iterator sit;
+    index.energies.clear();
+    index.values.clear();
+    index.energies.reserve(sorted.size());
+    index.values.reserve(sorted.size());
+    for (sit = sorted.begin(); sit != sorted.end(); ++sit) {
+      index.energies.push_back(sit->first.second);
+      index.values.push_back(sit->second);
+    }
+  }
+  return index;
+}
+
 template<typename T, typename U> std::vector<T> pyne::data_access(
 double energy_min, double energy_max, size_t valoffset, std::map<std::pair<int,
 double>, U>  &data) {
-  typename std::map<std::pair<int, double>, U, swapmapcompare>::iterator
-    nuc_iter, nuc_end, it;
-  std::map<std::pair<int, double>, U, swapmapcompare> dc(data.begin(),
-    data.end());
-  std::vector<T> result;
+  // Fill up the map with values from the nuc_data.h5, if the map is empty.
+  if (data.empty())
+  {
+    _load_data<U>();
+    if (data.empty())
+      return std::vector<T>();
+  }
   if (energy_max < energy_min){
     double temp = energy_max;
     energy_max = energy_min;
     energy_min = temp;
   }
-  nuc_iter = dc.lower_bound(std::make_pair(0, energy_min));
-  nuc_end = dc.upper_bound(std::make_pair(9999999999, energy_max));
-  T *ret;
-  // First check if we already have the nuc in the map
-  for (it = nuc_iter; it!= nuc_end; ++it){
-    ret = (T *)((char *)&(it->second) + valoffset);
-    result.push_back(*ret);
-  }
-  // Next, fill up the map with values from the
-  // nuc_data.h5, if the map is empty.
-  if (data.empty())
-  {
-    _load_data<U>();
-    return data_access<T, U>(energy_min, energy_max, valoffset, data);
+  energy_index<U>& index = get_energy_index(data);
+  std::vector<double>::iterator first = std::lower_bound(
+    index.energies.begin(), index.energies.end(), energy_min);
+  std::vector<double>::iterator last = std::upper_bound(first,
+    index.energies.end(), energy_max);
+  size_t lo = first - index.energies.begin();
+  size_t hi = last - index.energies.begin();
+  std::vector<T> result;
+  result.reserve(hi - lo);
+  for (size_t i = lo; i < hi; ++i)
+    result.push_back(*(T *)((char *)index.values[i] + valoffset));
+  return result;
+}
+
+/// Converts energies and errors into the windows [energy - error,
+/// energy + error] used by the batched decay line queries.
+static void _energy_windows(const std::vector<double>& energy,
+const std::vector<double>& error, std::vector<double>& emin,
+std::vector<double>& emax) {
+  if (energy.size() != error.size())
+    throw std::invalid_argument("energy and error must have the same size");
+  emin.resize(energy.size());
+  emax.resize(energy.size());
+  for (int i = 0; i < energy.size(); ++i) {
+    emin[i] = energy[i] - error[i];
+    emax[i] = energy[i] + error[i];
   }
+}
+
+template<typename T, typename U> std::vector<std::vector<T> >
+pyne::data_access(std::vector<double> energy_min,
+std::vector<double> energy_max, size_t valoffset,
+std::map<std::pair<int, double>, U>  &data) {
+  std::vector<std::vector<T> > result;
+  result.reserve(energy_min.size());
+  for (int i = 0; i < energy_min.size(); ++i)
+    result.push_back(data_access<T, U>(energy_min[i], energy_max[i],
+      valoffset, data));
   return result;
 }
 
@@ -1569,6 +1617,39 @@ double pyne::state_energy(std::string nuc)
 // Decay constant data
 //
 
+const pyne::decay_graph& pyne::get_decay_graph() {
+  static decay_graph graph;
+  static bool built = false;
+  if (built)
+    return graph;
+
+  if (level_data_lvl_map.empty())
+    _load_data<level_data>();
+  std::set<int> nucs;
+  std::map<std::pair<int, double>, level_data>::iterator lvl;
+  for (lvl = level_data_lvl_map.begin(); lvl != level_data_lvl_map.end(); ++lvl)
+    nucs.insert(lvl->second.nuc_id);
+  std::map<std::pair<int, unsigned int>, level_data>::iterator rx;
+  for (rx = level_data_rx_map.begin(); rx != level_data_rx_map.end(); ++rx)
+    nucs.insert(rx->first.first);
+
+  graph.indptr.push_back(0);
+  for (std::set<int>::iterator nuc = nucs.begin(); nuc != nucs.end(); ++nuc) {
+    graph.nucs.push_back(*nuc);
+    graph.decay_consts.push_back(decay_const(*nuc));
+    std::set<int> children = decay_children(*nuc);
+    for (std::set<int>::iterator child = children.begin();
+         child != children.end(); ++child) {
+      graph.children.push_back(*child);
+      graph.branch_ratios.push_back(branch_ratio(std::make_pair(*nuc,
+                                                                *child)));
+    }
+    graph.indptr.push_back(graph.children.size());
+  }
+  built = true;
+  return graph;
+}
+
 double pyne::decay_const(int nuc)
 {
     std::vector<double> result = data_access<double, level_data>(nuc, 0.0,
@@ -2009,11 +2090,27 @@ std::vector<int> pyne::gamma_parent(double energy, double error) {
     offsetof(gamma, parent_nuc), gamma_data);
 }
 
+std::vector<std::vector<int> > pyne::gamma_parent(std::vector<double> energy,
+std::vector<double> error) {
+  std::vector<double> emin, emax;
+  _energy_windows(energy, error, emin, emax);
+  return data_access<int, gamma>(emin, emax, offsetof(gamma, parent_nuc),
+    gamma_data);
+}
+
 std::vector<int> pyne::gamma_child(double energy, double error) {
   return data_access<int, gamma>(energy+error, energy-error,
   offsetof(gamma, child_nuc), gamma_data);
 }
 
+std::vector<std::vector<int> > pyne::gamma_child(std::vector<double> energy,
+std::vector<double> error) {
+  std::vector<double> emin, emax;
+  _energy_windows(energy, error, emin, emax);
+  return data_access<int, gamma>(emin, emax, offsetof(gamma, child_nuc),
+    gamma_data);
+}
+
 std::vector<int> pyne::gamma_child(int parent) {
   return data_access<int, gamma>(parent, 0.0, DBL_MAX,
   offsetof(gamma, child_nuc), gamma_data);
@@ -2209,6 +2306,14 @@ std::vector<int> pyne::beta_parent(double energy, double error) {
                      offsetof(beta, from_nuc), beta_data);
 }
 
+std::vector<std::vector<int> > pyne::beta_parent(std::vector<double> energy,
+std::vector<double> error) {
+  std::vector<double> emin, emax;
+  _energy_windows(energy, error, emin, emax);
+  return data_access<int, beta>(emin, emax, offsetof(beta, from_nuc),
+    beta_data);
+}
+
 std::vector<int> pyne::beta_child(double energy, double error) {
   return data_access<int, beta>(energy+error, energy-error,
                      offsetof(beta, to_nuc), beta_data);
@@ -2495,6 +2600,42 @@ std::vector<std::pair<double, double> > pyne::xrays(int parent) {
   return result;
 }
 
+void pyne::merge_photon_lines(std::vector<std::pair<double, double> > lines,
+                              line_spectrum& merged) {
+  // drop NaN lines first, they have no strict weak ordering
+  int n = 0;
+  for (int i = 0; i < lines.size(); ++i) {
+    if (!isnan(lines[i].first) && !isnan(lines[i].second))
+      lines[n++] = lines[i];
+  }
+  lines.resize(n);
+  std::sort(lines.begin(), lines.end());
+  merged.energies.clear();
+  merged.intensities.clear();
+  for (int i = 0; i < lines.size(); ++i) {
+    if (!merged.energies.empty() && merged.energies.back() == lines[i].first)
+      merged.intensities.back() += lines[i].second;
+    else {
+      merged.energies.push_back(lines[i].first);
+      merged.intensities.push_back(lines[i].second);
+    }
+  }
+}
+
+const pyne::line_spectrum& pyne::merged_photons(int parent_state_id) {
+  static std::map<int, line_spectrum> cache;
+  std::map<int, line_spectrum>::iterator it = cache.find(parent_state_id);
+  if (it != cache.end())
+    return it->second;
+
+  std::vector<std::pair<double, double> > lines = gammas(parent_state_id);
+  std::vector<std::pair<double, double> > xray_lines = xrays(parent_state_id);
+  lines.insert(lines.end(), xray_lines.begin(), xray_lines.end());
+  line_spectrum& merged = cache[parent_state_id];
+  merge_photon_lines(lines, merged);
+  return merged;
+}
+
 //////////////////////////////////////////
 //////////// simple xs data //////////////
 //////////////////////////////////////////
@@ -10,6 +10,9 @@
 #include <utility>
 #include <map>
 #include <set>
+#include <vector>
+#include <algorithm>
+#include <stdexcept>
 #include <limits>
 #include <exception>
 #include <stdlib.h>
@@ -319,11 +322,31 @@ namespace pyne
                         const std::pair<int, double>& rhs) const;
   };
 
+  /// Energy sorted view of a std::map<std::pair<int, double>, U>. Values
+  /// are ordered as by swapmapcompare, so that all entries within an energy
+  /// window can be located by binary search.
+  template<typename U> class energy_index{
+    public:
+      std::vector<double> energies;  ///< second members of the keys, sorted
+      std::vector<const U*> values;  ///< map values in the same order
+  };
+
+  /// Returns the energy index of a map. The index is built on first use
+  /// and rebuilt only if the number of entries in the map has changed.
+  template<typename U> energy_index<U>& get_energy_index(
+    std::map<std::pair<int, double>, U> &data);
+
   /// Access data in a std::map<std::pair<int, double> for a range of
   /// values of the second member of the pair. Returns a vector of all
   /// values at valoffset of class U of type T f
   template<typename T, typename U> std::vector<T> data_access(double emin,
     double emax, size_t valoffset, std::map<std::pair<int, double>, U>  &data);
+  /// Access data in a std::map<std::pair<int, double> for many ranges of
+  /// values of the second member of the pair. Returns one vector of the
+  /// values at valoffset of class U of type T per range.
+  template<typename T, typename U> std::vector<std::vector<T> > data_access(
+    std::vector<double> emin, std::vector<double> emax, size_t valoffset,
+    std::map<std::pair<int, double>, U>  &data);
   /// Access data in a std::map<std::pair<int, double> for a given
   /// value of the first member of the pair. Returns a vector of all
   /// values at valoffset of class U of type T
@@ -479,6 +502,24 @@ namespace pyne
   /// Returns the decay constant for a nuclide \a nuc.
   std::set<int> decay_children(std::string nuc);
 
+  /// Decay data of all nuclides in compressed sparse row form. The children
+  /// of nucs[i], and the branch ratios to them, are stored in
+  /// children[indptr[i]:indptr[i+1]] and branch_ratios[indptr[i]:indptr[i+1]].
+  /// All nuclides are in state id form and nucs is sorted.
+  typedef struct decay_graph{
+    std::vector<int> nucs; ///< nuclides with level data
+    std::vector<double> decay_consts; ///< decay constants of nucs [1/s]
+    std::vector<int> indptr; ///< offsets of each nuclide's children
+    std::vector<int> children; ///< decay children
+    std::vector<double> branch_ratios; ///< branch ratios [fraction]
+  } decay_graph;
+
+  /// \brief Returns the decay graph of all nuclides in the level data.
+  ///
+  /// The graph is built from decay_const(), decay_children() and
+  /// branch_ratio() the first time it is requested and reused afterwards.
+  const decay_graph& get_decay_graph();
+
   /// a struct matching the '/decay/decays' table in nuc_data.h5.
   typedef struct decay{
     int parent; ///< state id of decay parent
@@ -561,8 +602,14 @@ namespace pyne
   std::vector<std::pair<int, int> > gamma_parent_child(double energy, double error);
   //returns a list of parent nuclides associated with an input decay energy
   std::vector<int> gamma_parent(double energy, double error);
+  //returns a list of parent nuclides for each of many decay energies
+  std::vector<std::vector<int> > gamma_parent(std::vector<double> energy,
+    std::vector<double> error);
   // returns a list of child state_id's based on a gamma-ray energy
   std::vector<int> gamma_child(double energy, double error);
+  // returns a list of child state_id's for each of many gamma-ray energies
+  std::vector<std::vector<int> > gamma_child(std::vector<double> energy,
+    std::vector<double> error);
   // returns a list of child state_id's based on a parent state_id
   std::vector<int> gamma_child(int parent);
   //returns an array of arrays of X-ray energies and intesities for a
@@ -575,6 +622,27 @@ namespace pyne
   std::vector<std::pair<double, double> > betas(int parent_state_id);
   std::vector<std::pair<double, double> > xrays(int parent);
 
+  /// Photon lines as contiguous arrays of energies and intensities.
+  typedef struct line_spectrum{
+    std::vector<double> energies; ///< line energies [keV], ascending
+    std::vector<double> intensities; ///< line intensities
+  } line_spectrum;
+
+  /// \brief Sorts photon lines by energy and sums the intensities of lines
+  ///        with equal energies. Lines with a NaN energy or intensity are
+  ///        dropped.
+  /// \param lines (energy, intensity) pairs in any order.
+  /// \param merged The merged lines are written here.
+  void merge_photon_lines(std::vector<std::pair<double, double> > lines,
+                          line_spectrum& merged);
+
+  /// \brief Returns the merged gammas() and xrays() of a nuclide in
+  ///        decays/s/atom.
+  ///
+  /// The lines of each nuclide are computed the first time they are
+  /// requested and reused afterwards.
+  const line_spectrum& merged_photons(int parent_state_id);
+
   /// a struct matching the '/decay/alphas' table in nuc_data.h5.
   typedef struct alpha{
     int from_nuc; ///< state id of parent nuclide
@@ -622,6 +690,9 @@ namespace pyne
   std::vector<double> beta_intensity(int parent);
   //returns a list of beta decay parents from input decay energy range
   std::vector<int> beta_parent(double energy, double error);
+  //returns a list of beta decay parents for each of many decay energy ranges
+  std::vector<std::vector<int> > beta_parent(std::vector<double> energy,
+    std::vector<double> error);
   //returns a list of beta decay children from input decay energy range
   std::vector<int> beta_child(double energy, double error);
   //returns a list of beta decay children from input parent nuclide
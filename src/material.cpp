@@ -2,6 +2,7 @@
 // The very central Material class
 // -- Anthony Scopatz
 
+#include <algorithm>
 #include <string>
 #include <vector>
 #include <iomanip>  // std::setprecision
@@ -1654,17 +1655,17 @@ std::map<int, double> pyne::Material::to_atom_dens() {
 }
 
 
+// state id of a nuclide in the composition, for decay data lookups
+static int decay_state_id(int nuc) {
+  return nuc % 10000 > 0 ? pyne::nucname::id_to_state_id(nuc) : nuc;
+}
+
 std::vector<std::pair<double, double> > pyne::Material::gammas() {
   std::vector<std::pair<double, double> > result;
   std::map<int, double> atom_fracs = this->to_atom_frac();
-  int state_id;
   for (comp_iter ci = comp.begin(); ci != comp.end(); ci++) {
-    if (ci->first % 10000 > 0)
-        state_id = nucname::id_to_state_id(ci->first);
-    else
-        state_id = ci->first;
-
-    std::vector<std::pair<double, double> > raw_gammas = pyne::gammas(state_id);
+    std::vector<std::pair<double, double> > raw_gammas =
+      pyne::gammas(decay_state_id(ci->first));
     for (int i = 0; i < raw_gammas.size(); ++i) {
       result.push_back(std::make_pair(raw_gammas[i].first,
         atom_fracs[ci->first]*raw_gammas[i].second));
@@ -1676,14 +1677,9 @@ std::vector<std::pair<double, double> > pyne::Material::gammas() {
 std::vector<std::pair<double, double> > pyne::Material::xrays() {
   std::vector<std::pair<double, double> > result;
   std::map<int, double> atom_fracs = this->to_atom_frac();
-  int state_id;
   for (comp_iter ci = comp.begin(); ci != comp.end(); ci++) {
-    if (ci->first % 10000 > 0)
-        state_id = nucname::id_to_state_id(ci->first);
-    else
-        state_id = ci->first;
-
-    std::vector<std::pair<double, double> > raw_xrays = pyne::xrays(state_id);
+    std::vector<std::pair<double, double> > raw_xrays =
+      pyne::xrays(decay_state_id(ci->first));
     for (int i = 0; i < raw_xrays.size(); ++i) {
       result.push_back(std::make_pair(raw_xrays[i].first,
         atom_fracs[ci->first]*raw_xrays[i].second));
@@ -1719,6 +1715,60 @@ std::vector<std::pair<double, double> > unnormed) {
   return normed;
 }
 
+std::vector<std::pair<double, double> > pyne::Material::photon_lines(
+    bool norm) {
+  std::vector<std::pair<double, double> > lines;
+  std::map<int, double> atom_fracs = this->to_atom_frac();
+  for (comp_iter ci = atom_fracs.begin(); ci != atom_fracs.end(); ci++) {
+    const pyne::line_spectrum& nuc_lines =
+      pyne::merged_photons(decay_state_id(ci->first));
+    for (int i = 0; i < nuc_lines.energies.size(); ++i)
+      lines.push_back(std::make_pair(nuc_lines.energies[i],
+                                     ci->second*nuc_lines.intensities[i]));
+  }
+  pyne::line_spectrum merged;
+  pyne::merge_photon_lines(lines, merged);
+  double sum = 0.0;
+  if (norm) {
+    for (int i = 0; i < merged.intensities.size(); ++i)
+      sum += merged.intensities[i];
+  }
+  norm = norm && sum > 0.0;
+  std::vector<std::pair<double, double> > result;
+  result.reserve(merged.energies.size());
+  for (int i = 0; i < merged.energies.size(); ++i)
+    result.push_back(std::make_pair(merged.energies[i], norm ?
+      merged.intensities[i]/sum : merged.intensities[i]));
+  return result;
+}
+
+std::vector<double> pyne::Material::photon_spectrum(
+    std::vector<double> e_bounds, bool norm) {
+  int num_groups = e_bounds.size() > 0 ? e_bounds.size() - 1 : 0;
+  std::vector<double> spectrum(num_groups, 0.0);
+  double total = 0.0;
+  std::map<int, double> atom_fracs = this->to_atom_frac();
+  for (comp_iter ci = atom_fracs.begin(); ci != atom_fracs.end(); ci++) {
+    const pyne::line_spectrum& nuc_lines =
+      pyne::merged_photons(decay_state_id(ci->first));
+    for (int i = 0; i < nuc_lines.energies.size(); ++i) {
+      double e = nuc_lines.energies[i];
+      double intensity = ci->second*nuc_lines.intensities[i];
+      total += intensity;
+      if (num_groups == 0 || e < e_bounds.front() || e > e_bounds.back())
+        continue;
+      int g = std::upper_bound(e_bounds.begin(), e_bounds.end(), e) -
+              e_bounds.begin() - 1;
+      spectrum[std::min(g, num_groups - 1)] += intensity;
+    }
+  }
+  if (norm && total > 0.0) {
+    for (int g = 0; g < num_groups; ++g)
+      spectrum[g] /= total;
+  }
+  return spectrum;
+}
+
 
 pyne::Material pyne::Material::decay(double t) {
   Material rtn;
@@ -341,6 +341,18 @@ namespace pyne
     /// so the sum of the intensities is one
     std::vector<std::pair<double, double> > normalize_radioactivity(
       std::vector<std::pair<double, double> > unnormed);
+    /// Returns the photon lines of the material, energies in keV and
+    /// intensities in decays/s/atom material, sorted by energy with the
+    /// intensities of lines at equal energies summed. If \a norm is true the
+    /// intensities sum to one.
+    std::vector<std::pair<double, double> > photon_lines(bool norm=false);
+    /// Returns the photon intensities of the material in decays/s/atom
+    /// material binned into the energy groups with bounds \a e_bounds [keV],
+    /// in ascending order. Lines are binned into [e_bounds[g],
+    /// e_bounds[g+1]), with the last group closed. If \a norm is true the
+    /// intensities are divided by the total intensity of all lines.
+    std::vector<double> photon_spectrum(std::vector<double> e_bounds,
+                                        bool norm=false);
 
     /// Decays this material for a given amount of time in seconds
     Material decay(double t);
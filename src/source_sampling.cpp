@@ -41,14 +41,7 @@ void pyne::particle_birth_(double* rands,
                            double* e,
                            double* w,
                            int* c) {
-    std::vector<double> rands2(rands, rands + 6);
-    pyne::SourceParticle src = sampler->particle_birth(rands2);
-    *x = src.get_x();
-    *y = src.get_y();
-    *z = src.get_z();
-    *e = src.get_e();
-    *w = src.get_w();
-    *c = src.get_c();
+    sampler->particle_birth_many(1, rands, x, y, z, e, w, c);
 }
 
 std::vector<double> pyne::read_e_bounds(std::string e_bounds_file){
@@ -154,30 +147,94 @@ pyne::Sampler::Sampler(std::string filename,
 }
 
 pyne::SourceParticle pyne::Sampler::particle_birth(std::vector<double> rands) {
+  double x, y, z, e, w;
+  int c;
+  birth(&rands[0], x, y, z, e, w, c);
+  return SourceParticle(x, y, z, e, w, c);
+}
+
+void pyne::Sampler::particle_birth_many(int n, const double* rands, double* x,
+                                        double* y, double* z, double* e,
+                                        double* w, int* c, int num_threads) {
+  if (num_threads <= 1 || n < 2*num_threads) {
+    birth_range(0, n, rands, x, y, z, e, w, c);
+    return;
+  }
+  std::vector<std::thread> threads;
+  int chunk = (n + num_threads - 1) / num_threads;
+  for (int begin = 0; begin < n; begin += chunk)
+    threads.push_back(std::thread(&Sampler::birth_range, this, begin,
+                                  std::min(begin + chunk, n), rands, x, y, z,
+                                  e, w, c));
+  for (int i = 0; i < threads.size(); ++i)
+    threads[i].join();
+}
+
+void pyne::Sampler::particle_birth_many(int n, unsigned long seed, double* x,
+                                        double* y, double* z, double* e,
+                                        double* w, int* c, int num_threads) {
+  if (num_threads <= 1) {
+    birth_blocks(0, 1, n, seed, x, y, z, e, w, c);
+    return;
+  }
+  std::vector<std::thread> threads;
+  for (int i = 0; i < num_threads; ++i)
+    threads.push_back(std::thread(&Sampler::birth_blocks, this, i,
+                                  num_threads, n, seed, x, y, z, e, w, c));
+  for (int i = 0; i < threads.size(); ++i)
+    threads[i].join();
+}
+
+void pyne::Sampler::birth(const double* rands, double& x, double& y,
+                          double& z, double& e, double& w, int& c) {
   // select mesh volume and energy group
   // In DEFAULT mode, max_num_cells = 1
   int pdf_idx =at->sample_pdf(rands[0], rands[1]);
   int ve_idx = pdf_idx/max_num_cells/num_e_groups;
   int c_idx = (pdf_idx/num_e_groups)%max_num_cells;
   int e_idx = pdf_idx % num_e_groups;
-  int cell_id;
 
   // Sample uniformly within the selected mesh volume element and energy
   // group.
-  std::vector<double> xyz_rands;
-  xyz_rands.push_back(rands[2]);
-  xyz_rands.push_back(rands[3]);
-  xyz_rands.push_back(rands[4]);
-  moab::CartVect pos = sample_xyz(ve_idx, xyz_rands);
+  moab::CartVect pos = sample_xyz(ve_idx, rands[2], rands[3], rands[4]);
+  x = pos[0];
+  y = pos[1];
+  z = pos[2];
   // cell_number
   if (sub_mode == SUBVOXEL) {
-     cell_id = cell_number[ve_idx*max_num_cells + c_idx];
+     c = cell_number[ve_idx*max_num_cells + c_idx];
   } else {
-     cell_id = -1;
+     c = -1;
+  }
+  e = sample_e(e_idx, rands[5]);
+  w = sample_w(pdf_idx);
+}
+
+void pyne::Sampler::birth_range(int begin, int end, const double* rands,
+                                double* x, double* y, double* z, double* e,
+                                double* w, int* c) {
+  for (int i = begin; i < end; ++i)
+    birth(rands + 6*i, x[i], y[i], z[i], e[i], w[i], c[i]);
+}
+
+void pyne::Sampler::birth_blocks(int first_block, int block_step, int n,
+                                 unsigned long seed, double* x, double* y,
+                                 double* z, double* e, double* w, int* c) {
+  std::uniform_real_distribution<double> uniform(0.0, 1.0);
+  // uniform may return 1.0 due to rounding, which the sampling does not accept
+  const double below_one = std::nextafter(1.0, 0.0);
+  double rands[6];
+  for (int block = first_block; block*rng_block_size < n;
+       block += block_step) {
+    std::seed_seq seq = {(unsigned long) seed, (unsigned long) block};
+    std::mt19937_64 rng(seq);
+    int end = std::min((block + 1)*rng_block_size, n);
+    for (int i = block*rng_block_size; i < end; ++i) {
+      for (int j = 0; j < 6; ++j)
+        rands[j] = std::min(uniform(rng), below_one);
+      birth(rands, x[i], y[i], z[i], e[i], w[i], c[i]);
+    }
   }
-  pyne::SourceParticle src = SourceParticle(pos[0], pos[1], pos[2],
-      sample_e(e_idx, rands[5]), sample_w(pdf_idx), cell_id);
-  return src;
 }
 
 void pyne::Sampler::setup() {
@@ -457,9 +514,11 @@ std::vector<double> pyne::Sampler::read_bias_pdf(moab::Range ves,
 
 
 moab::CartVect pyne::Sampler::sample_xyz(int ve_idx, std::vector<double> rands) {
-  double s = rands[0];
-  double t = rands[1];
-  double u = rands[2];
+  return sample_xyz(ve_idx, rands[0], rands[1], rands[2]);
+}
+
+moab::CartVect pyne::Sampler::sample_xyz(int ve_idx, double s, double t,
+                                         double u) {
 
   // Transform s, t, u to uniformly sample a tetrahedron. See:
   // C. Rocchini and P. Cignoni, “Generating Random Points in a Tetrahedron,” 
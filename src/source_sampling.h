@@ -25,6 +25,8 @@
 #define PYNE_6OR6BJURKJHHTOFWXO2VMQM5EY
 
 #include <assert.h>
+#include <algorithm>
+#include <cmath>
 #include <iostream>
 #include <fstream>
 #include <stdio.h>
@@ -34,6 +36,8 @@
 #include <sstream>
 #include <string>
 #include <map>
+#include <random>
+#include <thread>
 
 #include "moab/Range.hpp"
 #include "moab/Core.hpp"
@@ -178,6 +182,34 @@ namespace pyne {
     /// \return A SourceParticle object containing the x position, y, position,
     ///         z, position, e, energy and w, weight of a particle.
     pyne::SourceParticle particle_birth(std::vector<double> rands);
+    /// Samples the birth parameters of many particles at once
+    /// \param n The number of particles to sample.
+    /// \param rands 6*n pseudo-random numbers in range [0, 1), six per
+    ///              particle in the order used by particle_birth.
+    /// \param x, y, z, e, w, c Preallocated arrays of length n, filled with
+    ///                        the positions, energies, weights and cell
+    ///                        numbers of the particles.
+    /// \param num_threads The number of threads to split the particles over.
+    void particle_birth_many(int n, const double* rands, double* x, double* y,
+                             double* z, double* e, double* w, int* c,
+                             int num_threads=1);
+    /// Samples the birth parameters of many particles at once, drawing the
+    /// pseudo-random numbers internally. Particles are sampled in blocks of
+    /// \a rng_block_size, each with its own Mersenne Twister stream seeded
+    /// from (seed, block number), so the result does not depend on the
+    /// number of threads.
+    /// \param n The number of particles to sample.
+    /// \param seed The seed of the random number streams.
+    /// \param x, y, z, e, w, c Preallocated arrays of length n, filled with
+    ///                        the positions, energies, weights and cell
+    ///                        numbers of the particles.
+    /// \param num_threads The number of threads to split the particles over.
+    void particle_birth_many(int n, unsigned long seed, double* x, double* y,
+                             double* z, double* e, double* w, int* c,
+                             int num_threads=1);
+    /// Number of particles sharing one random number stream in the seeded
+    /// particle_birth_many.
+    static const int rng_block_size = 65536;
 
     ~Sampler() {
       delete mesh;
@@ -218,6 +250,14 @@ namespace pyne {
     void mesh_tag_data(moab::Range ves, const std::vector<double> volumes);
     // select birth parameters
     moab::CartVect sample_xyz(int ve_idx, std::vector<double> rands);
+    moab::CartVect sample_xyz(int ve_idx, double s, double t, double u);
+    void birth(const double* rands, double& x, double& y, double& z,
+               double& e, double& w, int& c);
+    void birth_range(int begin, int end, const double* rands, double* x,
+                     double* y, double* z, double* e, double* w, int* c);
+    void birth_blocks(int first_block, int block_step, int n,
+                      unsigned long seed, double* x, double* y, double* z,
+                      double* e, double* w, int* c);
     double sample_e(int e_idx, double rand);
     double sample_w(int pdf_idx);
     // helper functions
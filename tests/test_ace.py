@@ -2,7 +2,8 @@
 from __future__ import unicode_literals
 import os
 
-from nose.tools import assert_equal, assert_in, assert_almost_equal
+from nose.tools import assert_equal, assert_in, assert_not_in, \
+    assert_almost_equal, assert_raises
 
 import pyne.ace
 
@@ -95,6 +96,34 @@ def test_read_c12_binary():
     assert_equal(table.reactions[2].sigma[0], 78.04874)
     assert_equal(table.reactions[2].sigma[-1], 1.00772)
 
+def test_read_c12_binary_lazy():
+    eager = pyne.ace.Library('C12-binary.ace')
+    eager.read()
+    etable = eager.tables['6000.00c']
+
+    c12 = pyne.ace.Library('C12-binary.ace')
+    c12.read(lazy=True)
+    table = c12.tables['6000.00c']
+
+    assert_equal(len(table.xss), len(etable.xss))
+    assert_equal(table.xss[0], 0.0)
+    assert_equal(table.xss[1:].tolist(), etable.xss[1:].tolist())
+    assert_equal(table.reactions[2].sigma[0], 78.04874)
+    assert_equal(table.reactions[2].sigma[-1], 1.00772)
+
+    # deferred blocks are read on first access
+    assert_in('angular', table._pending_blocks)
+    assert_equal(table.reactions[2].ang_energy_in.tolist(),
+                 etable.reactions[2].ang_energy_in.tolist())
+    assert_not_in('angular', table._pending_blocks)
+    assert_equal(len(table.photon_reactions), len(etable.photon_reactions))
+    assert_raises(AttributeError, getattr, table, 'not_an_attribute')
+
+    # misspelled attributes do not read deferred blocks
+    assert_raises(AttributeError, getattr, table, 'nu_typo')
+    assert_raises(AttributeError, getattr, table.reactions[2], 'ang_typo')
+    assert_in('nu', table._pending_blocks)
+
 def teardown():
     if os.path.exists('C12-binary.ace'):
         os.remove('C12-binary.ace')
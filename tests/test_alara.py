@@ -27,7 +27,8 @@ from pyne.mesh import Mesh, StatMesh, MeshError
 from pyne.material import Material
 from pyne.alara import mesh_to_fluxin, photon_source_to_hdf5, \
     photon_source_hdf5_to_mesh, mesh_to_geom, num_density_to_mesh, \
-    irradiation_blocks, record_to_geom, phtn_src_energy_bounds
+    irradiation_blocks, record_to_geom, phtn_src_energy_bounds, cram, \
+    CramSolver
 
 thisdir = os.path.dirname(__file__)
 
@@ -210,6 +211,21 @@ def test_photon_source_to_hdf5():
         os.remove(filename + '.h5')
 
 
+def test_photon_source_to_hdf5_indexes():
+    """Tests that the nuc and time columns are indexed on request."""
+    filename = os.path.join(thisdir, "files_test_alara", "phtn_src")
+    photon_source_to_hdf5(filename, chunkshape=(10,))
+    with tb.open_file(filename + '.h5') as h5f:
+        assert_true(h5f.root.data.cols.nuc.is_indexed)
+        assert_true(h5f.root.data.cols.time.is_indexed)
+    os.remove(filename + '.h5')
+
+    photon_source_to_hdf5(filename, chunkshape=(10,), create_indexes=False)
+    with tb.open_file(filename + '.h5') as h5f:
+        assert_true(not h5f.root.data.cols.nuc.is_indexed)
+    os.remove(filename + '.h5')
+
+
 def test_photon_source_hdf5_to_mesh():
     """Tests the function photon source_h5_to_mesh."""
 
@@ -644,3 +660,27 @@ def test_phtn_src_energy_bounds():
                          1.00E7, 1.20E7, 1.40E7, 2.00E7]
 
     assert_array_equal(e_bounds, expected_e_bounds)
+
+
+def test_cram_solver_batch():
+    nucs = ['Cs137', 'Ba137M', 'Ba137']
+    n_0 = np.array([[1.0, 0.5, 0.0],
+                    [0.0, 0.5, 0.0],
+                    [0.0, 0.0, 1.0]])
+    t = 3.15e7
+    for order in (14, 16):
+        solver = CramSolver(nucs, order=order)
+        obs = solver(n_0, t)
+        assert_equal(obs.shape, n_0.shape)
+        for v in range(n_0.shape[1]):
+            exp = cram(nucs, t, n_0[:, v], order)
+            for o, e in zip(obs[:, v], exp):
+                assert_almost_equal(o, e)
+        # single composition vectors are also supported
+        exp = cram(nucs, t, n_0[:, 0], order)
+        obs = solver(n_0[:, 0], t)
+        for o, e in zip(obs, exp):
+            assert_almost_equal(o, e)
+        # only the last max_steps time steps keep their factorizations
+        solver(n_0, 2*t)
+        assert_equal(list(solver._lus.keys()), [2*t])
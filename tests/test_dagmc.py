@@ -104,8 +104,11 @@ def find_volume():
     # boundary case-- exiting volume 3 => in volume 3
     vol3 = dagmc.find_volume([1, .1, .1], [-1, 0, 0])
     vol4 = dagmc.find_volume([1.1, 0, 0])
+
+    batch = dagmc.find_volumes([[0, 0, 0], [.9, .9, .9], [1.1, 0, 0],
+                                [0, 0, 0]], chunk_size=3)
     
-    return [vol1, vol2, vol3, vol4, vols]
+    return [vol1, vol2, vol3, vol4, vols, batch]
 
 def one_ray():
     from pyne import dagmc
@@ -230,6 +233,18 @@ def discretize_geom_mix():
 
     return [results1, results2]
 
+def discretize_geom_procs(queue):
+    from pyne import dagmc
+    dagmc.load(path)
+
+    coords = [-4, -1, 1, 4]
+    mesh = Mesh(structured=True, structured_coords=[coords, coords, coords])
+    results1 = dagmc.discretize_geom(mesh, num_rays=20, seed=42)
+    results2 = dagmc.discretize_geom(mesh, num_rays=20, seed=42, num_procs=3)
+    results3 = dagmc.discretize_geom(mesh, num_rays=20, seed=42, num_procs=2,
+                                     geom_file=path)
+    queue.put([results1, results2, results3])
+
 def discretize_non_square():
     from pyne import dagmc
     dagmc.load(path)
@@ -362,6 +377,8 @@ def test_find_volume():
     
     for vol in vols:
         assert_true(vol in (2, 3))
+
+    assert_array_equal(r[5], [2, 2, 3, 2])
         
 def test_one_ray():
     p = multiprocessing.Pool()
@@ -542,6 +559,25 @@ def test_discretize_geom_mix():
     assert(results2[0]['rel_error'] < results1[0]['rel_error'])
     assert(results2[1]['rel_error'] < results1[1]['rel_error'])
 
+def test_discretize_geom_procs():
+    """Rays fired by several worker processes give the same results as a
+    single process for the same seed.
+    """
+    if not HAVE_IMESH:
+        raise SkipTest
+
+    # worker pools cannot be started from a daemonic pool process
+    queue = multiprocessing.Queue()
+    p = multiprocessing.Process(target=discretize_geom_procs, args=(queue,))
+    p.start()
+    results1, results2, results3 = queue.get()
+    p.join()
+
+    assert_array_equal(results1, results2)
+    assert_array_equal(results1, results3)
+    for res in results1:
+        assert_equal(res['cell'], 2 if res['idx'] == 13 else 3)
+
 def test_descritize_non_square():
     """Test to make sure requesting a grid with a num_rays that is not a
     perfect square raises ValueError.
@@ -153,6 +153,21 @@ def test_branch_ratio():
     assert_equal(data.branch_ratio(932400001, 932400000), 0.0012)
 
 
+def test_decay_graph():
+    nucs, decay_consts, indptr, children, branch_ratios = data.decay_graph()
+    assert_equal(len(indptr), len(nucs) + 1)
+    assert_equal(len(children), indptr[-1])
+    assert_true(np.all(np.diff(nucs) > 0))
+    for nuc in (922350001, 611460000, 922350000, 10010000):
+        i = np.searchsorted(nucs, nuc)
+        assert_equal(nucs[i], nuc)
+        assert_equal(decay_consts[i], data.decay_const(nuc, False))
+        kids = children[indptr[i]:indptr[i+1]]
+        assert_equal(set(kids), data.decay_children(nuc, False))
+        for child, br in zip(kids, branch_ratios[indptr[i]:indptr[i+1]]):
+            assert_equal(br, data.branch_ratio(nuc, child, False))
+
+
 def test_state_energy():
     assert_equal(data.state_energy('H1'), 0.0)
     assert_equal(data.state_energy(922350001), 7.6e-5)
@@ -331,6 +346,17 @@ def test_gamma_from_to_byen():
      ])
 
 
+def test_gamma_parent_many():
+    energies = [661.65, 103.5, 1332.0]
+    errors = [0.1, 0.05, 0.5]
+    assert_equal(data.gamma_parent_many(energies, errors),
+                 [data.gamma_parent(e, de) for e, de in zip(energies, errors)])
+    assert_equal(data.gamma_child_byen_many(energies, errors),
+                 [data.gamma_child_byen(e, de) for e, de in zip(energies, errors)])
+    assert_equal(data.gamma_parent_many(energies),
+                 [data.gamma_parent(e) for e in energies])
+
+
 def test_gamma_parent():
     assert_equal(data.gamma_parent(661.65, 0.1),
                  [611510000,
@@ -419,6 +445,11 @@ def test_beta_parent():
     assert_equal(data.beta_parent(1000, 0.1), [310760000, 410990001, 441070000])
 
 
+def test_beta_parent_many():
+    assert_equal(data.beta_parent_many([1000, 1000], 0.1),
+                 [data.beta_parent(1000, 0.1)] * 2)
+
+
 def test_beta_child_byen():
     assert_equal(data.beta_child_byen(1000, 0.1),
                  [320760084, 420990050, 451070007])
@@ -14,7 +14,7 @@ from numpy.testing import assert_array_equal, assert_allclose, \
 from pyne.utils import QAWarning
 warnings.simplefilter("ignore", QAWarning)
 
-from pyne.endf import Library, Evaluation
+from pyne.endf import Library, Evaluation, _section_attr
 from pyne.utils import endftod
 from pyne.rxdata import DoubleSpinDict
 from pyne.xs.data_source import ENDFDataSource
@@ -85,6 +85,48 @@ def test_loadtape():
     obs_nuclides = set(map(int, testlib.structure.keys()))
     assert_equal(exp_nuclides, obs_nuclides)
 
+def test_index():
+    index_path = "sampletape1.index.json"
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    try:
+        built = Library(tape1path, index=index_path)
+        assert os.path.exists(index_path)
+        loaded = Library(tape1path, index=index_path)
+        assert_equal(built.mat_dict, loaded.mat_dict)
+        assert_equal(set(built.structure), set(loaded.structure))
+        for nuc in built.structure:
+            assert_equal(built.structure[nuc]['docs'],
+                         loaded.structure[nuc]['docs'])
+            assert_equal(built.structure[nuc]['matflags'],
+                         loaded.structure[nuc]['matflags'])
+            attr = 'mat{0}'.format(nuc)
+            assert_equal(hasattr(built, attr), hasattr(loaded, attr))
+        assert_array_equal(loaded.get_rx(nuc40000, 4, 2),
+                           library.get_rx(nuc40000, 4, 2))
+
+        # a stale index is rebuilt
+        with open(index_path, 'w') as f:
+            f.write('{"key": {"size": 0}}')
+        rebuilt = Library(tape1path, index=index_path)
+        assert_equal(built.mat_dict, rebuilt.mat_dict)
+        assert_equal(Library(tape1path, index=index_path).mat_dict,
+                     built.mat_dict)
+    finally:
+        if os.path.exists(index_path):
+            os.remove(index_path)
+
+def test_close():
+    with Library(tape1path) as lib:
+        assert(lib._mm is None)
+        assert_array_equal(lib.get_rx(nuc40000, 4, 2),
+                           library.get_rx(nuc40000, 4, 2))
+    assert(lib._mm is None)
+    # the tape is mapped again on demand
+    assert_array_equal(lib.get_rx(nuc40000, 4, 2),
+                       library.get_rx(nuc40000, 4, 2))
+    lib.close()
+
 def test_get():
     obs = library.get_rx(nuc40000, 4, 2)
     exp = [4.898421e+3, 6.768123e+0, 0, 1, 0, 0, 2.123124e+6, 8.123142e-6, 2.123212e+6,
@@ -742,6 +784,56 @@ def test_evaluation_neutron():
     assert_array_almost_equal(r.angular_distribution.probability[5](mu), p)
 
 
+def test_evaluation_lazy():
+    download_file('http://t2.lanl.gov/nis/data/data/ENDFB-VII.1-neutron/U/235',
+                  'U235.txt', "1b71da3769d8b1e675c3c579ba5cb2d3")
+    u235 = Evaluation('U235.txt', verbose=False, lazy=True)
+    assert (3, 80) in u235._sections
+    assert 'reactions' in u235._unread
+    assert u235.target['zsymam'] == u' 92-U -235 '
+
+    # only the reactions are parsed on access
+    r = u235.reactions[80]
+    assert 'reactions' not in u235._unread
+    assert 'fission' in u235._unread
+    assert r.xs.x[0] == 2309870.0
+    assert len(r.angular_distribution.energy) == 14
+    assert 37 in u235.reactions
+
+    eager = Evaluation('U235.txt', verbose=False)
+    eager.read()
+    assert_equal(list(u235.reactions.keys()), list(eager.reactions.keys()))
+    E = np.logspace(-4, 6, 10)
+    assert_array_almost_equal(u235.fission['nu']['total'](E),
+                              eager.fission['nu']['total'](E))
+
+
+def test_evaluation_lazy_read():
+    download_file('http://t2.lanl.gov/nis/data/data/ENDFB-VII.1-neutron/U/235',
+                  'U235.txt', "1b71da3769d8b1e675c3c579ba5cb2d3")
+    u235 = Evaluation('U235.txt', verbose=False, lazy=True)
+
+    # a partial read marks the attributes it fully covers as read
+    u235.read(reactions=[(2, 151)])
+    assert 'resonances' not in u235._unread
+    assert 'reactions' in u235._unread
+    u235.read(reactions=(3, 1))
+    assert (3, 1) in u235._parsed
+    assert 'reactions' in u235._unread
+
+    # a full read only parses the remaining sections
+    resonances = u235.resonances
+    u235.read()
+    assert not u235._unread
+    assert u235.resonances is resonances
+    assert_equal(u235._parsed, set(key for key in u235._sections
+                                   if _section_attr(*key) is not None))
+
+    eager = Evaluation('U235.txt', verbose=False)
+    eager.read()
+    assert_equal(list(u235.reactions.keys()), list(eager.reactions.keys()))
+
+
 def test_evaluation_decay():
     download_file('http://t2.lanl.gov/nis/data/endf/decayVII.1/092_U_233',
                   'U233.txt', '3db23dc650bae28eabb92942dd7d0de5')
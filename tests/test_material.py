@@ -13,14 +13,14 @@ from pyne.utils import QAWarning
 warnings.simplefilter("ignore", QAWarning)
 from pyne import nuc_data
 from pyne.material import Material, from_atom_frac, from_hdf5, from_text, \
-    MapStrMaterial, MultiMaterial, MaterialLibrary
+    MapStrMaterial, MultiMaterial, MaterialLibrary, decay_many, photon_spectra
 from pyne import jsoncpp
 from pyne import data
 from pyne import nucname
 from pyne import utils
 from pyne import cram
 import numpy as np
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_equal, assert_array_almost_equal
 import tables as tb
 
 if utils.use_warnings():
@@ -1556,6 +1556,30 @@ def test_matlib_hdf5():
     os.remove(filename)
 
 
+def test_matlib_hdf5_rows():
+    filename = "matlib_rows.h5"
+    if filename in os.listdir('.'):
+        os.remove(filename)
+    lib = dict(("m{0}".format(i), Material({'H1': 1.0, 'U235': 0.1*i},
+                                           density=float(i)))
+               for i in range(1, 6))
+    wmatlib = MaterialLibrary(lib)
+    wmatlib.write_hdf5(filename, chunksize=2, complevel=4)
+    with tb.open_file(filename) as f:
+        assert_equal(len(f.root.materials), 5)
+        assert_array_equal(f.root.nucid[:], [10010000, 922350000])
+    rmatlib = MaterialLibrary()
+    rmatlib.from_hdf5(filename, rows=[3, 1])
+    assert_equal(len(rmatlib), 2)
+    for key in rmatlib:
+        assert_mat_almost_equal(wmatlib[key], rmatlib[key])
+    # single materials may still be read by the C++ reader
+    mat = Material()
+    mat.from_hdf5(filename, "/materials", 0)
+    assert_mat_almost_equal(mat, wmatlib[mat.metadata["name"]])
+    os.remove(filename)
+
+
 def test_material_gammas():
     leu = {"U238": 0.96, "U235": 0.04}
     mat = Material(leu)
@@ -1760,6 +1784,42 @@ def test_material_photons():
                  (13.0, 0.18655736948227228)])
 
 
+def test_material_photon_lines():
+    leu = {"U238": 0.96, "U235": 0.04}
+    mat = Material(leu)
+    lines = mat.photon_lines()
+    energies = [e for e, i in lines]
+    assert_equal(energies, sorted(set(energies)))
+    # merged lines carry the same total intensity as the unmerged ones
+    photons = np.array(mat.photons())
+    known = ~np.isnan(photons[:, 1])
+    assert_almost_equal(sum(i for e, i in lines) / photons[known, 1].sum(), 1.0)
+    assert_almost_equal(sum(i for e, i in mat.photon_lines(True)), 1.0)
+    for e, i in lines:
+        assert_almost_equal(i / photons[known & (photons[:, 0] == e), 1].sum(),
+                            1.0)
+
+    e_bounds = [0.0, 50.0, 100.0, 1000.0]
+    spectrum = mat.photon_spectrum(e_bounds)
+    exp = np.histogram([e for e, i in lines], bins=e_bounds,
+                       weights=[i for e, i in lines])[0]
+    assert_array_almost_equal(spectrum / exp, np.ones(3))
+    assert_almost_equal(mat.photon_spectrum([0.0, 1e9], True)[0], 1.0)
+
+    mats = [mat, Material({"U235": 1.0}), Material({"H1": 1.0})]
+    spectra = photon_spectra(mats, e_bounds)
+    assert_equal(spectra.shape, (3, 3))
+    for m, s in zip(mats, spectra):
+        assert_array_equal(s == 0, m.photon_spectrum(e_bounds) == 0)
+        nz = s != 0
+        assert_array_almost_equal(s[nz] / m.photon_spectrum(e_bounds)[nz],
+                                  np.ones(nz.sum()))
+    spectra = photon_spectra(mats[:2], e_bounds, norm=True)
+    assert_array_almost_equal(spectra[1] / mats[1].photon_spectrum(e_bounds,
+                                                                    True),
+                              np.ones(3))
+
+
 def test_decay_h3():
     mat = Material({'H3': 1.0})
     obs = mat.decay(data.half_life('H3'))
@@ -1768,6 +1828,44 @@ def test_decay_h3():
     assert_almost_equal(0.5, obs[nucname.id('H3')])
     assert_almost_equal(0.5, obs[nucname.id('He3')])
 
+def test_decay_many():
+    mats = [Material({'H3': 1.0}), from_atom_frac({'H3': 1.0, 'H1': 1.0}, 2.0)]
+    times = [0.0, data.half_life('H3'), 2 * data.half_life('H3')]
+    nucs, atom_fracs = decay_many(mats, times)
+    assert_equal(atom_fracs.shape, (2, 3, len(nucs)))
+    h3 = list(nucs).index(nucname.id('H3'))
+    assert_array_almost_equal(atom_fracs[0, :, h3], [1.0, 0.5, 0.25])
+    assert_array_almost_equal(atom_fracs[1, :, h3], [0.5, 0.25, 0.125])
+
+    lib = decay_many(mats, times, lib=True)
+    assert_equal(len(lib), 6)
+    for m, mat in enumerate(mats):
+        for t in times:
+            exp = mat.decay(t)
+            obs = lib["{0}_{1!r}".format(m, float(t))]
+            assert_equal(obs.metadata["decay_key"], m)
+            assert_equal(obs.metadata["decay_time"], t)
+            assert_almost_equal(exp.mass, obs.mass)
+            for nuc, frac in exp.comp.items():
+                assert_almost_equal(frac, obs.comp[nuc])
+
+    # the library may be written and read back
+    filename = "decay_many.h5"
+    if os.path.exists(filename):
+        os.remove(filename)
+    lib.write_hdf5(filename)
+    try:
+        rlib = MaterialLibrary(filename)
+        assert_equal(set(rlib), set(lib))
+        for key in lib:
+            assert_mat_almost_equal(rlib[key], lib[key])
+    finally:
+        os.remove(filename)
+
+    obs = mats[0].decay(times)
+    assert_equal(len(obs), 3)
+    assert_almost_equal(obs[1].to_atom_frac()[nucname.id('H3')], 0.5)
+
 def test_decay_u235_h3():
     mat = Material({'U235': 1.0, 'H3': 1.0})
     obs = mat.decay(365.25 * 24.0 * 3600.0)
@@ -11,6 +11,7 @@ from nose.tools import assert_almost_equal, assert_equal, assert_true, \
 from nose.plugins.skip import SkipTest
 
 import tables
+import numpy as np
 
 from pyne.utils import QAWarning
 
@@ -18,6 +19,7 @@ warnings.simplefilter("ignore", QAWarning)
 try:
     from pyne import mcnp
     from pyne.mcnp import mats_from_inp
+    from pyne.ptrac_to_hdf5 import convert_parallel
 except ImportError:
     raise SkipTest
 
@@ -686,6 +688,69 @@ def test_write_to_hdf5():
             os.unlink("mcnp_ptrac_hdf5_file.h5")
 
 
+def test_write_to_hdf5_shards():
+    test_files = ["mcnp_ptrac_i4_little.ptrac",
+                  "mcnp_ptrac_i8_little.ptrac"]
+
+    for test_file in test_files:
+        p = mcnp.PtracReader(test_file)
+        start = p.f.tell()
+
+        # blocks smaller than a history are enlarged as needed
+        blocks = []
+        events = p.read_histories(block_size=100)
+        while events is not None:
+            blocks.append(events)
+            events = p.read_histories(block_size=100)
+        expected = np.concatenate(blocks)
+        assert_equal(len(expected), 15)
+        assert_equal((expected["event_type"] == 1000).sum(), 5)
+
+        # convert in shards split at history boundaries
+        p.f.seek(start)
+        bounds = p.history_boundaries(3)
+        assert_equal(bounds[0], start)
+        assert_equal(len(bounds), 4)
+        h5file = tables.open_file("mcnp_ptrac_hdf5_file.h5", "w")
+        tab = h5file.create_table("/", "t", mcnp.PtracEvent, "test")
+        nrows = []
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            p.f.seek(lo)
+            p.write_to_hdf5_table(tab, stop=hi)
+            nrows.append(tab.nrows)
+        assert_array_equal(tab.read(), expected)
+
+        # resuming a finished conversion adds nothing
+        p.write_to_hdf5_table(tab, resume=True)
+        assert_equal(tab.nrows, 15)
+
+        # resume as if interrupted after the second shard
+        tab.attrs.ptrac_position = bounds[2]
+        tab.attrs.ptrac_nrows = nrows[1]
+        p.write_to_hdf5_table(tab, resume=True)
+        assert_array_equal(tab.read(), expected)
+
+        # parallel conversion refuses to append to a filled table
+        assert_raises(ValueError, convert_parallel, test_file, tab, 3)
+        assert_raises(ValueError, convert_parallel, test_file, tab, 3,
+                      resume=True)
+        h5file.close()
+
+        # mismatched leading and trailing record lengths are detected
+        p.f.seek(start)
+        buf = bytearray(p.f.read())
+        length = struct.unpack_from(p.endianness + 'i', buf, 0)[0]
+        struct.pack_into(p.endianness + 'i', buf, 4 + length, length + 1)
+        assert_raises(ValueError, p._scan_histories, bytes(buf))
+        del tab
+        del h5file
+        del p
+
+        # clean up
+        if os.path.exists("mcnp_ptrac_hdf5_file.h5"):
+            os.unlink("mcnp_ptrac_hdf5_file.h5")
+
+
 # Test Wwinp class. All three function are tested at once because their inputs
 # and ouputs are easily strung together.
 def test_wwinp_n():
@@ -1194,6 +1259,73 @@ def test_multiple_meshtally_meshtal():
         assert_array_equal(written, expected)
 
 
+def test_meshtal_tally_numbers():
+    """Test that only the requested tallies are read when tally_numbers is
+    given, and that they match a full read of the file.
+    """
+
+    if not HAVE_PYTAPS:
+        raise SkipTest
+
+    thisdir = os.path.dirname(__file__)
+    meshtal_file = os.path.join(thisdir, "mcnp_meshtal_multiple_meshtal.txt")
+
+    full = mcnp.Meshtal(meshtal_file)
+    lazy = mcnp.Meshtal(meshtal_file, tally_numbers=[14, 24])
+
+    assert_equal(lazy.version, full.version)
+    assert_equal(lazy.title, full.title)
+    assert_equal(lazy.histories, full.histories)
+    assert_equal(sorted(lazy.tally.keys()), [14, 24])
+
+    for num in (14, 24):
+        assert_equal(lazy.tally[num].particle, full.tally[num].particle)
+        assert_equal(lazy.tally[num].e_bounds, full.tally[num].e_bounds)
+        n_tags = 4 if len(full.tally[num].e_bounds) > 2 else 2
+        for name in full.tally[num].tag_names[:n_tags]:
+            written = lazy.tally[num].mesh.getTagHandle(name)
+            expected = full.tally[num].mesh.getTagHandle(name)
+            for v_e, expected_v_e in zip(
+                    lazy.tally[num].structured_iterate_hex("xyz"),
+                    full.tally[num].structured_iterate_hex("xyz")):
+                assert_array_equal(written[v_e], expected[expected_v_e])
+
+
+def test_meshtal_tally_numbers_empty():
+    """Test that an empty meshtal file yields no tallies when tally_numbers
+    is given.
+    """
+
+    filename = "empty_meshtal.txt"
+    open(filename, 'w').close()
+    meshtal = mcnp.Meshtal(filename, tally_numbers=[4])
+    assert_equal(meshtal.tally, {})
+    os.remove(filename)
+
+
+def test_meshtal_malformed_value():
+    """Test that a malformed number in a results table raises instead of
+    being read as its numeric prefix.
+    """
+
+    if not HAVE_PYTAPS:
+        raise SkipTest
+
+    thisdir = os.path.dirname(__file__)
+    meshtal_file = os.path.join(thisdir, "mcnp_meshtal_multiple_meshtal.txt")
+    with open(meshtal_file, 'r') as f:
+        text = f.read()
+
+    filename = "malformed_meshtal.txt"
+    with open(filename, 'w') as f:
+        f.write(text.replace("6.00211E+03", "6.00211Q+03", 1))
+    try:
+        assert_raises(ValueError, mcnp.Meshtal, filename)
+        assert_raises(ValueError, mcnp.Meshtal, filename, tally_numbers=[4])
+    finally:
+        os.remove(filename)
+
+
 def test_mesh_to_geom():
     if not HAVE_PYTAPS:
         raise SkipTest
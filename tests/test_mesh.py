@@ -19,7 +19,7 @@ except ImportError:
 from pyne.utils import QAWarning
 warnings.simplefilter("ignore", QAWarning)
 from pyne.mesh import Mesh, StatMesh, MeshError, Tag, MetadataTag, IMeshTag, \
-    ComputedTag
+    ComputedTag, combine_stat_meshes
 from pyne.material import Material, MaterialLibrary
 
 def try_rm_file(filename):
@@ -73,12 +73,39 @@ def test_elem_volume():
         vols.append(mesh.elem_volume(ve))
     assert_almost_equal(np.mean(vols), 51.3333, places=4)
 
+def test_elem_volumes():
+    for name in ["unstr.h5m", "grid543.h5m"]:
+        filename = os.path.join(os.path.dirname(__file__),
+                                "files_mesh_test", name)
+        mesh = Mesh(mesh=filename)
+        exp = [mesh.elem_volume(ve) for __, __, ve in mesh]
+        assert_array_almost_equal(mesh.elem_volumes(), exp)
+        assert_array_almost_equal(mesh.elem_volumes(mesh._ves[1:3]), exp[1:3])
+
 def test_ve_center():
     m = Mesh(structured=True, structured_coords=[[-1, 3, 5], [-1, 1], [-1, 1]])
     exp_centers = [(1, 0, 0), (4, 0, 0)]
     for i, mat, ve in m:
         assert_equal(m.ve_center(ve), exp_centers[i])
 
+def test_ve_centers():
+    m = Mesh(structured=True, structured_coords=[[-1, 3, 5], [-1, 1], [-1, 1]])
+    assert_array_almost_equal(m.ve_centers(), [(1, 0, 0), (4, 0, 0)])
+    assert_array_almost_equal(m.ve_centers(m._ves[1:]), [(4, 0, 0)])
+
+def test_structured_geometry_cache():
+    coords = [[-1, 0.5, 3, 5], [-2, 1, 1.5], [0, 0.25, 1]]
+    for order in ['xyz', 'zyx', 'yxz']:
+        m = Mesh(structured=True, structured_coords=coords,
+                 structured_ordering=order)
+        vols = m.elem_volumes()
+        centers = m.ve_centers()
+        assert_array_almost_equal(vols, m.elem_volumes(m._ves))
+        assert_array_almost_equal(centers, m.ve_centers(m._ves))
+        assert_true(m.elem_volumes() is vols)
+        m.clear_geometry_cache()
+        assert_true(m.elem_volumes() is not vols)
+
 
 #############################################
 #Test structured mesh functionality
@@ -312,6 +339,54 @@ class TestArithmetic():
         assert_array_almost_equal(exp_res, obs_res)
         assert_array_almost_equal(exp_err, obs_err)
 
+    def test_combine_stat_meshes(self):
+        self.arithmetic_statmesh_setup()
+        combine_stat_meshes([self.statmesh_1, self.statmesh_2])
+        exp_res = [2.1, 4.2, 6.3, 8.4]
+        exp_err = [0.070790803558659549, 0.1415816071173191,
+                   0.21237241067597862, 0.28316321423463819]
+        obs_res = [self.statmesh_1.mesh.getTagHandle("flux")[vol]
+                   for vol in self.statmesh_1.structured_iterate_hex("xyz")]
+        obs_err = [self.statmesh_1.mesh.getTagHandle("flux_rel_error")[vol]
+                   for vol in self.statmesh_1.structured_iterate_hex("xyz")]
+        assert_array_almost_equal(exp_res, obs_res)
+        assert_array_almost_equal(exp_err, obs_err)
+
+    def test_combine_stat_meshes_weights(self):
+        self.arithmetic_statmesh_setup()
+        combine_stat_meshes([self.statmesh_1, self.statmesh_2],
+                            tags=["flux"], weights=[1.0, 3.0])
+        flux = np.array([1.0, 2.0, 3.0, 4.0])
+        err = np.array([0.1, 0.2, 0.3, 0.4])
+        exp_res = (flux + 3.0*1.1*flux) / 4.0
+        exp_err = np.sqrt((flux*err)**2 + (3.0*1.1*flux*err)**2) \
+                  / (flux + 3.0*1.1*flux)
+        obs_res = [self.statmesh_1.mesh.getTagHandle("flux")[vol]
+                   for vol in self.statmesh_1.structured_iterate_hex("xyz")]
+        obs_err = [self.statmesh_1.mesh.getTagHandle("flux_rel_error")[vol]
+                   for vol in self.statmesh_1.structured_iterate_hex("xyz")]
+        assert_array_almost_equal(exp_res, obs_res)
+        assert_array_almost_equal(exp_err, obs_err)
+
+    def test_combine_stat_meshes_files(self):
+        self.arithmetic_statmesh_setup()
+        filenames = ['test_combine_1.h5m', 'test_combine_2.h5m']
+        try:
+            self.statmesh_1.write_hdf5(filenames[0])
+            self.statmesh_2.write_hdf5(filenames[1])
+            out = combine_stat_meshes(filenames)
+            assert_true(isinstance(out, StatMesh))
+            exp_res = [2.1, 4.2, 6.3, 8.4]
+            exp_err = [0.070790803558659549, 0.1415816071173191,
+                       0.21237241067597862, 0.28316321423463819]
+            obs_res = out.mesh.getTagHandle("flux")[out._ves]
+            obs_err = out.mesh.getTagHandle("flux_rel_error")[out._ves]
+            assert_array_almost_equal(exp_res, sorted(obs_res))
+            assert_array_almost_equal(exp_err, sorted(obs_err))
+        finally:
+            for filename in filenames:
+                try_rm_file(filename)()
+
 #############################################
 #Test Structured mesh iteration functionality
 #############################################
@@ -525,6 +600,35 @@ def test_matproptag():
     m.density[3, 1] = 6.0, 4128.0
     assert_array_equal(m.density[1:], np.array([4128.0, 28.0, 6.0]))
 
+def test_matproptag_scalar_arrays():
+    mats = {
+        0: Material({'H1': 1.0, 'K39': 1.0}, mass=1.0, density=42.0),
+        1: Material({'H1': 0.1, 'O16': 1.0}, mass=2.0, density=43.0),
+        2: Material({'He4': 42.0}, mass=3.0, density=44.0),
+        3: Material({'Tm171': 171.0}, mass=4.0, density=45.0),
+        }
+    m = gen_mesh(mats=mats)
+
+    dens = m.density[:]
+    assert_equal(dens.dtype, np.float64)
+    assert_equal(dens.shape, (4,))
+    assert_array_equal(m.mass[np.array([3, 1])], np.array([4.0, 2.0]))
+    mask = np.array([False, False, False, False], dtype=bool)
+    assert_equal(len(m.mass[mask]), 0)
+
+    # tags stay in sync with materials modified directly
+    m.mats[2].density = 7.0
+    assert_array_equal(m.density[1:3], np.array([43.0, 7.0]))
+
+def test_ve_handle_cache():
+    m = gen_mesh()
+    m.f = IMeshTag(mesh=m, name='f')
+    m.f[:] = [1.0, 2.0, 3.0, 4.0]
+    for i, ve in enumerate(m.iter_ve()):
+        assert_equal(m.f[i], m.mesh.getTagHandle('f')[ve])
+    assert_equal(m.f[3], 4.0)
+    assert_raises(IndexError, m.f.__getitem__, 4)
+
 def test_matmethtag():
     mats = {
         0: Material({'H1': 1.0, 'K39': 1.0}, density=42.0),
@@ -785,6 +889,32 @@ def test_cell_fracs_to_mats():
         assert_equal(mat.density, 1.0)
 
 
+def test_cell_fracs_to_mats_shared_mixtures():
+    m = gen_mesh()
+    cell_fracs = np.zeros(6, dtype=[('idx', np.int64),
+                                    ('cell', np.int64),
+                                    ('vol_frac', np.float64),
+                                    ('rel_error', np.float64)])
+    cell_mats = {11: Material({'H': 1.0}, density = 1.0),
+                 12: Material({'He': 1.0}, density = 1.0)}
+
+    # unsorted input with the same mixture in voxels 0 and 3
+    cell_fracs[:] = [(3, 11, 0.5, 0.0), (3, 12, 0.5, 0.0), (1, 11, 1.0, 0.0),
+                     (0, 11, 0.5, 0.0), (0, 12, 0.5, 0.0), (2, 12, 1.0, 0.0)]
+
+    m.cell_fracs_to_mats(cell_fracs, cell_mats)
+
+    exp_comps = [{10000000: 0.5, 20000000: 0.5}, {10000000: 1.0},
+                 {20000000: 1.0}, {10000000: 0.5, 20000000: 0.5}]
+    for i, mat, _ in m:
+        assert_equal(mat.comp, exp_comps[i])
+
+    # shared mixtures must not alias each other
+    assert_true(m.mats[0] is not m.mats[3])
+    m.mats[0].density = 42.0
+    assert_equal(m.mats[3].density, 1.0)
+
+
 def test_tag_cell_fracs():
     m = gen_mesh()
     cell_fracs = np.zeros(7, dtype=[('idx', np.int64),
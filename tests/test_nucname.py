@@ -6,6 +6,8 @@ import warnings
 
 from nose.tools import assert_equal, assert_not_equal, assert_raises, raises, assert_in, \
     assert_true, assert_false
+import numpy as np
+from numpy.testing import assert_array_equal
 
 from pyne.utils import QAWarning
 warnings.simplefilter("ignore", QAWarning)
@@ -580,6 +582,32 @@ def test_ensdf_to_id():
     assert_equal(nucname.ensdf_to_id('269Hs'), 1082690000)
 
 
+def test_id_array():
+    nucs = ['U235', 'u235', 922350, 'Am242M', 'U235']
+    exp = [922350000, 922350000, 922350000, 952420001, 922350000]
+    obs = nucname.id_array(nucs)
+    assert_equal(obs.dtype.kind, 'i')
+    assert_array_equal(obs, exp)
+    assert_array_equal(nucname.id_array(np.array(nucs[:2] * 2, dtype='S')),
+                       exp[:2] * 2)
+    obs = nucname.id_array(np.array([[922350, 10010], [922350, 922350]]))
+    assert_array_equal(obs, [[922350000, 10010000], [922350000, 922350000]])
+    assert_equal(len(nucname.id_array([])), 0)
+    assert_raises(nucname.NucTypeError, nucname.id_array, [[1]])
+
+
+def test_name_array():
+    obs = nucname.name_array(np.array([b'922350000', b'H1', b'922350000']))
+    assert_array_equal(obs, ['U235', 'H1', 'U235'])
+    assert_array_equal(nucname.zzaaam_array(['U235', 'Am242M']),
+                       [922350, 952421])
+    assert_array_equal(nucname.znum_array(['U235', 'Am242M']), [92, 95])
+    assert_array_equal(nucname.anum_array(['U235', 'Am242M']), [235, 242])
+    assert_array_equal(nucname.snum_array(['U235', 'Am242M']), [0, 1])
+    assert_array_equal(nucname.convert_array(nucname.serpent, [10010]),
+                       ['H-1'])
+
+
 if __name__ == "__main__":
     nose.runmodule()
 
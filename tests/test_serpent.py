@@ -1,8 +1,9 @@
 import os
 import warnings
+from io import StringIO
 
 import numpy as np
-from nose.tools import assert_equal, assert_true
+from nose.tools import assert_equal, assert_true, assert_raises
 from numpy.testing import assert_array_equal
 
 from pyne.utils import QAWarning
@@ -82,3 +83,67 @@ def test_parse_det2():
     assert_array_equal(det['DET1'][4], 
         [5, 1, 5, 1, 1, 1, 1, 1, 1, 1, 1, 5.11865E+05, 0.00417])
     assert_array_equal(det['DET1E'][-3], [5.25306E-05, 3.80731E-03, 1.92992E-03])
+
+def test_parse_res_select():
+    res = serpent.parse_res('sample_res.m')
+    obs = serpent.parse_res('sample_res.m', variables=['SIX_FF_ETA', 'TITLE'])
+    assert_equal(set(obs.keys()), set(['SIX_FF_ETA', 'TITLE', 'idx', 'IDX']))
+    assert_array_equal(obs['SIX_FF_ETA'], res['SIX_FF_ETA'])
+    assert_array_equal(obs['TITLE'], res['TITLE'])
+    assert_equal(obs['IDX'], res['IDX'])
+
+def test_parse_dep_select():
+    dep = serpent.parse_dep('sample_dep.m')
+    obs = serpent.parse_dep('sample_dep.m', variables=['BU', 'TOT_MASS', 'MDENS'],
+                            materials=['fuelp1r2'])
+    assert_equal(set(obs.keys()), set(['BU', 'TOT_MASS', 'MAT_fuelp1r2_MDENS',
+                                       'MAT_fuelp1r2_MATERIAL', 'TOT_MATERIAL']))
+    for key in ['BU', 'TOT_MASS', 'MAT_fuelp1r2_MDENS']:
+        assert_array_equal(obs[key], dep[key])
+    for key in ['MAT_fuelp1r2_MATERIAL', 'TOT_MATERIAL']:
+        for mat, exp in zip(obs[key], dep[key]):
+            assert_equal(dict(mat.comp), dict(exp.comp))
+            assert_equal(mat.mass, exp.mass)
+
+    # materials are only built for selected mass densities
+    obs = serpent.parse_dep('sample_dep.m', variables=['BU'])
+    assert_equal(set(obs.keys()), set(['BU']))
+    obs = serpent.parse_dep('sample_dep.m', variables=['TOT_MASS'])
+    assert_equal(set(obs.keys()), set(['TOT_MASS', 'TOT_MATERIAL']))
+
+def test_parse_dep_material_prefix():
+    # material names may contain underscores and prefix each other
+    text = (u"ZAI = [10010 ];\nDAYS = [0 ];\n"
+            u"MAT_fuel_VOLUME = 1.0;\nMAT_fuel_2_VOLUME = 2.0;\n"
+            u"MAT_fuel_MDENS = [1 ];\nMAT_fuel_2_MDENS = [2 ];\n")
+    obs = serpent.parse_dep(StringIO(text), make_mats=False,
+                            materials=['fuel'])
+    assert_equal(set(obs.keys()), set(['MAT_fuel_VOLUME', 'MAT_fuel_MDENS']))
+    obs = serpent.parse_dep(StringIO(text), make_mats=False,
+                            variables=['VOLUME'], materials=['fuel_2'])
+    assert_equal(obs, {'MAT_fuel_2_VOLUME': 2.0})
+
+def test_parse_det_select():
+    det = serpent.parse_det('serp2_det.m')
+    obs = serpent.parse_det('serp2_det.m', variables=['DET1', 'DET2X'])
+    assert_equal(set(obs.keys()), set(['DET1', 'DET2X']))
+    assert_array_equal(obs['DET1'], det['DET1'])
+    assert_array_equal(obs['DET2X'], det['DET2X'])
+
+def test_parse_det_values():
+    det = serpent.parse_det(StringIO(u"TITLE = 'pin cell';\nDET1_VALS = 3;\n"))
+    assert_equal(det, {'TITLE': 'pin cell', 'DET1_VALS': 3})
+    assert_raises(ValueError, serpent.parse_det, StringIO(u"DET1_VALS = x;\n"))
+
+def test_hdf5():
+    res = serpent.parse_res('sample_res.m')
+    serpent.write_hdf5(res, 'sample_res.h5')
+    try:
+        obs = serpent.read_hdf5('sample_res.h5')
+        assert_equal(set(obs.keys()), set(res.keys()))
+        for key in res:
+            assert_array_equal(obs[key], res[key])
+        obs = serpent.read_hdf5('sample_res.h5', variables=['PEAKF10', 'IDX'])
+        assert_equal(set(obs.keys()), set(['PEAKF10', 'IDX']))
+    finally:
+        os.remove('sample_res.h5')
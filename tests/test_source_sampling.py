@@ -1596,3 +1596,43 @@ def _source_sampling_test_template(mode, cell_fracs_list, src_tag,
     # remove the temporary file
     os.remove(filename)
 
+
+@with_setup(None, try_rm_file('sampling_mesh.h5m'))
+def test_particle_birth_many():
+    """Tests that the batched particle birth matches particle birth called
+    once per particle, and that seeded batches do not depend on the number of
+    threads.
+    """
+    seed(1953)
+    m = Mesh(structured=True,
+             structured_coords=[[0, 0.5, 1], [0, 1], [0, 1]], mats=None)
+    m.src = IMeshTag(2, float)
+    m.src[:] = [[1.0, 2.0], [3.0, 4.0]]
+    m.bias = IMeshTag(2, float)
+    m.bias[:] = [[1.0, 1.0], [2.0, 1.0]]
+    filename = "sampling_mesh.h5m"
+    m.mesh.save(filename)
+    tag_names = {"src_tag_name": "src", "bias_tag_name": "bias"}
+    sampler = Sampler(filename, tag_names, np.array([0, 0.5, 1]),
+                      DEFAULT_USER)
+
+    rands = np.array([[uniform(0, 1) for x in range(6)] for i in range(100)])
+    x, y, z, e, w, c = sampler.particle_birth_many(rands, num_threads=3)
+    for i in range(len(rands)):
+        s = sampler.particle_birth(rands[i])
+        assert_almost_equal(x[i], s.x)
+        assert_almost_equal(y[i], s.y)
+        assert_almost_equal(z[i], s.z)
+        assert_almost_equal(e[i], s.e)
+        assert_almost_equal(w[i], s.w)
+        assert_equal(c[i], s.c)
+
+    # more than two blocks of Sampler::rng_block_size particles so that the
+    # blocks are actually spread over several threads
+    n = 2*65536 + 1000
+    serial = sampler.particle_birth_many(n=n, seed=42)
+    threaded = sampler.particle_birth_many(n=n, seed=42, num_threads=4)
+    for a, b in zip(serial, threaded):
+        assert_array_equal(a, b)
+    assert(np.all((serial[0] >= 0) & (serial[0] <= 1)))
+    assert_raises(ValueError, sampler.particle_birth_many)
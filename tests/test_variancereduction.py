@@ -102,6 +102,15 @@ def test_cadis_multiple_e():
     
     assert_array_almost_equal(ww_mesh.ww[:], expected_ww[:])
     assert_array_almost_equal(q_bias_mesh.q_bias[:], expected_q_bias[:])
+
+    #chunked processing gives the same results
+    cadis(adj_flux_mesh, adj_flux_tag, q_mesh, q_tag,
+          ww_mesh, "ww_chunked", q_bias_mesh, "q_bias_chunked", beta=5,
+          chunk_size=3)
+    ww_mesh.ww_chunked = IMeshTag(2, float)
+    q_bias_mesh.q_bias_chunked = IMeshTag(2, float)
+    assert_array_almost_equal(ww_mesh.ww_chunked[:], expected_ww[:])
+    assert_array_almost_equal(q_bias_mesh.q_bias_chunked[:], expected_q_bias[:])
     
 
 def test_magic_below_tolerance():
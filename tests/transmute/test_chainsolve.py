@@ -135,6 +135,60 @@ def test_tm171_decay():
     obs = tm.transmute(inp, t=t_sim, phi=0.0, tol=1e-7)
     assert_equal(exp, obs['TM171'])
 
+def test_bateman_matches_dense():
+    "Tests that the analytic chain solver agrees with the dense reference"
+    phi = 1e12 * np.ones(175)
+    t_sim = 1.0e6
+    inp = Material({'TM171': 0.5, 'FE56': 0.5}, mass=1.0)
+    exp = tm.transmute(inp, t=t_sim, phi=phi, tol=1e-7)
+    btm = Transmuter(t=t_sim, phi=phi, tol=1e-7, solver='bateman')
+    obs = btm.transmute(inp)
+    assert_equal(set(exp.comp.keys()), set(obs.comp.keys()))
+    for nuc, frac in exp.comp.items():
+        assert_almost_equal(frac, obs.comp[nuc], places=6)
+    # memoized partial results give the same answer
+    obs2 = btm.transmute(inp)
+    for nuc, frac in obs.comp.items():
+        assert_equal(frac, obs2.comp[nuc])
+
+def test_bateman_degenerate():
+    "Tests that equal destruction rates fall back to the matrix exponential"
+    btm = Transmuter(solver='bateman')
+    btm.t = 2.0
+    obs = btm._bateman([0.5, 0.5], [0.5])
+    # N_2(t) = p * t * exp(-lambda * t) for equal rates
+    assert_almost_equal(obs, 0.5 * 2.0 * np.exp(-1.0))
+
+def test_bateman_near_degenerate():
+    "Tests that nearly equal destruction rates agree with the dense solver"
+    lam = 1e-3
+    dests = {1: lam, 2: lam * (1.0 + 1e-6), 3: lam * (1.0 + 2e-6)}
+    prods = {1: {2: lam}, 2: {3: lam * (1.0 + 1e-6)}, 3: {}}
+    obs = {}
+    for solver in ('dense', 'bateman'):
+        stm = Transmuter(t=2.0e3, solver=solver)
+        stm._dest_cache.update(dests)
+        stm._prod_cache.update(prods)
+        obs[solver] = stm._transmute_partial(1)
+    assert_equal(set(obs['dense']), set(obs['bateman']))
+    for nuc, val in obs['dense'].items():
+        assert_almost_equal(obs['bateman'][nuc] / val, 1.0, places=9)
+
+def test_bad_solver():
+    assert_raises(ValueError, Transmuter, solver='magic')
+
+def test_cache_invalidation():
+    "Tests that changing the temperature or reactions drops memoized rates"
+    btm = Transmuter(t=1.0e6, phi=1e12 * np.ones(175), solver='bateman')
+    btm.transmute(Material({'TM171': 1.0}, mass=1.0))
+    assert_true(len(btm._prod_cache) > 0)
+    btm.temp = 600.0
+    assert_equal(btm._prod_cache, {})
+    assert_equal(btm._dest_cache, {})
+    btm.transmute(Material({'TM171': 1.0}, mass=1.0))
+    btm.rxs = ['gamma']
+    assert_equal(btm._partial_cache, {})
+
 #
 # Run as script
 #
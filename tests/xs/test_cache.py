@@ -8,7 +8,7 @@ from nose.tools import assert_equal, assert_not_equal, assert_almost_equal, \
 from numpy.testing import assert_array_equal, assert_array_almost_equal
 
 from pyne.xs import data_source
-from pyne.xs.cache import xs_cache
+from pyne.xs.cache import xs_cache, XSCache
 from pyne.pyne_config import pyne_conf
 
 nuc_data = pyne_conf.NUC_DATA_PATH
@@ -85,3 +85,75 @@ def test_xs_cache_get_phi_g():
     assert_array_equal(phi_g, expected)    
 
 
+
+def test_xs_cache_lru():
+    cache = XSCache(group_struct=[10.0, 1.0, 1E-8], maxsize=2,
+                    data_sources=(data_source.NullDataSource,))
+    cache['phi_g'] = [1.0, 1.0]
+    a = cache[10010, 'abs']
+    assert_true(a is cache[10010, 'abs'])
+    assert_equal((cache.hits, cache.misses), (1, 1))
+
+    # values computed for another spectrum are kept
+    cache['phi_g'] = [1.0, 2.0]
+    assert_false((10010, 'abs') in cache)
+    cache[10010, 'abs']
+    cache['phi_g'] = [1.0, 1.0]
+    assert_true(cache[10010, 'abs'] is a)
+    assert_equal((cache.hits, cache.misses), (2, 2))
+
+    # the least recently used value is evicted
+    cache[80160, 'abs']
+    assert_true((10010, 'abs') in cache)
+    cache['phi_g'] = [1.0, 2.0]
+    assert_false((10010, 'abs') in cache)
+    assert_equal(len(cache._lru), 2)
+
+
+def test_xs_cache_source_spectrum():
+    # the collapsed values depend on the source flux, not just its sum
+    E_g = [14.0, 0.0]
+    fluxes = [np.array([1.0, 0.0, 0.0]), np.array([1.0, 1.0, 0.0]),
+              np.array([0.0, 0.0, 1.0])]
+    cache = XSCache(group_struct=E_g,
+                    data_sources=(data_source.SimpleDataSource,))
+    if not cache.data_sources:
+        return
+    obs = []
+    for flux in fluxes:
+        cache.data_sources[0].src_phi_g = flux
+        cache['phi_g'] = [flux.sum()]
+        obs.append(cache[922350, 'fiss'])
+    assert_equal(cache.misses, 3)
+
+    fresh = XSCache(group_struct=E_g,
+                    data_sources=(data_source.SimpleDataSource,))
+    fresh.data_sources[0].src_phi_g = fluxes[2]
+    fresh['phi_g'] = [1.0]
+    assert_array_almost_equal(obs[2], fresh[922350, 'fiss'])
+
+
+def test_xs_cache_file():
+    if os.path.exists('xs_cache_test.h5'):
+        os.remove('xs_cache_test.h5')
+    cache = XSCache(group_struct=[10.0, 1.0, 1E-8], cache_file='xs_cache_test.h5',
+                    data_sources=(data_source.NullDataSource,))
+    expected = cache[10010, 'abs']
+    assert_equal(cache.misses, 1)
+    cache.close()
+
+    cache = XSCache(group_struct=[10.0, 1.0, 1E-8], cache_file='xs_cache_test.h5',
+                    data_sources=(data_source.NullDataSource,))
+    assert_array_equal(cache[10010, 'abs'], expected)
+    assert_equal((cache.disk_hits, cache.misses), (1, 0))
+    cache.close()
+
+    # caches with other data sources do not see each other's values
+    class OtherNullDataSource(data_source.NullDataSource):
+        pass
+    cache = XSCache(group_struct=[10.0, 1.0, 1E-8], cache_file='xs_cache_test.h5',
+                    data_sources=(OtherNullDataSource,))
+    cache[10010, 'abs']
+    assert_equal((cache.disk_hits, cache.misses), (0, 1))
+    cache.close()
+    os.remove('xs_cache_test.h5')
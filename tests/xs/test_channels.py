@@ -12,7 +12,7 @@ import pyne.data
 import pyne.xs.models
 from pyne.xs.cache import xs_cache
 from pyne.xs.channels import sigma_f, sigma_s_gh, sigma_s, sigma_a_reaction, \
-    metastable_ratio, sigma_a, chi, sigma_t, _atom_mass_channel
+    metastable_ratio, sigma_a, chi, sigma_t, _atom_mass_channel, XSEngine
 from pyne.pyne_config import pyne_conf
 from pyne.material import Material
 
@@ -196,3 +196,34 @@ def test_sigma_t():
     assert_true(observed)
     expected = sigma_a('U235', 600.0) + sigma_s('U235', 600.0, E_g)
     assert_array_almost_equal(sig_t, expected)
+
+
+def test_xs_engine():
+    E_g = np.logspace(-6, 1, 10)[::-1]
+    h2o = Material({'H1': 0.11191487328808077, 'O16': 0.8880851267119192},
+                   density=1.0)
+    uo2 = Material({'U235': 0.04, 'U238': 0.84, 'O16': 0.12}, density=10.4)
+    mats = [h2o, uo2]
+    engine = XSEngine(mats, channels=['sigma_t', sigma_a], group_struct=E_g)
+    assert_equal(engine.nucs, [10010000, 80160000, 922350000, 922380000])
+
+    obs = engine.micro_xs(mats)
+    for i, mat in enumerate(mats):
+        assert_array_almost_equal(obs['sigma_t'][i], sigma_t(mat, group_struct=E_g))
+        assert_array_almost_equal(obs['sigma_a'][i], sigma_a(mat, group_struct=E_g))
+
+    obs = engine.macro_xs(mats, channels=['sigma_t'])
+    assert_equal(list(obs.keys()), ['sigma_t'])
+    for i, mat in enumerate(mats):
+        exp = sum(dens * 1e-24 * sigma_t(nuc, group_struct=E_g)
+                  for nuc, dens in mat.to_atom_dens().items())
+        assert_array_almost_equal(obs['sigma_t'][i] / exp, np.ones(len(E_g) - 1))
+
+    assert_raises(KeyError, engine.macro_xs, [Material({'H2': 1.0}, density=1.0)])
+
+    # nuclides may be given as any iterable of names
+    for nucs in (set(['U235', 'H1']), (nuc for nuc in ['U235', 'H1'])):
+        engine = XSEngine(nucs, group_struct=E_g)
+        assert_equal(engine.nucs, [10010000, 922350000])
+    engine = XSEngine(iter(mats), group_struct=E_g)
+    assert_equal(engine.nucs, [10010000, 80160000, 922350000, 922380000])